@@ -1,19 +1,169 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, scrolledtext
-import subprocess
+import tkinter.font as tkfont
 import threading
 import re
 import os
 import time
 import sys
-import zipfile
-import tempfile
-import shutil
+import base64
 from datetime import datetime
-import json
+import posixpath
+import struct
+import concurrent.futures
+import math
+
+from adbcore.client import AdbClient
+from adbcore.files import LARGE_FILE_THRESHOLD, format_size
+from adbcore.installer import QUEUED, RUNNING, InstallQueue
+from adbcore.logcat import (LOGCAT_PRIORITIES, LOGCAT_BUFFER_LINES, LogRingBuffer, LogcatCapture, parse_logcat_entries,
+                            format_logcat_entry, make_logcat_filter, search_logcat_captures, zstandard)
+from adbcore.shortcuts import WATCH_RESCAN_INTERVAL, ApkFolderIndex, ShortcutStore
+from adbcore.screen import parse_screencap_header, screencap_to_ppm, encode_png
+from adbcore.tuning import ANIMATION_SCALE_KEYS, KERNEL_TWEAKS, format_khz
 
 ADB_PATH = r"D:\android version\ADB and Fastboot++ v1.1.1 Portable\adb.exe"
 
+# Default folder for screenshots and burst captures
+SCREENSHOT_DIR = os.path.join(os.path.expanduser("~"), "Pictures", "ADB Screenshots")
+
+# Shortcut cards are fixed-height rows; only the rows in view have widgets
+SHORTCUT_ROW_HEIGHT = 96
+SHORTCUT_CARD_PADDING = 15
+
+# Startup timing is reported relative to module load
+STARTUP_TIME = time.perf_counter()
+
+class ScreenMirror:
+    """Live device screen in a Toplevel canvas, fed by a persistent exec-out screencap stream"""
+    def __init__(self, app, serial=None):
+        self.app = app
+        self.serial = serial
+        self.running = True
+        self.process = None
+        
+        # Single-slot hand-offs: a newer frame replaces an unconsumed one, so nothing stale queues up
+        self.lock = threading.Condition()
+        self.latest_raw = None
+        self.latest_ppm = None
+        self.frames_shown = 0
+        self.frames_dropped = 0
+        self.last_stats = time.monotonic()
+        self.target_size = (360, 720)
+        
+        self.window = tk.Toplevel(app.root)
+        self.window.title("Screen Mirror")
+        self.window.geometry("400x800")
+        self.canvas = tk.Canvas(self.window, bg="black", highlightthickness=0)
+        self.canvas.pack(fill=tk.BOTH, expand=True)
+        self.image_item = self.canvas.create_image(0, 0, anchor=tk.CENTER)
+        self.photo = None
+        self.status = tk.StringVar(value="Connecting...")
+        ttk.Label(self.window, textvariable=self.status).pack(fill=tk.X, padx=10, pady=5)
+        
+        self.canvas.bind("<Configure>", self.on_resize)
+        self.window.protocol("WM_DELETE_WINDOW", self.stop)
+        
+        threading.Thread(target=self.read_frames, daemon=True).start()
+        threading.Thread(target=self.decode_frames, daemon=True).start()
+        self.window.after(15, self.draw)
+    
+    def on_resize(self, event):
+        self.target_size = (max(event.width, 1), max(event.height, 1))
+        self.canvas.coords(self.image_item, event.width // 2, event.height // 2)
+    
+    def read_exact(self, stream, size):
+        """Read exactly size bytes from a pipe, or None at end of stream"""
+        buf = bytearray(size)
+        view = memoryview(buf)
+        pos = 0
+        while pos < size:
+            count = stream.readinto(view[pos:])
+            if not count:
+                return None
+            pos += count
+        return buf
+    
+    def read_frames(self):
+        """Reader thread: pull fixed-size raw frames off the stream"""
+        while self.running:
+            try:
+                # One standalone capture tells us the frame geometry of the stream
+                first = self.app.client.capture_screen_raw(serial=self.serial)
+                width, height, pixel_format, bytes_per_pixel, header_size = parse_screencap_header(first)
+                self.process = self.app.client.open_adb_stream(["exec-out", "while true; do screencap; done"], serial=self.serial)
+                while self.running:
+                    raw = self.read_exact(self.process.stdout, len(first))
+                    if raw is None:
+                        raise RuntimeError("stream closed")
+                    if struct.unpack_from("<III", raw, 0) != (width, height, pixel_format):
+                        # Rotation or resolution change: restart with the new geometry
+                        break
+                    with self.lock:
+                        if self.latest_raw is not None:
+                            self.frames_dropped += 1
+                        self.latest_raw = raw
+                        self.lock.notify()
+            except Exception as e:
+                if self.running:
+                    self.app.log(f"Screen mirror error: {str(e)}")
+                    time.sleep(1)
+            finally:
+                self.close_process()
+    
+    def decode_frames(self):
+        """Decoder thread: scale the newest raw frame to the canvas size"""
+        while self.running:
+            with self.lock:
+                while self.running and self.latest_raw is None:
+                    self.lock.wait(0.5)
+                raw, self.latest_raw = self.latest_raw, None
+            if raw is None:
+                continue
+            try:
+                width, height = struct.unpack_from("<II", raw, 0)
+                target_width, target_height = self.target_size
+                factor = max(1, math.ceil(max(width / target_width, height / target_height)))
+                ppm = screencap_to_ppm(raw, factor)
+            except Exception as e:
+                self.app.log(f"Screen mirror decode error: {str(e)}")
+                continue
+            with self.lock:
+                if self.latest_ppm is not None:
+                    self.frames_dropped += 1
+                self.latest_ppm = ppm
+    
+    def draw(self):
+        """UI loop: blit the newest decoded frame, if any"""
+        if not self.running:
+            return
+        with self.lock:
+            ppm, self.latest_ppm = self.latest_ppm, None
+        if ppm is not None:
+            self.photo = tk.PhotoImage(data=ppm, format="PPM")
+            self.canvas.itemconfigure(self.image_item, image=self.photo)
+            self.frames_shown += 1
+        
+        now = time.monotonic()
+        if now - self.last_stats >= 1:
+            self.status.set(f"{self.frames_shown / (now - self.last_stats):.1f} fps, {self.frames_dropped} dropped")
+            self.frames_shown = 0
+            self.frames_dropped = 0
+            self.last_stats = now
+        self.window.after(15, self.draw)
+    
+    def close_process(self):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+        self.process = None
+    
+    def stop(self):
+        self.running = False
+        with self.lock:
+            self.lock.notify_all()
+        self.close_process()
+        self.window.destroy()
+
 class ADBManager:
     def __init__(self, root):
         self.root = root
@@ -21,16 +171,49 @@ class ADBManager:
         self.root.geometry("1000x800")
         self.root.minsize(900, 700)
         
-        # Performance monitoring
+        # Performance monitoring (sampled only while the Performance tab is visible)
         self.monitoring = True
+        self.perf_visible = False
+        self.perf_job = None
         self.last_net_stats = {}
         
         # Device connection status
         self.connection_status = tk.StringVar()
         self.connection_status.set("Disconnected")
         
-        # Shortcuts for quick install
+        # Shortcuts for quick install (cards are built with the Quick Install tab)
         self.shortcuts = []
+        self.shortcuts_canvas = None
+        # Cards bound to visible shortcuts (path -> card) and unbound cards for reuse
+        self.shortcut_cards = {}
+        self.spare_cards = []
+        # Launcher icons decoded for the cards: path -> PhotoImage (None when the APK has none)
+        self.shortcut_icons = {}
+        # Paths ticked for "Install Selected" and the queue panel (built with the tab)
+        self.selected_shortcuts = set()
+        self.install_tree = None
+        
+        # Background loops stopped on close, whether or not their tab was ever opened
+        self.logcat_process = None
+        self.logcat_running = False
+        # Background logcat captures: serial -> LogcatCapture
+        self.logcat_captures = {}
+        self.cluster_telemetry_running = False
+        
+        # Tab bodies not built yet: frame path -> (frame, builder)
+        self.lazy_tabs = {}
+        self.startup_marks = {}
+        
+        # Screenshot encoding pool (created on first capture) and burst state
+        self.png_pool = None
+        self.burst_running = False
+        
+        # Headless engine: adb commands, caches and per-device state
+        self.client = AdbClient(ADB_PATH, log=self.log)
+        self.shortcut_store = ShortcutStore(self.client.get_app_data_path("shortcuts.db"))
+        self.apk_index = ApkFolderIndex(self.shortcut_store)
+        self.install_queue = InstallQueue(self.client, on_update=lambda job: self.root.after(0, self.update_install_job, job))
+        self.watch_scan_running = False
         
         # Setup menu
         self.setup_menu()
@@ -38,15 +221,12 @@ class ADBManager:
         # Setup UI
         self.setup_ui()
         
-        # Check connection in background
-        self.check_connection()
-        
-        # Start performance monitoring
-        self.monitor_performance()
-        
         # Load shortcuts
         self.load_shortcuts()
         
+        # Device probing waits until the window has been drawn
+        self.root.after(0, self.on_first_paint)
+        
         # Handle window close event
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
 
@@ -57,6 +237,8 @@ class ADBManager:
         # Tools menu
         tools_menu = tk.Menu(menubar, tearoff=0)
         tools_menu.add_command(label="Clear Log", command=self.clear_log)
+        tools_menu.add_command(label="Re-probe Device Capabilities",
+                               command=lambda: self.run_threaded(lambda: self.client.get_capabilities(refresh=True)))
         menubar.add_cascade(label="Tools", menu=tools_menu)
         
         # Help menu
@@ -96,32 +278,37 @@ class ADBManager:
         # Apps Tab
         apps_frame = ttk.Frame(self.notebook)
         self.notebook.add(apps_frame, text="Apps Management")
-        self.setup_apps_tab(apps_frame)
+        self.add_lazy_tab(apps_frame, self.setup_apps_tab)
         
         # File Transfer Tab
         file_frame = ttk.Frame(self.notebook)
         self.notebook.add(file_frame, text="File Transfer")
-        self.setup_file_tab(file_frame)
+        self.add_lazy_tab(file_frame, self.setup_file_tab)
         
         # Device Commands Tab
         cmd_frame = ttk.Frame(self.notebook)
         self.notebook.add(cmd_frame, text="Device Commands")
-        self.setup_cmd_tab(cmd_frame)
+        self.add_lazy_tab(cmd_frame, self.setup_cmd_tab)
+        
+        # Logcat Tab
+        logcat_frame = ttk.Frame(self.notebook)
+        self.notebook.add(logcat_frame, text="Logcat")
+        self.add_lazy_tab(logcat_frame, self.setup_logcat_tab)
         
         # Performance Tab
-        perf_frame = ttk.Frame(self.notebook)
-        self.notebook.add(perf_frame, text="Performance")
-        self.setup_perf_tab(perf_frame)
+        self.perf_tab = ttk.Frame(self.notebook)
+        self.notebook.add(self.perf_tab, text="Performance")
+        self.add_lazy_tab(self.perf_tab, self.setup_perf_tab)
         
         # Root Tools Tab
         root_frame = ttk.Frame(self.notebook)
         self.notebook.add(root_frame, text="Root Tools")
-        self.setup_root_tab(root_frame)
+        self.add_lazy_tab(root_frame, self.setup_root_tab)
         
         # Quick Install Tab
         quick_frame = ttk.Frame(self.notebook)
         self.notebook.add(quick_frame, text="Quick Install")
-        self.setup_quick_tab(quick_frame)
+        self.add_lazy_tab(quick_frame, self.setup_quick_tab)
         
         # Log Output
         log_frame = ttk.LabelFrame(main_container, text="Log")
@@ -130,6 +317,45 @@ class ADBManager:
         self.log_area = scrolledtext.ScrolledText(log_frame, height=10, font=("Consolas", 9))
         self.log_area.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         self.log_area.config(state=tk.DISABLED)
+        
+        # Tabs are built on first selection, starting with the one shown now
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+        self.on_tab_changed()
+
+    def add_lazy_tab(self, frame, builder):
+        self.lazy_tabs[str(frame)] = (frame, builder)
+
+    def build_tab(self, name):
+        """Build a tab body the first time it is shown"""
+        if name in self.lazy_tabs:
+            started = time.perf_counter()
+            frame, builder = self.lazy_tabs.pop(name)
+            builder(frame)
+            self.startup_marks.setdefault("tabs", {})[self.notebook.tab(frame, "text")] = time.perf_counter() - started
+
+    def on_tab_changed(self, event=None):
+        selected = self.notebook.select()
+        self.build_tab(selected)
+        
+        # Sample performance only while its tab is on screen
+        self.perf_visible = selected == str(self.perf_tab)
+        if self.perf_visible and self.perf_job is None:
+            self.monitor_performance()
+
+    def on_first_paint(self):
+        """Runs once the main loop has started: finish drawing, then start the device work"""
+        self.root.update_idletasks()
+        self.startup_marks["window"] = time.perf_counter() - STARTUP_TIME
+        self.check_connection()
+
+    def report_startup_time(self):
+        """Log time to first window and to interactive (first device check done)"""
+        if "interactive" in self.startup_marks:
+            return
+        self.startup_marks["interactive"] = time.perf_counter() - STARTUP_TIME
+        tabs = ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.startup_marks.get("tabs", {}).items())
+        self.log(f"Startup: window in {self.startup_marks['window'] * 1000:.0f} ms, "
+                 f"interactive in {self.startup_marks['interactive'] * 1000:.0f} ms (tabs built: {tabs})")
 
     def setup_quick_tab(self, parent):
         """Create tab for quick app installation shortcuts"""
@@ -151,43 +377,88 @@ class ADBManager:
         )
         add_btn.pack(side=tk.RIGHT, padx=5)
         
+        # Watched folders contribute the latest build of each package
+        ttk.Button(
+            header_frame,
+            text="Watch Folder...",
+            command=self.watch_folder
+        ).pack(side=tk.RIGHT, padx=5)
+        
+        # Ticked shortcuts onto any number of devices
+        ttk.Button(
+            header_frame,
+            text="Install Selected...",
+            command=self.install_selected_shortcuts
+        ).pack(side=tk.RIGHT, padx=5)
+        
+        # Install queue, packed first so it keeps its height below the cards
+        self.setup_install_queue(parent)
+        
         # Shortcuts container with scrollbar
         container_frame = ttk.Frame(parent)
         container_frame.pack(fill=tk.BOTH, expand=True, padx=15, pady=5)
         
-        # Canvas for scrollable area
+        # Canvas for scrollable area; cards are placed on it as windows
         self.shortcuts_canvas = tk.Canvas(container_frame, highlightthickness=0)
-        scrollbar = ttk.Scrollbar(container_frame, orient="vertical", command=self.shortcuts_canvas.yview)
-        self.shortcuts_scrollable_frame = ttk.Frame(self.shortcuts_canvas)
-        
-        self.shortcuts_scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.shortcuts_canvas.configure(scrollregion=self.shortcuts_canvas.bbox("all"))
-        )
-        
-        self.shortcuts_canvas.create_window((0, 0), window=self.shortcuts_scrollable_frame, anchor="nw")
+        scrollbar = ttk.Scrollbar(container_frame, orient="vertical", command=self.scroll_shortcuts)
         self.shortcuts_canvas.configure(yscrollcommand=scrollbar.set)
+        self.shortcuts_canvas.bind("<Configure>", lambda e: self.render_shortcut_cards())
         
         self.shortcuts_canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
         
+        # Welcome message, shown while there are no shortcuts
+        welcome_label = ttk.Label(
+            self.shortcuts_canvas,
+            text="No shortcuts yet.\nClick '+ Add Shortcut' to create one.",
+            font=("Segoe UI", 11),
+            justify=tk.CENTER
+        )
+        self.welcome_window = self.shortcuts_canvas.create_window(0, 50, window=welcome_label, anchor="n", state="hidden")
+        
         # Bind canvas events for proper scrolling
         self.shortcuts_canvas.bind_all("<MouseWheel>", self._on_mousewheel)
         
-        # Add a welcome message if no shortcuts exist
-        if not self.shortcuts:
-            welcome_frame = ttk.Frame(self.shortcuts_scrollable_frame)
-            welcome_frame.pack(fill=tk.BOTH, expand=True, pady=50)
-            
-            ttk.Label(
-                welcome_frame, 
-                text="No shortcuts yet.\nClick '+ Add Shortcut' to create one.",
-                font=("Segoe UI", 11),
-                justify=tk.CENTER
-            ).pack()
+        # Cards (or the welcome message) for the shortcuts loaded at startup
+        self.refresh_shortcuts_ui()
+
+    def setup_install_queue(self, parent):
+        queue_frame = ttk.LabelFrame(parent, text="Install Queue")
+        queue_frame.pack(side=tk.BOTTOM, fill=tk.X, padx=15, pady=(5, 15))
+        
+        controls = ttk.Frame(queue_frame)
+        controls.pack(fill=tk.X, padx=5, pady=5)
+        ttk.Button(controls, text="Cancel", command=self.cancel_install_jobs).pack(side=tk.LEFT, padx=2)
+        ttk.Button(controls, text="Retry", command=self.retry_install_jobs).pack(side=tk.LEFT, padx=2)
+        ttk.Button(controls, text="Clear Finished", command=self.clear_install_jobs).pack(side=tk.LEFT, padx=2)
+        self.install_status = tk.StringVar(value="Idle")
+        ttk.Label(controls, textvariable=self.install_status).pack(side=tk.RIGHT, padx=5)
+        
+        tree_frame = ttk.Frame(queue_frame)
+        tree_frame.pack(fill=tk.X, padx=5, pady=(0, 5))
+        columns = ("app", "device", "state", "mode", "progress", "speed", "time", "message")
+        self.install_tree = ttk.Treeview(tree_frame, columns=columns, show="headings", height=6)
+        for column, heading, width in (("app", "App", 180), ("device", "Device", 120), ("state", "State", 80),
+                                       ("mode", "Mode", 90), ("progress", "Progress", 130), ("speed", "Speed", 90),
+                                       ("time", "Time", 60), ("message", "Result", 250)):
+            self.install_tree.heading(column, text=heading)
+            self.install_tree.column(column, width=width, anchor=tk.W)
+        scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.install_tree.yview)
+        self.install_tree.configure(yscroll=scrollbar.set)
+        self.install_tree.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        # Jobs queued before the tab was first opened
+        for job in self.install_queue.jobs:
+            self.update_install_job(job)
 
     def _on_mousewheel(self, event):
         self.shortcuts_canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+        self.render_shortcut_cards()
+
+    def scroll_shortcuts(self, *args):
+        self.shortcuts_canvas.yview(*args)
+        self.render_shortcut_cards()
 
     def add_shortcut(self):
         file_path = filedialog.askopenfilename(
@@ -197,71 +468,91 @@ class ADBManager:
         
         if not file_path:
             return
+        if any(s["path"] == file_path for s in self.shortcuts):
+            self.log(f"A shortcut for {file_path} already exists")
+            return
+        
+        self.log(f"Reading {os.path.basename(file_path)}...")
+        self.run_threaded(lambda: self._add_shortcut_thread(file_path))
+
+    def _add_shortcut_thread(self, file_path):
+        # Package, version and icon are cached in the store, so this parse happens once per file
+        try:
+            metadata = self.shortcut_store.get_metadata(file_path)
+        except Exception as e:
+            self.log(f"Error reading {file_path}: {str(e)}")
+            return
         
-        # Extract app name if possible
-        app_name = os.path.basename(file_path)
-        if file_path.endswith(".apk"):
-            # Try to get app name from APK
-            try:
-                with zipfile.ZipFile(file_path, 'r') as z:
-                    try:
-                        with z.open('AndroidManifest.xml') as manifest:
-                            content = manifest.read()
-                            if b'application' in content and b'label=' in content:
-                                start = content.find(b'label="') + 7
-                                end = content.find(b'"', start)
-                                if start > 6 and end > start:
-                                    app_name = content[start:end].decode('utf-8', errors='ignore')
-                    except:
-                        pass
-            except:
-                pass
-        
-        # Create shortcut data
         shortcut = {
-            "name": app_name,
+            "name": metadata["label"],
             "path": file_path,
-            "type": "APK" if file_path.endswith(".apk") else "XAPK"
+            "type": metadata["type"],
+            "package": metadata["package"],
+            "version_name": metadata["version_name"]
         }
+        if not self.shortcut_store.add_shortcut(shortcut):
+            self.log(f"A shortcut for {file_path} already exists")
+            return
         
-        # Add to shortcuts list
-        self.shortcuts.append(shortcut)
-        self.save_shortcuts()
-        
-        # Refresh UI
-        self.refresh_shortcuts_ui()
-        self.log(f"Added shortcut for {app_name}")
+        def add():
+            # Pinned shortcuts stay ahead of the watched-folder builds
+            index = next((i for i, s in enumerate(self.shortcuts) if s.get("folder")), len(self.shortcuts))
+            self.shortcuts.insert(index, shortcut)
+            self.refresh_shortcuts_ui()
+            self.log(f"Added shortcut for {shortcut['name']}")
+        self.root.after(0, add)
 
     def refresh_shortcuts_ui(self):
-        # Clear existing widgets
-        for widget in self.shortcuts_scrollable_frame.winfo_children():
-            widget.destroy()
-        
-        # Add welcome message if no shortcuts
-        if not self.shortcuts:
-            welcome_frame = ttk.Frame(self.shortcuts_scrollable_frame)
-            welcome_frame.pack(fill=tk.BOTH, expand=True, pady=50)
-            
-            ttk.Label(
-                welcome_frame, 
-                text="No shortcuts yet.\nClick '+ Add Shortcut' to create one.",
-                font=("Segoe UI", 11),
-                justify=tk.CENTER
-            ).pack()
+        """Sync the cards with self.shortcuts; only rows whose shortcut changed are rebound"""
+        if self.shortcuts_canvas is None:
             return
-        
-        # Create shortcut cards
-        for i, shortcut in enumerate(self.shortcuts):
-            self.create_shortcut_card(shortcut, i)
+        self.render_shortcut_cards()
+
+    def render_shortcut_cards(self):
+        """Give the shortcuts in view a card (reusing released ones) and release the rest"""
+        canvas = self.shortcuts_canvas
+        width = canvas.winfo_width()
+        height = canvas.winfo_height()
+        canvas.configure(scrollregion=(0, 0, width, max(len(self.shortcuts) * SHORTCUT_ROW_HEIGHT, height)))
+        canvas.coords(self.welcome_window, width // 2, 50)
+        canvas.itemconfigure(self.welcome_window, state="hidden" if self.shortcuts else "normal")
+        
+        top = canvas.canvasy(0)
+        first = max(int(top // SHORTCUT_ROW_HEIGHT), 0)
+        last = min(int((top + height) // SHORTCUT_ROW_HEIGHT) + 1, len(self.shortcuts))
+        visible = {shortcut["path"]: (index, shortcut)
+                   for index, shortcut in enumerate(self.shortcuts[first:last], start=first)}
+        
+        for key in [key for key in self.shortcut_cards if key not in visible]:
+            card = self.shortcut_cards.pop(key)
+            canvas.itemconfigure(card["window"], state="hidden")
+            self.spare_cards.append(card)
+        
+        for key, (index, shortcut) in visible.items():
+            card = self.shortcut_cards.get(key)
+            if card is None:
+                card = self.spare_cards.pop() if self.spare_cards else self.create_shortcut_card()
+                self.bind_shortcut_card(card, shortcut)
+                self.shortcut_cards[key] = card
+            elif card["shortcut"] != shortcut:
+                # Same file, new metadata (a watched build was rewritten in place)
+                self.bind_shortcut_card(card, shortcut)
+            canvas.coords(card["window"], SHORTCUT_CARD_PADDING, index * SHORTCUT_ROW_HEIGHT + 5)
+            canvas.itemconfigure(card["window"], width=max(width - 2 * SHORTCUT_CARD_PADDING, 1), state="normal")
 
-    def create_shortcut_card(self, shortcut, index):
+    def create_shortcut_card(self):
+        """Build an unbound card; its buttons act on whatever shortcut it shows at click time"""
+        card = {}
+        
         # Create card frame
         card_frame = ttk.Frame(
-            self.shortcuts_scrollable_frame,
+            self.shortcuts_canvas,
             relief="solid",
             borderwidth=1
         )
-        card_frame.pack(fill=tk.X, padx=15, pady=10)
+        card["window"] = self.shortcuts_canvas.create_window(
+            0, 0, window=card_frame, anchor="nw", height=SHORTCUT_ROW_HEIGHT - 10, state="hidden"
+        )
         
         # Card content
         content_frame = ttk.Frame(card_frame)
@@ -273,117 +564,268 @@ class ADBManager:
         icon_frame.pack_propagate(False)
         
         # App icon text
-        icon_label = tk.Label(
+        card["icon"] = tk.Label(
             icon_frame,
-            text=shortcut["type"][0],
             bg="#f0f0f0",
             fg="#333333",
             font=("Segoe UI", 16, "bold")
         )
-        icon_label.place(relx=0.5, rely=0.5, anchor=tk.CENTER)
+        card["icon"].place(relx=0.5, rely=0.5, anchor=tk.CENTER)
         
         # App info
         info_frame = ttk.Frame(content_frame)
         info_frame.pack(side=tk.LEFT, fill=tk.X, expand=True)
         
         # App name
-        name_label = ttk.Label(
+        card["name"] = ttk.Label(
             info_frame,
-            text=shortcut["name"],
             font=("Segoe UI", 11, "bold")
         )
-        name_label.pack(anchor=tk.W)
+        card["name"].pack(anchor=tk.W)
         
         # App path
-        path_label = ttk.Label(
+        card["path"] = ttk.Label(
             info_frame,
-            text=shortcut["path"],
             font=("Segoe UI", 9),
             foreground="#666666"
         )
-        path_label.pack(anchor=tk.W)
+        card["path"].pack(anchor=tk.W)
         
         # Buttons frame
         btn_frame = ttk.Frame(content_frame)
         btn_frame.pack(side=tk.RIGHT, padx=10)
         
+        # Selection for "Install Selected"
+        card["selected"] = tk.BooleanVar()
+        ttk.Checkbutton(
+            btn_frame,
+            text="Select",
+            variable=card["selected"],
+            command=lambda: self.toggle_shortcut_selection(card)
+        ).pack(side=tk.LEFT, padx=5)
+        
         # Install button
         install_btn = ttk.Button(
             btn_frame,
             text="Install",
-            command=lambda s=shortcut: self.install_shortcut(s)
+            command=lambda: self.install_shortcut(card["shortcut"])
         )
         install_btn.pack(side=tk.LEFT, padx=5)
         
-        # Remove button
-        remove_btn = ttk.Button(
+        # Remove button (disabled for builds from watched folders)
+        card["remove"] = ttk.Button(
             btn_frame,
             text="Remove",
-            command=lambda idx=index: self.remove_shortcut(idx)
+            command=lambda: self.remove_shortcut(card["shortcut"]["path"])
         )
-        remove_btn.pack(side=tk.LEFT, padx=5)
+        card["remove"].pack(side=tk.LEFT, padx=5)
+        return card
+
+    def bind_shortcut_card(self, card, shortcut):
+        card["shortcut"] = shortcut
+        card["icon"].configure(text=shortcut["type"][0], image=self.get_shortcut_icon(shortcut["path"]) or "")
+        version = shortcut.get("version_name")
+        card["name"].configure(text=f"{shortcut['name']}  {version}" if version else shortcut["name"])
+        card["path"].configure(text=shortcut["path"])
+        card["remove"].state(["disabled"] if shortcut.get("folder") else ["!disabled"])
+        card["selected"].set(shortcut["path"] in self.selected_shortcuts)
+
+    def get_shortcut_icon(self, path):
+        """Launcher icon from the metadata cache, scaled down to fit the card"""
+        if path not in self.shortcut_icons:
+            self.shortcut_icons[path] = None
+            data = self.shortcut_store.get_icon(path)
+            if data:
+                try:
+                    photo = tk.PhotoImage(data=base64.b64encode(data))
+                    factor = math.ceil(max(photo.width(), photo.height()) / 40)
+                    self.shortcut_icons[path] = photo.subsample(factor) if factor > 1 else photo
+                except tk.TclError:
+                    # Formats Tk cannot decode (e.g. WebP) keep the text placeholder
+                    pass
+        return self.shortcut_icons[path]
 
     def install_shortcut(self, shortcut):
         self.log(f"Installing {shortcut['name']} from shortcut...")
+        self.install_queue.submit([(shortcut["path"], shortcut["name"])], [None])
+
+    def toggle_shortcut_selection(self, card):
+        path = card["shortcut"]["path"]
+        if card["selected"].get():
+            self.selected_shortcuts.add(path)
+        else:
+            self.selected_shortcuts.discard(path)
+
+    def install_selected_shortcuts(self):
+        """Queue every ticked shortcut on the devices picked in a dialog"""
+        packages = [(s["path"], s["name"]) for s in self.shortcuts if s["path"] in self.selected_shortcuts]
+        if not packages:
+            messagebox.showinfo("Install Selected", "Tick the shortcuts to install first")
+            return
+        serials = self.client.get_connected_devices()
+        if not serials:
+            self.log("No devices connected")
+            return
         
-        if shortcut["type"] == "APK":
-            self.run_threaded(lambda: self.run_adb_command(["install", shortcut["path"]]))
-        else:  # XAPK
-            self.run_threaded(lambda: self._install_xapk_thread(shortcut["path"]))
+        window = tk.Toplevel(self.root)
+        window.title("Install on Devices")
+        window.geometry("360x400")
+        ttk.Label(window, text=f"Install {len(packages)} app(s) on:").pack(anchor=tk.W, padx=10, pady=(10, 5))
+        device_list = tk.Listbox(window, selectmode=tk.MULTIPLE, exportselection=False)
+        device_list.pack(fill=tk.BOTH, expand=True, padx=10)
+        for serial in serials:
+            device_list.insert(tk.END, serial)
+        device_list.select_set(0, tk.END)
+        
+        def start():
+            chosen = [serials[i] for i in device_list.curselection()]
+            window.destroy()
+            if chosen:
+                jobs = self.install_queue.submit(packages, chosen)
+                self.log(f"Queued {len(jobs)} installs: {len(packages)} app(s) on {len(chosen)} device(s)")
+        
+        buttons = ttk.Frame(window)
+        buttons.pack(fill=tk.X, padx=10, pady=10)
+        ttk.Button(buttons, text="Install", command=start).pack(side=tk.RIGHT, padx=2)
+        ttk.Button(buttons, text="Cancel", command=window.destroy).pack(side=tk.RIGHT, padx=2)
 
-    def remove_shortcut(self, index):
-        if 0 <= index < len(self.shortcuts):
-            removed = self.shortcuts.pop(index)
-            self.save_shortcuts()
-            self.refresh_shortcuts_ui()
-            self.log(f"Removed shortcut for {removed['name']}")
+    # Install queue
+    def update_install_job(self, job):
+        """Show a job's latest state in the queue panel (runs on the UI thread)"""
+        if self.install_tree is None:
+            return
+        iid = str(job.id)
+        if job not in self.install_queue.jobs:
+            if self.install_tree.exists(iid):
+                self.install_tree.delete(iid)
+            return
+        progress = f"{job.progress * 100:.0f}% of {format_size(job.size)}" if job.size else ""
+        speed = f"{format_size(job.throughput)}/s" if job.state == RUNNING and job.sent else ""
+        values = (job.name, job.serial or "device", job.state, job.mode, progress, speed,
+                  f"{job.elapsed:.1f}s" if job.started else "", job.message)
+        if self.install_tree.exists(iid):
+            self.install_tree.item(iid, values=values)
+        else:
+            self.install_tree.insert("", tk.END, iid=iid, values=values)
+        
+        jobs = self.install_queue.jobs
+        running = sum(1 for j in jobs if j.state == RUNNING)
+        queued = sum(1 for j in jobs if j.state == QUEUED)
+        self.install_status.set(f"{running} running, {queued} queued, "
+                                f"{format_size(self.install_queue.throughput())}/s" if running or queued else "Idle")
 
-    def save_shortcuts(self):
-        try:
-            shortcuts_data = []
-            for s in self.shortcuts:
-                shortcuts_data.append({
-                    "name": s["name"],
-                    "path": s["path"],
-                    "type": s["type"]
-                })
-            
-            # Create app data directory if it doesn't exist
-            app_data_dir = os.path.join(os.path.expanduser("~"), ".adb_manager_pro")
-            if not os.path.exists(app_data_dir):
-                os.makedirs(app_data_dir)
-            
-            # Save shortcuts to file
-            with open(os.path.join(app_data_dir, "shortcuts.json"), "w") as f:
-                json.dump(shortcuts_data, f)
-        except Exception as e:
-            self.log(f"Error saving shortcuts: {str(e)}")
+    def selected_install_jobs(self):
+        """Jobs selected in the queue panel (every job when nothing is selected)"""
+        jobs = {str(job.id): job for job in self.install_queue.jobs}
+        selection = self.install_tree.selection()
+        return [jobs[iid] for iid in selection if iid in jobs] if selection else list(jobs.values())
+
+    def cancel_install_jobs(self):
+        for job in self.selected_install_jobs():
+            self.install_queue.cancel(job)
+
+    def retry_install_jobs(self):
+        for job in self.selected_install_jobs():
+            self.install_queue.retry(job)
+
+    def clear_install_jobs(self):
+        for job in self.install_queue.clear_finished():
+            self.update_install_job(job)
+
+    def remove_shortcut(self, path):
+        for index, shortcut in enumerate(self.shortcuts):
+            if shortcut["path"] == path:
+                removed = self.shortcuts.pop(index)
+                self.shortcut_store.remove_shortcut(path)
+                self.shortcut_icons.pop(path, None)
+                self.refresh_shortcuts_ui()
+                self.log(f"Removed shortcut for {removed['name']}")
+                return
 
     def load_shortcuts(self):
         try:
-            app_data_dir = os.path.join(os.path.expanduser("~"), ".adb_manager_pro")
-            shortcuts_file = os.path.join(app_data_dir, "shortcuts.json")
+            # Shortcuts used to live in shortcuts.json; move them into the store once
+            json_path = self.client.get_app_data_path("shortcuts.json")
+            if os.path.exists(json_path):
+                count = self.shortcut_store.import_json(json_path)
+                self.log(f"Imported {count} shortcuts from shortcuts.json")
             
-            if os.path.exists(shortcuts_file):
-                with open(shortcuts_file, "r") as f:
-                    shortcuts_data = json.load(f)
-                
-                self.shortcuts = []
-                for s in shortcuts_data:
-                    self.shortcuts.append({
-                        "name": s["name"],
-                        "path": s["path"],
-                        "type": s["type"]
-                    })
-                
-                # Refresh UI after a short delay to ensure the tab is ready
-                self.root.after(100, self.refresh_shortcuts_ui)
+            self.shortcuts = self.shortcut_store.list_shortcuts()
+            # Latest builds as of the last scan show at once; the rescan catches up in the background
+            self.show_latest_builds(self.shortcut_store.latest_builds())
         except Exception as e:
             self.log(f"Error loading shortcuts: {str(e)}")
             self.shortcuts = []
+        self.periodic_watch_scan()
+
+    # Watched folders
+    def watch_folder(self):
+        folder = filedialog.askdirectory(title="Select a folder of APK/XAPK builds")
+        if not folder:
+            return
+        folder = os.path.normpath(folder)
+        
+        if folder in self.shortcut_store.list_watched_folders():
+            if messagebox.askyesno("Watched Folder", f"Stop watching {folder}?"):
+                self.shortcut_store.remove_watched_folder(folder)
+                self.show_latest_builds(self.shortcut_store.latest_builds())
+                self.log(f"Stopped watching {folder}")
+            return
+        
+        self.shortcut_store.add_watched_folder(folder)
+        self.log(f"Watching {folder} for APK/XAPK builds")
+        self.scan_watched_folders()
+
+    def periodic_watch_scan(self):
+        self.scan_watched_folders()
+        self.root.after(WATCH_RESCAN_INTERVAL * 1000, self.periodic_watch_scan)
+
+    def scan_watched_folders(self):
+        """Stat the watched folders and parse only new or changed builds, off the UI thread"""
+        if self.watch_scan_running or not self.shortcut_store.list_watched_folders():
+            return
+        self.watch_scan_running = True
+        self.run_threaded(self._scan_watched_folders_thread)
+
+    def _scan_watched_folders_thread(self):
+        try:
+            summary = self.apk_index.scan()
+            if summary["parsed"] or summary["removed"]:
+                latest = self.shortcut_store.latest_builds()
+                self.root.after(0, lambda: self.show_latest_builds(latest, summary))
+            for path in summary["failed"]:
+                self.log(f"Could not read {path}")
+        except Exception as e:
+            self.log(f"Error scanning watched folders: {str(e)}")
+        finally:
+            self.watch_scan_running = False
+
+    def show_latest_builds(self, latest, summary=None):
+        """Replace the watched-folder rows with the latest build of each package"""
+        if summary:
+            for path in summary["parsed"] + summary["removed"]:
+                self.shortcut_icons.pop(path, None)
+            self.log(f"Watched folders: {len(summary['parsed'])} new or changed, "
+                     f"{len(summary['removed'])} removed, {summary['files']} files")
+        
+        self.shortcuts = [s for s in self.shortcuts if not s.get("folder")]
+        pinned = {s["path"] for s in self.shortcuts}
+        self.shortcuts.extend(build for build in latest if build["path"] not in pinned)
+        self.refresh_shortcuts_ui()
 
     def on_closing(self):
-        self.save_shortcuts()
+        self.burst_running = False
+        if self.logcat_running:
+            self.stop_logcat()
+        self.cluster_telemetry_running = False
+        self.client.close()
+        self.install_queue.cancel_all()
+        self.apk_index.close()
+        self.shortcut_store.close()
+        for capture in self.logcat_captures.values():
+            capture.stop()
+        if self.png_pool:
+            self.png_pool.shutdown(wait=False, cancel_futures=True)
         self.root.destroy()
 
     def setup_apps_tab(self, parent):
@@ -465,13 +907,58 @@ class ADBManager:
         self.push_browse_btn = ttk.Button(push_frame, text="Browse", command=self.browse_src)
         self.push_browse_btn.grid(row=0, column=2, padx=10, pady=10)
         
+        self.push_browse_dir_btn = ttk.Button(push_frame, text="Folder", command=self.browse_src_dir)
+        self.push_browse_dir_btn.grid(row=0, column=3, padx=(0, 10), pady=10)
+        
         ttk.Label(push_frame, text="Destination (Device):").grid(row=1, column=0, padx=10, pady=10, sticky=tk.W)
         self.push_dest = ttk.Entry(push_frame, width=50)
         self.push_dest.insert(0, "/sdcard/Download/")
         self.push_dest.grid(row=1, column=1, padx=10, pady=10)
         
+        # Sync options (only transfer new or changed files)
+        sync_frame = ttk.Frame(push_frame)
+        sync_frame.grid(row=2, column=1, sticky=tk.W, padx=10)
+        
+        self.sync_mode = tk.BooleanVar(value=False)
+        self.sync_checksum = tk.BooleanVar(value=False)
+        self.sync_delete = tk.BooleanVar(value=False)
+        ttk.Checkbutton(sync_frame, text="Sync (changed only)", variable=self.sync_mode).pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Checkbutton(sync_frame, text="Verify checksums", variable=self.sync_checksum).pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Checkbutton(sync_frame, text="Delete extras", variable=self.sync_delete).pack(side=tk.LEFT)
+        
         self.push_btn = ttk.Button(push_frame, text="Push File", command=self.push_file)
-        self.push_btn.grid(row=2, column=1, pady=10)
+        self.push_btn.grid(row=3, column=1, pady=10)
+        
+        # Device Browser Section
+        browser_frame = ttk.LabelFrame(parent, text="Device Browser")
+        browser_frame.pack(fill=tk.BOTH, expand=True, padx=15, pady=15)
+        
+        tree_frame = ttk.Frame(browser_frame)
+        tree_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=(10, 5))
+        
+        self.remote_tree = ttk.Treeview(tree_frame, columns=("size", "modified"), height=8, selectmode="browse")
+        self.remote_tree.heading("#0", text="Name")
+        self.remote_tree.heading("size", text="Size")
+        self.remote_tree.heading("modified", text="Modified")
+        self.remote_tree.column("#0", width=350, anchor=tk.W)
+        self.remote_tree.column("size", width=100, anchor=tk.E)
+        self.remote_tree.column("modified", width=150, anchor=tk.W)
+        
+        scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.remote_tree.yview)
+        self.remote_tree.configure(yscroll=scrollbar.set)
+        
+        self.remote_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        self.remote_tree.bind("<<TreeviewOpen>>", self.on_remote_dir_open)
+        self.remote_tree.bind("<<TreeviewSelect>>", self.on_remote_select)
+        
+        ttk.Button(browser_frame, text="Refresh", command=self.refresh_remote_dir).pack(anchor=tk.E, padx=10, pady=(0, 10))
+        
+        # Top level folders; children are listed lazily on expand
+        for path in ("/sdcard", "/data/local/tmp"):
+            self.remote_tree.insert("", tk.END, iid=path, text=path, values=("", ""))
+            self.remote_tree.insert(path, tk.END, iid=path + "::loading", text="Loading...")
 
     def setup_cmd_tab(self, parent):
         btn_frame = ttk.Frame(parent)
@@ -481,8 +968,9 @@ class ADBManager:
             ("Reboot", "reboot"),
             ("Reboot to Bootloader", "reboot bootloader"),
             ("Reboot to Recovery", "reboot recovery"),
-            ("Take Screenshot", "shell screencap -p /sdcard/screenshot.png"),
-            ("Show Device Info", "shell getprop"),
+            ("Take Screenshot", self.take_screenshot),
+            ("Screen Mirror", self.start_screen_mirror),
+            ("Show Device Info", self.show_device_info),
             ("List Devices", "devices -l")
         ]
         
@@ -491,10 +979,97 @@ class ADBManager:
             row = i // 3
             col = i % 3
             btn = ttk.Button(btn_frame, text=text, 
-                      command=lambda c=cmd: self.run_adb_command(c))
+                      command=cmd if callable(cmd) else lambda c=cmd: self.client.run_adb_command(c))
             btn.grid(row=row, column=col, padx=5, pady=5, sticky="ew")
             self.cmd_buttons.append(btn)
             btn_frame.grid_columnconfigure(col, weight=1)
+        
+        # Burst capture for visual regression runs
+        burst_frame = ttk.LabelFrame(parent, text="Burst Capture")
+        burst_frame.pack(fill=tk.X, padx=15, pady=15)
+        
+        ttk.Label(burst_frame, text="Frames/sec:").pack(side=tk.LEFT, padx=(10, 5), pady=10)
+        self.burst_fps = tk.IntVar(value=2)
+        ttk.Spinbox(burst_frame, from_=1, to=30, textvariable=self.burst_fps, width=5).pack(side=tk.LEFT, padx=5)
+        
+        ttk.Label(burst_frame, text="Duration (s):").pack(side=tk.LEFT, padx=(15, 5))
+        self.burst_seconds = tk.IntVar(value=10)
+        ttk.Spinbox(burst_frame, from_=1, to=3600, textvariable=self.burst_seconds, width=6).pack(side=tk.LEFT, padx=5)
+        
+        self.burst_btn = ttk.Button(burst_frame, text="Start Burst", command=self.toggle_burst_capture)
+        self.burst_btn.pack(side=tk.LEFT, padx=15)
+
+    def setup_logcat_tab(self, parent):
+        """Create tab for the real-time logcat viewer"""
+        # Filter bar
+        filter_frame = ttk.Frame(parent)
+        filter_frame.pack(fill=tk.X, padx=15, pady=(15, 5))
+        
+        ttk.Label(filter_frame, text="Tag:").pack(side=tk.LEFT, padx=(0, 5))
+        self.logcat_tag = ttk.Entry(filter_frame, width=15)
+        self.logcat_tag.pack(side=tk.LEFT, padx=(0, 10))
+        
+        ttk.Label(filter_frame, text="Priority:").pack(side=tk.LEFT, padx=(0, 5))
+        self.logcat_priority = tk.StringVar(value="V")
+        priority_combo = ttk.Combobox(filter_frame, textvariable=self.logcat_priority, width=3, state="readonly")
+        priority_combo['values'] = tuple(LOGCAT_PRIORITIES)
+        priority_combo.pack(side=tk.LEFT, padx=(0, 10))
+        
+        ttk.Label(filter_frame, text="PID:").pack(side=tk.LEFT, padx=(0, 5))
+        self.logcat_pid = ttk.Entry(filter_frame, width=7)
+        self.logcat_pid.pack(side=tk.LEFT, padx=(0, 10))
+        
+        ttk.Label(filter_frame, text="Regex:").pack(side=tk.LEFT, padx=(0, 5))
+        self.logcat_regex = ttk.Entry(filter_frame, width=20)
+        self.logcat_regex.pack(side=tk.LEFT, padx=(0, 10))
+        
+        ttk.Button(filter_frame, text="Apply Filter", command=self.apply_logcat_filter).pack(side=tk.LEFT, padx=5)
+        
+        # Controls
+        ctrl_frame = ttk.Frame(parent)
+        ctrl_frame.pack(fill=tk.X, padx=15, pady=5)
+        
+        self.logcat_btn = ttk.Button(ctrl_frame, text="Start Logcat", command=self.toggle_logcat)
+        self.logcat_btn.pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Button(ctrl_frame, text="Clear", command=self.clear_logcat).pack(side=tk.LEFT, padx=5)
+        
+        self.capture_btn = ttk.Button(ctrl_frame, text="Start Capture (All Devices)", command=self.toggle_logcat_capture)
+        self.capture_btn.pack(side=tk.LEFT, padx=(20, 5))
+        ttk.Button(ctrl_frame, text="Search Captures", command=self.show_capture_search).pack(side=tk.LEFT, padx=5)
+        
+        self.logcat_status = tk.StringVar(value="Stopped")
+        ttk.Label(ctrl_frame, textvariable=self.logcat_status).pack(side=tk.RIGHT, padx=5)
+        
+        # Virtualized view: the Text widget only ever holds the visible rows
+        view_frame = ttk.Frame(parent)
+        view_frame.pack(fill=tk.BOTH, expand=True, padx=15, pady=(5, 15))
+        
+        self.logcat_text = tk.Text(view_frame, wrap=tk.NONE, font=("Consolas", 9), state=tk.DISABLED)
+        self.logcat_scrollbar = ttk.Scrollbar(view_frame, orient=tk.VERTICAL, command=self.on_logcat_scroll)
+        self.logcat_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.logcat_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        
+        self.logcat_text.tag_configure("W", foreground="#c27c0e")
+        self.logcat_text.tag_configure("E", foreground="#d32f2f")
+        self.logcat_text.tag_configure("F", foreground="#d32f2f", font=("Consolas", 9, "bold"))
+        
+        self.logcat_text.bind("<MouseWheel>", self.on_logcat_wheel)
+        self.logcat_text.bind("<Button-4>", lambda e: self.scroll_logcat(-3))
+        self.logcat_text.bind("<Button-5>", lambda e: self.scroll_logcat(3))
+        self.logcat_text.bind("<Configure>", lambda e: self.mark_logcat_dirty())
+        
+        # Stream state
+        self.logcat_buffer = LogRingBuffer(LOGCAT_BUFFER_LINES)
+        self.logcat_lock = threading.Lock()
+        self.logcat_filter = None
+        self.logcat_top = 0
+        self.logcat_follow = True
+        self.logcat_dirty = False
+        self.logcat_received = 0
+        self.logcat_rate_time = time.monotonic()
+        self.logcat_line_height = tkfont.Font(font=self.logcat_text["font"]).metrics("linespace")
+        
+        self.root.after(100, self.render_logcat)
 
     def setup_perf_tab(self, parent):
         # Performance optimization section
@@ -542,6 +1117,26 @@ class ADBManager:
                        command=self.toggle_gpu_rendering)
         self.gpu_check.pack(side=tk.LEFT, padx=5)
         
+        # Tweak profiles
+        profile_frame = ttk.Frame(perf_frame)
+        profile_frame.pack(fill=tk.X, padx=10, pady=10)
+        
+        ttk.Label(profile_frame, text="Tweak Profile:").pack(side=tk.LEFT, padx=5)
+        self.tweak_profile = tk.StringVar()
+        self.tweak_profiles = self.client.load_tweak_profiles()
+        self.profile_combo = ttk.Combobox(profile_frame, textvariable=self.tweak_profile, width=18, state="readonly")
+        self.profile_combo['values'] = tuple(self.tweak_profiles)
+        if self.tweak_profiles:
+            self.profile_combo.current(0)
+        self.profile_combo.pack(side=tk.LEFT, padx=5)
+        
+        self.profile_all_devices = tk.BooleanVar(value=False)
+        ttk.Checkbutton(profile_frame, text="All connected devices",
+                       variable=self.profile_all_devices).pack(side=tk.LEFT, padx=5)
+        
+        ttk.Button(profile_frame, text="Apply Profile", command=self.apply_tweak_profile).pack(side=tk.LEFT, padx=5)
+        ttk.Button(profile_frame, text="Reload", command=self.reload_tweak_profiles).pack(side=tk.LEFT, padx=5)
+        
         # Performance monitoring
         monitor_frame = ttk.LabelFrame(parent, text="Performance Monitor")
         monitor_frame.pack(fill=tk.BOTH, expand=True, padx=15, pady=15)
@@ -668,37 +1263,322 @@ class ADBManager:
         
         self.set_thermal_btn = ttk.Button(thermal_frame, text="Apply Profile", command=self.set_thermal_profile)
         self.set_thermal_btn.pack(side=tk.LEFT, padx=5)
+        
+        # Per-cluster CPU policies
+        cluster_frame = ttk.LabelFrame(parent, text="CPU Clusters")
+        cluster_frame.pack(fill=tk.X, padx=15, pady=15)
+        
+        cluster_ctrl = ttk.Frame(cluster_frame)
+        cluster_ctrl.pack(fill=tk.X, padx=10, pady=(10, 0))
+        
+        ttk.Button(cluster_ctrl, text="Probe Clusters", command=self.probe_cpu_clusters).pack(side=tk.LEFT, padx=5)
+        ttk.Button(cluster_ctrl, text="Apply to Clusters", command=self.apply_cpu_clusters).pack(side=tk.LEFT, padx=5)
+        
+        self.cluster_live = tk.BooleanVar(value=False)
+        ttk.Checkbutton(cluster_ctrl, text="Live frequencies", variable=self.cluster_live,
+                       command=self.toggle_cluster_telemetry).pack(side=tk.LEFT, padx=5)
+        
+        self.cluster_rows_frame = ttk.Frame(cluster_frame)
+        self.cluster_rows_frame.pack(fill=tk.X, padx=10, pady=10)
+        self.cpu_policies = []
+        self.cluster_rows = {}
+        
+        # Rollback of everything tuned above
+        restore_frame = ttk.Frame(advanced_frame)
+        restore_frame.pack(fill=tk.X, padx=10, pady=10)
+        
+        self.restore_sysfs_btn = ttk.Button(restore_frame, text="Restore Original Values",
+                                           command=self.restore_sysfs_defaults)
+        self.restore_sysfs_btn.pack(side=tk.LEFT, padx=5)
 
-    def run_adb_command(self, command, wait=True, root=False):
-        """Execute ADB command and return output"""
+    # Logcat functions
+    def toggle_logcat(self):
+        """Start or stop the logcat stream"""
+        if self.logcat_running:
+            self.stop_logcat()
+        else:
+            self.start_logcat()
+
+    def start_logcat(self, serial=None):
+        """Stream binary logcat entries and parse them in a background thread"""
+        self.apply_logcat_filter()
         try:
-            self.log(f"Executing: adb {command} {'(as root)' if root else ''}")
+            process = self.client.open_adb_stream(["exec-out", "logcat", "-B"], serial=serial)
+        except Exception as e:
+            self.log(f"Error starting logcat: {str(e)}")
+            return
+        self.logcat_process = process
+        self.logcat_running = True
+        self.logcat_btn.configure(text="Stop Logcat")
+        threading.Thread(target=self._logcat_reader, args=(process,), daemon=True).start()
+        self.log("Logcat started")
+
+    def stop_logcat(self):
+        """Stop the logcat stream"""
+        self.logcat_running = False
+        if self.logcat_process and self.logcat_process.poll() is None:
+            self.logcat_process.terminate()
+        self.logcat_process = None
+        self.logcat_btn.configure(text="Start Logcat")
+
+    def _logcat_reader(self, process):
+        """Threaded parse + filter; only matching, formatted lines reach the ring buffer"""
+        pending = bytearray()
+        while self.logcat_running:
+            data = process.stdout.read(65536)
+            if not data:
+                break
+            pending += data
+            entries, consumed = parse_logcat_entries(pending)
+            del pending[:consumed]
             
-            # Handle paths without extra quotes
-            if isinstance(command, list):
-                cmd_list = [ADB_PATH] + command
-            else:
-                cmd_list = [ADB_PATH] + command.split()
-                
-            # Add root prefix if needed
-            if root:
-                cmd_list = [ADB_PATH, "shell", "su", "-c"] + [" ".join(cmd_list[1:])]
+            keep = self.logcat_filter
+            lines = []
+            for entry in entries:
+                if keep is None or keep(entry):
+                    lines.extend(format_logcat_entry(entry))
+            with self.logcat_lock:
+                self.logcat_buffer.extend(lines)
+                self.logcat_received += len(entries)
+                self.logcat_dirty = True
+        
+        if self.logcat_process is process:
+            self.root.after(0, self.stop_logcat)
+            self.log("Logcat stream ended")
+
+    def apply_logcat_filter(self):
+        """Compile the filter fields; applies to entries received from now on"""
+        try:
+            self.logcat_filter = make_logcat_filter(
+                self.logcat_tag.get(), self.logcat_priority.get(),
+                self.logcat_pid.get(), self.logcat_regex.get()
+            )
+        except re.error as e:
+            self.log(f"Invalid logcat regex: {str(e)}")
+
+    def clear_logcat(self):
+        """Drop all buffered lines"""
+        with self.logcat_lock:
+            self.logcat_buffer.clear()
+            self.logcat_top = 0
+            self.logcat_follow = True
+        self.mark_logcat_dirty()
+
+    def toggle_logcat_capture(self):
+        """Start or stop background capture on every connected device"""
+        if self.logcat_captures:
+            captures = list(self.logcat_captures.values())
+            self.logcat_captures = {}
+            self.capture_btn.configure(text="Start Capture (All Devices)")
+            self.run_threaded(lambda: [capture.stop() for capture in captures])
+            self.log(f"Stopped logcat capture on {len(captures)} device(s)")
+            return
+        
+        serials = self.client.get_connected_devices()
+        if not serials:
+            self.log("No devices connected for logcat capture")
+            return
+        codec = "zstd" if zstandard else "gzip"
+        for serial in serials:
+            capture = LogcatCapture(self.client, serial, self.client.get_capture_dir(), codec)
+            capture.start()
+            self.logcat_captures[serial] = capture
+        self.capture_btn.configure(text="Stop Capture")
+        self.log(f"Capturing logcat ({codec}) from {', '.join(serials)} to {self.client.get_capture_dir()}")
+
+    def show_capture_search(self):
+        """Dialog to search captured logcat by time window, tag and regex"""
+        window = tk.Toplevel(self.root)
+        window.title("Search Logcat Captures")
+        window.geometry("900x600")
+        
+        form = ttk.Frame(window)
+        form.pack(fill=tk.X, padx=10, pady=10)
+        fields = {}
+        for col, (label, width) in enumerate((("From (YYYY-MM-DD HH:MM:SS)", 20), ("To", 20),
+                                               ("Tags (comma separated)", 20), ("Regex", 20))):
+            ttk.Label(form, text=label).grid(row=0, column=col, padx=5, sticky=tk.W)
+            entry = ttk.Entry(form, width=width)
+            entry.grid(row=1, column=col, padx=5)
+            fields[label] = entry
+        
+        results = scrolledtext.ScrolledText(window, wrap=tk.NONE, font=("Consolas", 9))
+        results.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        
+        def parse_time(text):
+            text = text.strip()
+            return datetime.strptime(text, "%Y-%m-%d %H:%M:%S").timestamp() if text else None
+        
+        def show(lines):
+            results.delete("1.0", tk.END)
+            results.insert("1.0", "\n".join(lines) if lines else "No matching entries")
+        
+        def search():
+            try:
+                start = parse_time(fields["From (YYYY-MM-DD HH:MM:SS)"].get())
+                end = parse_time(fields["To"].get())
+                tags = [t.strip() for t in fields["Tags (comma separated)"].get().split(",") if t.strip()]
+                pattern = fields["Regex"].get()
+            except ValueError as e:
+                show([f"Invalid time: {str(e)}"])
+                return
+            
+            def worker():
+                try:
+                    found = search_logcat_captures(self.client.get_capture_dir(), start, end, tags, pattern)
+                    lines = [f"[{name.rsplit('_', 3)[0]}] {line}"
+                             for name, entry in found for _, line in format_logcat_entry(entry)]
+                except Exception as e:
+                    lines = [f"Search failed: {str(e)}"]
+                self.root.after(0, lambda: show(lines))
+            self.run_threaded(worker)
+        
+        ttk.Button(form, text="Search", command=search).grid(row=1, column=4, padx=10)
+
+    def mark_logcat_dirty(self):
+        self.logcat_dirty = True
+
+    def logcat_visible_rows(self):
+        return max(1, self.logcat_text.winfo_height() // max(1, self.logcat_line_height))
+
+    def scroll_logcat(self, delta):
+        """Move the view by delta lines; scrolling to the end re-enables follow mode"""
+        rows = self.logcat_visible_rows()
+        with self.logcat_lock:
+            last_top = max(self.logcat_buffer.first, self.logcat_buffer.total - rows)
+            self.logcat_top = min(max(self.logcat_top + delta, self.logcat_buffer.first), last_top)
+            self.logcat_follow = self.logcat_top >= last_top
+        self.mark_logcat_dirty()
+        return "break"
+
+    def on_logcat_wheel(self, event):
+        return self.scroll_logcat(int(-3 * (event.delta / 120)))
+
+    def on_logcat_scroll(self, action, amount, unit=None):
+        """Scrollbar callback for the virtualized view"""
+        rows = self.logcat_visible_rows()
+        if action == "moveto":
+            with self.logcat_lock:
+                target = self.logcat_buffer.first + int(float(amount) * len(self.logcat_buffer))
+            self.scroll_logcat(target - self.logcat_top)
+        elif action == "scroll":
+            self.scroll_logcat(int(amount) * (rows if unit == "pages" else 1))
+
+    def render_logcat(self):
+        """Redraw only the visible slice of the ring buffer (10x per second at most)"""
+        try:
+            now = time.monotonic()
+            if now - self.logcat_rate_time >= 1:
+                with self.logcat_lock:
+                    rate = self.logcat_received / (now - self.logcat_rate_time)
+                    self.logcat_received = 0
+                    stored = len(self.logcat_buffer)
+                self.logcat_rate_time = now
+                if self.logcat_running:
+                    self.logcat_status.set(f"{rate:.0f} lines/s, {stored} buffered")
+            
+            if self.logcat_dirty:
+                rows = self.logcat_visible_rows()
+                with self.logcat_lock:
+                    self.logcat_dirty = False
+                    buffer = self.logcat_buffer
+                    last_top = max(buffer.first, buffer.total - rows)
+                    if self.logcat_follow:
+                        self.logcat_top = last_top
+                    self.logcat_top = min(max(self.logcat_top, buffer.first), last_top)
+                    lines = buffer.slice(self.logcat_top, rows)
+                    size = max(1, len(buffer))
+                    first = (self.logcat_top - buffer.first) / size
                 
-            result = subprocess.run(cmd_list, 
-                                   capture_output=True, 
-                                   text=True,
-                                   timeout=30)
-            output = result.stdout or result.stderr
-            self.log(f"Result:\n{output}")
-            return output
-        except FileNotFoundError:
-            error = f"ADB not found at {ADB_PATH}. Please check the path."
-            self.log(error)
-            return error
+                self.logcat_text.config(state=tk.NORMAL)
+                self.logcat_text.delete("1.0", tk.END)
+                self.logcat_text.insert("1.0", "\n".join(line for _, line in lines))
+                for row, (letter, _) in enumerate(lines, start=1):
+                    if letter in ("W", "E", "F"):
+                        self.logcat_text.tag_add(letter, f"{row}.0", f"{row}.end")
+                self.logcat_text.config(state=tk.DISABLED)
+                self.logcat_scrollbar.set(first, min(1.0, first + len(lines) / size))
         except Exception as e:
-            error = f"Error: {str(e)}"
-            self.log(error)
-            return error
+            self.log(f"Logcat view error: {str(e)}")
+        self.root.after(100, self.render_logcat)
+
+    # Screenshot functions
+    def get_png_pool(self):
+        """Worker processes that PNG-encode captured frames off the UI process"""
+        if self.png_pool is None:
+            self.png_pool = concurrent.futures.ProcessPoolExecutor(max_workers=max(1, (os.cpu_count() or 2) - 1))
+        return self.png_pool
+
+    def start_screen_mirror(self):
+        """Open a live mirror window"""
+        self.log("Starting screen mirror")
+        ScreenMirror(self)
+
+    def take_screenshot(self):
+        """Capture a screenshot to the host without touching device storage"""
+        self.run_threaded(self._take_screenshot_thread)
+
+    def _take_screenshot_thread(self):
+        """Threaded screenshot capture"""
+        try:
+            os.makedirs(SCREENSHOT_DIR, exist_ok=True)
+            raw = self.client.capture_screen_raw()
+            path = os.path.join(SCREENSHOT_DIR, datetime.now().strftime("screenshot_%Y%m%d_%H%M%S_%f")[:-3] + ".png")
+            future = self.get_png_pool().submit(encode_png, raw, path)
+            future.add_done_callback(lambda f: self.log(
+                f"Screenshot saved to {f.result()}" if not f.exception() else f"Error encoding screenshot: {f.exception()}"
+            ))
+        except Exception as e:
+            self.log(f"Error taking screenshot: {str(e)}")
+
+    def toggle_burst_capture(self):
+        """Start or stop a burst capture"""
+        if self.burst_running:
+            self.burst_running = False
+            return
+        try:
+            fps = max(1, int(self.burst_fps.get()))
+            seconds = max(1, int(self.burst_seconds.get()))
+        except (tk.TclError, ValueError):
+            self.log("Error: Burst frames/sec and duration must be numbers")
+            return
+        self.burst_running = True
+        self.burst_btn.configure(text="Stop Burst")
+        self.run_threaded(lambda: self.burst_capture(fps, seconds))
+
+    def burst_capture(self, fps, seconds, serial=None):
+        """Capture fps frames per second for the given duration into a new folder"""
+        out_dir = os.path.join(SCREENSHOT_DIR, datetime.now().strftime("burst_%Y%m%d_%H%M%S"))
+        pending = []
+        captured = 0
+        try:
+            os.makedirs(out_dir, exist_ok=True)
+            self.log(f"Burst capture started: {fps} fps for {seconds}s -> {out_dir}")
+            pool = self.get_png_pool()
+            interval = 1.0 / fps
+            start = time.monotonic()
+            
+            for frame in range(fps * seconds):
+                if not self.burst_running:
+                    break
+                # Wait for the next slot; if capture falls behind, keep going without sleeping
+                delay = start + frame * interval - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                raw = self.client.capture_screen_raw(serial=serial)
+                pending.append(pool.submit(encode_png, raw, os.path.join(out_dir, f"frame_{frame:05d}.png")))
+                captured += 1
+            
+            elapsed = time.monotonic() - start
+            concurrent.futures.wait(pending)
+            failed = sum(1 for f in pending if f.exception())
+            self.log(f"Burst capture done: {captured} frames in {elapsed:.1f}s "
+                     f"({captured / max(elapsed, 0.001):.1f} fps), {failed} failed")
+        except Exception as e:
+            self.log(f"Error during burst capture: {str(e)}")
+        finally:
+            self.burst_running = False
+            self.root.after(0, lambda: self.burst_btn.configure(text="Start Burst"))
 
     def run_threaded(self, func):
         """Run function in a separate thread"""
@@ -733,7 +1613,9 @@ class ADBManager:
     def _check_connection(self):
         """Threaded device connection check"""
         try:
-            output = self.run_adb_command("devices", wait=True)
+            self.client.invalidate_remote_dir()
+            self.client.command_cache.invalidate()
+            output = self.client.run_adb_command("devices", wait=True)
             if "device" in output and not "unauthorized" in output:
                 self.connection_status.set("Connected")
             else:
@@ -742,15 +1624,21 @@ class ADBManager:
             
             # Check root status
             self.check_root_status()
+            
+            # Probe (or load) what this device supports while we are off the UI thread
+            if self.connection_status.get() == "Connected":
+                self.client.check_device_boot()
+                self.client.get_capabilities()
         except Exception as e:
             self.log(f"Connection check failed: {str(e)}")
             self.connection_status.set("Connection Error")
             self.update_status_color()
+        self.root.after(0, self.report_startup_time)
 
     def check_root_status(self):
         """Check if device is rooted"""
         try:
-            output = self.run_adb_command("shell su -c id", wait=True)
+            output = self.client.run_adb_command("shell su -c id", wait=True)
             if "uid=0" in output:
                 self.root_status.set("Root: Granted")
                 self.root_label.configure(foreground="green")
@@ -773,40 +1661,24 @@ class ADBManager:
             for item in self.tree.get_children():
                 self.tree.delete(item)
                 
-            # Try multiple commands to get app list
-            commands = [
-                "shell pm list packages -s -3 -u -i",  # Preferred command
-                "shell pm list packages -s -3",        # Fallback 1
-                "shell pm list packages -3"            # Fallback 2
-            ]
-            
-            output = ""
-            for cmd in commands:
-                output = self.run_adb_command(cmd, wait=True)
-                if output and "package:" in output and "Error" not in output:
-                    break
-            
-            if not output or "Error" in output:
-                self.log("Failed to load apps: " + output)
+            try:
+                packages = self.client.list_packages()
+            except RuntimeError as e:
+                self.log(f"Failed to load apps: {str(e)}")
                 self.tree.insert("", tk.END, values=("Failed to load apps", "", "Error"))
                 return
-                
-            packages = [line.split(':')[1].strip() for line in output.splitlines() if line.startswith('package:')]
             
             if not packages:
                 self.log("No apps found in device")
                 self.tree.insert("", tk.END, values=("No apps found", "", ""))
                 return
                 
+            # One listing of disabled packages instead of a query per app
+            disabled = self.client.get_disabled_packages()
             for package in packages:
                 # Get app name
                 app_name = "Fetching..."
-                status = "Enabled"
-                
-                # Check if disabled
-                status_output = self.run_adb_command(f"shell pm list packages -d {package}")
-                if status_output and "package:" + package in status_output:
-                    status = "Disabled"
+                status = "Disabled" if package in disabled else "Enabled"
                 
                 # Insert with placeholder
                 self.tree.insert("", tk.END, values=(app_name, package, status))
@@ -822,23 +1694,7 @@ class ADBManager:
     def update_app_name(self, package):
         """Get application name for package"""
         try:
-            output = self.run_adb_command(f"shell dumpsys package {package}")
-            if not output:
-                return
-                
-            # Find app name using multiple patterns
-            app_name = package
-            patterns = [
-                r'application: label=([\'"])(.*?)\1',
-                r'package:.*?labelRes=.*?label=([\'"])(.*?)\1',
-                r'Package \[.*?\] \(.*?\):.*?name=.*? label=([\'"])(.*?)\1'
-            ]
-            
-            for pattern in patterns:
-                match = re.search(pattern, output)
-                if match:
-                    app_name = match.group(2)
-                    break
+            app_name = self.client.get_app_label(package)
             
             # Update treeview
             for item in self.tree.get_children():
@@ -864,8 +1720,7 @@ class ADBManager:
         if not apk_path:
             return
             
-        # Use list command to avoid quoting issues
-        self.run_threaded(lambda: self.run_adb_command(["install", apk_path]))
+        self.run_threaded(lambda: self.client.install_apk(apk_path))
 
     def install_xapk(self):
         """Install XAPK package"""
@@ -878,39 +1733,7 @@ class ADBManager:
     def _install_xapk_thread(self, xapk_path):
         """Threaded XAPK installation"""
         try:
-            self.log(f"Processing XAPK: {xapk_path}")
-            
-            # Create temporary directory
-            temp_dir = tempfile.mkdtemp(prefix="xapk_")
-            self.log(f"Created temporary directory: {temp_dir}")
-            
-            # Extract XAPK
-            with zipfile.ZipFile(xapk_path, 'r') as zip_ref:
-                zip_ref.extractall(temp_dir)
-                self.log(f"Extracted XAPK to: {temp_dir}")
-            
-            # Find APK files
-            apk_files = []
-            for root, dirs, files in os.walk(temp_dir):
-                for file in files:
-                    if file.lower().endswith(".apk"):
-                        apk_files.append(os.path.join(root, file))
-            
-            if not apk_files:
-                self.log("Error: No APK files found in XAPK package")
-                return
-                
-            # Sort by size to install main APK first
-            apk_files.sort(key=lambda x: os.path.getsize(x), reverse=True)
-            self.log(f"Found APK files: {', '.join(apk_files)}")
-            
-            # Install using install-multiple
-            cmd = ["install-multiple"] + apk_files
-            result = self.run_adb_command(cmd)
-            
-            # Clean up temporary directory
-            shutil.rmtree(temp_dir)
-            self.log("Cleaned up temporary files")
+            result = self.client.install_xapk(xapk_path)
             
             # Show result
             if "Success" in result:
@@ -928,27 +1751,27 @@ class ADBManager:
         """Uninstall selected app"""
         package = self.get_selected_package()
         if package:
-            self.run_threaded(lambda: self.run_adb_command(["uninstall", "--user", "0", package]))
+            self.run_threaded(lambda: self.client.uninstall_package(package))
 
     def disable_app(self):
         """Disable selected app"""
         package = self.get_selected_package()
         if package:
-            self.run_threaded(lambda: self.run_adb_command(["shell", "pm", "disable-user", "--user", "0", package]))
+            self.run_threaded(lambda: self.client.disable_package(package))
             self.refresh_apps_list()
 
     def enable_app(self):
         """Enable selected app"""
         package = self.get_selected_package()
         if package:
-            self.run_threaded(lambda: self.run_adb_command(["shell", "pm", "enable", package]))
+            self.run_threaded(lambda: self.client.enable_package(package))
             self.refresh_apps_list()
 
     def clear_app_cache(self):
         """Clear app cache"""
         package = self.get_selected_package()
         if package:
-            self.run_threaded(lambda: self.run_adb_command(["shell", "pm", "clear", package]))
+            self.run_threaded(lambda: self.client.clear_package_data(package))
 
     def browse_dest(self):
         """Browse for destination directory"""
@@ -964,6 +1787,13 @@ class ADBManager:
             self.push_src.delete(0, tk.END)
             self.push_src.insert(0, file_path)
 
+    def browse_src_dir(self):
+        """Browse for source directory"""
+        directory = filedialog.askdirectory()
+        if directory:
+            self.push_src.delete(0, tk.END)
+            self.push_src.insert(0, directory)
+
     def pull_file(self):
         """Pull file from device"""
         src = self.pull_src.get().strip()
@@ -976,7 +1806,11 @@ class ADBManager:
             self.log(f"Created directory: {dest_dir}")
             
         self.log(f"Pulling {src} to {dest}")
-        self.run_threaded(lambda: self.run_adb_command(["pull", src, dest]))
+        self.run_threaded(lambda: self._pull_file_thread(src, dest))
+
+    def _pull_file_thread(self, src, dest):
+        """Threaded pull; large single files use the resumable path"""
+        self.client.pull(src, dest)
 
     def push_file(self):
         """Push file to device"""
@@ -987,17 +1821,154 @@ class ADBManager:
             self.log(f"Error: Source file does not exist: {src}")
             return
             
-        self.log(f"Pushing {src} to {dest}")
-        self.run_threaded(lambda: self.run_adb_command(["push", src, dest]))
+        if self.sync_mode.get():
+            checksum = self.sync_checksum.get()
+            delete_extra = self.sync_delete.get()
+            self.log(f"Syncing {src} to {dest}")
+            self.run_threaded(lambda: self.client.sync_push(src, dest, checksum=checksum, delete_extra=delete_extra))
+            return
+        
+        if os.path.isfile(src) and os.path.getsize(src) >= LARGE_FILE_THRESHOLD:
+            self.log(f"Pushing {src} to {dest} in resumable chunks")
+        else:
+            self.log(f"Pushing {src} to {dest}")
+        self.run_threaded(lambda: self.client.push(src, dest))
+
+    # Remote file browser functions
+    def on_remote_dir_open(self, event):
+        """Load the children of an expanded folder"""
+        path = self.remote_tree.focus()
+        if not path:
+            return
+        entries = self.client.get_cached_remote_dir(path)
+        if entries is not None:
+            self._populate_remote_dir(path, entries)
+            self.prefetch_remote_siblings(path)
+        else:
+            self.run_threaded(lambda: self._load_remote_dir(path))
+
+    def _load_remote_dir(self, path):
+        """Threaded directory listing"""
+        try:
+            entries = self.client.list_remote_dir(path)
+            self.root.after(0, lambda: self._populate_remote_dir(path, entries))
+            self.prefetch_remote_siblings(path)
+        except Exception as e:
+            self.log(f"Error listing {path}: {str(e)}")
+
+    def _populate_remote_dir(self, path, entries):
+        """Replace the children of a folder node with a listing"""
+        if not self.remote_tree.exists(path):
+            return
+        self.remote_tree.delete(*self.remote_tree.get_children(path))
+        for entry in entries:
+            child = posixpath.join(path, entry["name"])
+            modified = datetime.fromtimestamp(entry["mtime"]).strftime("%Y-%m-%d %H:%M") if entry["mtime"] else ""
+            size = "" if entry["is_dir"] else format_size(entry["size"])
+            self.remote_tree.insert(path, tk.END, iid=child, text=entry["name"], values=(size, modified))
+            if entry["is_dir"]:
+                self.remote_tree.insert(child, tk.END, iid=child + "::loading", text="Loading...")
+
+    def prefetch_remote_siblings(self, path, limit=8):
+        """List sibling folders in the background so expanding them is instant"""
+        parent_entries = self.client.get_cached_remote_dir(posixpath.dirname(path))
+        if not parent_entries:
+            return
+        siblings = [posixpath.join(posixpath.dirname(path), e["name"]) for e in parent_entries if e["is_dir"]]
+        pending = [p for p in siblings if p != path and self.client.get_cached_remote_dir(p) is None][:limit]
+        if pending:
+            self.run_threaded(lambda: [self.client.list_remote_dir(p) for p in pending])
+
+    def refresh_remote_dir(self):
+        """Re-list the selected folder (or the folder of the selected file)"""
+        selection = self.remote_tree.selection()
+        if not selection:
+            return
+        path = selection[0]
+        if not self.remote_tree.get_children(path):
+            path = self.remote_tree.parent(path) or path
+        self.client.invalidate_remote_dir(path)
+        self.remote_tree.item(path, open=True)
+        self.run_threaded(lambda: self._load_remote_dir(path))
+
+    def on_remote_select(self, event):
+        """Use the selected remote path as pull source / push destination"""
+        selection = self.remote_tree.selection()
+        if not selection or selection[0].endswith("::loading"):
+            return
+        path = selection[0]
+        self.pull_src.delete(0, tk.END)
+        self.pull_src.insert(0, path)
+        if self.remote_tree.get_children(path):
+            self.push_dest.delete(0, tk.END)
+            self.push_dest.insert(0, path + "/")
+
+    # Device properties
+    def show_device_info(self):
+        """Searchable panel over the cached device properties"""
+        window = tk.Toplevel(self.root)
+        window.title("Device Info")
+        window.geometry("800x600")
+        
+        summary = tk.StringVar(value="Loading properties...")
+        ttk.Label(window, textvariable=summary, font=("Segoe UI", 10, "bold")).pack(fill=tk.X, padx=10, pady=(10, 5))
+        
+        search_frame = ttk.Frame(window)
+        search_frame.pack(fill=tk.X, padx=10, pady=5)
+        ttk.Label(search_frame, text="Search:").pack(side=tk.LEFT, padx=(0, 5))
+        query = tk.StringVar()
+        search_entry = ttk.Entry(search_frame, textvariable=query)
+        search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        
+        tree_frame = ttk.Frame(window)
+        tree_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=(5, 10))
+        tree = ttk.Treeview(tree_frame, columns=("property", "value"), show="headings")
+        tree.heading("property", text="Property")
+        tree.heading("value", text="Value")
+        tree.column("property", width=320)
+        tree.column("value", width=440)
+        scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        props = {}
+        
+        def show_matches(*_):
+            needle = query.get().lower()
+            tree.delete(*tree.get_children())
+            for name in sorted(props):
+                if needle in name.lower() or needle in props[name].lower():
+                    tree.insert("", tk.END, values=(name, props[name]))
+        
+        def loaded(result):
+            props.clear()
+            props.update(result)
+            get = result.get
+            summary.set(f"{get('ro.product.manufacturer', '?')} {get('ro.product.model', '?')}  |  "
+                        f"Android {get('ro.build.version.release', '?')} (SDK {get('ro.build.version.sdk', '?')})  |  "
+                        f"{get('ro.product.cpu.abi', '?')}  |  {len(result)} properties")
+            show_matches()
+        
+        def load(refresh=False):
+            def worker():
+                result = self.client.get_device_properties(refresh=refresh)
+                self.root.after(0, lambda: loaded(result))
+            self.run_threaded(worker)
+        
+        ttk.Button(search_frame, text="Refresh", command=lambda: load(refresh=True)).pack(side=tk.LEFT, padx=(5, 0))
+        query.trace_add("write", show_matches)
+        search_entry.focus_set()
+        load()
 
     # Performance tab functions
     def apply_anim_scale(self):
         """Apply animation scale settings"""
         scale = self.anim_scale.get()
-        self.run_adb_command(["shell", "settings", "put", "global", "window_animation_scale", str(scale)])
-        self.run_adb_command(["shell", "settings", "put", "global", "transition_animation_scale", str(scale)])
-        self.run_adb_command(["shell", "settings", "put", "global", "animator_duration_scale", str(scale)])
-        self.log(f"Animation scales set to {scale}x")
+        def worker():
+            self.client.apply_tweaks({"settings": [["global", key, str(scale)] for key in ANIMATION_SCALE_KEYS]})
+            self.root.after(0, lambda: self.log(f"Animation scales set to {scale}x"))
+        self.run_threaded(worker)
 
     def disable_animations(self):
         """Disable all animations"""
@@ -1007,27 +1978,81 @@ class ADBManager:
     def apply_fps_mode(self):
         """Apply selected FPS mode"""
         mode = self.fps_mode.get()
-        if mode == "Normal":
-            self.log("FPS mode set to Normal")
-        elif mode == "90Hz Mode":
-            self.run_adb_command(["shell", "settings", "put", "system", "peak_refresh_rate", "90"])
-            self.log("FPS mode set to 90Hz")
-        elif mode == "120Hz Mode":
-            self.run_adb_command(["shell", "settings", "put", "system", "peak_refresh_rate", "120"])
-            self.log("FPS mode set to 120Hz")
-        elif mode == "Ultra Smooth":
-            self.run_adb_command(["shell", "settings", "put", "system", "min_refresh_rate", "120"])
-            self.run_adb_command(["shell", "settings", "put", "system", "peak_refresh_rate", "120"])
-            self.log("Ultra Smooth mode enabled (120Hz locked)")
+        def worker():
+            # The first capability lookup probes the device, so it stays off the UI thread
+            rates = self.client.get_capabilities().get("refresh_rates") or []
+            wanted = {"90Hz Mode": 90, "120Hz Mode": 120, "Ultra Smooth": 120}.get(mode)
+            if wanted and rates and wanted not in rates:
+                message = f"Display does not support {wanted}Hz (modes: {', '.join(str(r) for r in rates)}Hz)"
+            elif mode == "Normal":
+                message = "FPS mode set to Normal"
+            elif mode == "90Hz Mode":
+                self.client.apply_tweaks({"settings": [["system", "peak_refresh_rate", "90"]]})
+                message = "FPS mode set to 90Hz"
+            elif mode == "120Hz Mode":
+                self.client.apply_tweaks({"settings": [["system", "peak_refresh_rate", "120"]]})
+                message = "FPS mode set to 120Hz"
+            elif mode == "Ultra Smooth":
+                self.client.apply_tweaks({"settings": [["system", "min_refresh_rate", "120"], ["system", "peak_refresh_rate", "120"]]})
+                message = "Ultra Smooth mode enabled (120Hz locked)"
+            else:
+                return
+            self.root.after(0, lambda: self.log(message))
+        self.run_threaded(worker)
 
     def toggle_gpu_rendering(self):
         """Toggle GPU rendering"""
-        if self.gpu_rendering.get():
-            self.run_adb_command(["shell", "settings", "put", "global", "debug.hwui.renderer", "skiagl"])
-            self.log("Forced GPU rendering enabled")
-        else:
-            self.run_adb_command(["shell", "settings", "put", "global", "debug.hwui.renderer", "opengl"])
-            self.log("GPU rendering set to default")
+        enabled = self.gpu_rendering.get()
+        def worker():
+            if enabled:
+                self.client.apply_tweaks({"settings": [["global", "debug.hwui.renderer", "skiagl"]]})
+                message = "Forced GPU rendering enabled"
+            else:
+                self.client.apply_tweaks({"settings": [["global", "debug.hwui.renderer", "opengl"]]})
+                message = "GPU rendering set to default"
+            self.root.after(0, lambda: self.log(message))
+        self.run_threaded(worker)
+
+    # Tweak profiles
+    def reload_tweak_profiles(self):
+        """Re-read tweak_profiles.json after it was edited"""
+        self.tweak_profiles = self.client.load_tweak_profiles()
+        self.profile_combo['values'] = tuple(self.tweak_profiles)
+        if self.tweak_profile.get() not in self.tweak_profiles and self.tweak_profiles:
+            self.profile_combo.current(0)
+        self.log(f"Loaded {len(self.tweak_profiles)} tweak profiles")
+
+    def apply_tweak_profile(self):
+        """Apply the selected profile to the current device or fan it out to every connected one"""
+        name = self.tweak_profile.get()
+        profile = self.tweak_profiles.get(name)
+        if not profile:
+            messagebox.showerror("Error", "Select a tweak profile")
+            return
+        all_devices = self.profile_all_devices.get()
+        
+        def worker():
+            serials = self.client.get_connected_devices() if all_devices else [None]
+            if not serials:
+                self.log("No devices connected")
+                return
+            with concurrent.futures.ThreadPoolExecutor(max_workers=min(8, len(serials))) as pool:
+                futures = {pool.submit(self.client.apply_tweaks, profile, serial): serial for serial in serials}
+                for future in concurrent.futures.as_completed(futures):
+                    device = futures[future] or "device"
+                    try:
+                        results = future.result()
+                    except Exception as e:
+                        self.log(f"Profile '{name}' failed on {device}: {str(e)}")
+                        continue
+                    applied = sum(1 for label, ok in results if ok and not label.endswith("(unchanged)"))
+                    unchanged = sum(1 for label, _ in results if label.endswith("(unchanged)"))
+                    self.log(f"Profile '{name}' on {device}: {applied} written, {unchanged} already set, "
+                             f"{len(results) - applied - unchanged} failed")
+                    for label, ok in results:
+                        if not ok:
+                            self.log(f"  {'failed' if ok is False else 'no status'}: {label}")
+        self.run_threaded(worker)
 
     def toggle_monitoring(self):
         """Toggle performance monitoring"""
@@ -1041,8 +2066,11 @@ class ADBManager:
 
     def monitor_performance(self):
         """Monitor device performance"""
+        if not self.perf_visible:
+            self.perf_job = None
+            return
         if not self.monitoring:
-            self.root.after(1000, self.monitor_performance)
+            self.perf_job = self.root.after(1000, self.monitor_performance)
             return
             
         try:
@@ -1073,7 +2101,7 @@ class ADBManager:
             self.log(f"Monitoring error: {str(e)}")
             
         # Schedule next update
-        self.root.after(1000, self.monitor_performance)
+        self.perf_job = self.root.after(1000, self.monitor_performance)
 
     def draw_performance_graph(self):
         """Draw performance graph on canvas"""
@@ -1124,63 +2152,203 @@ class ADBManager:
     # Root tools functions
     def grant_setedit_permission(self):
         """Grant WRITE_SECURE_SETTINGS permission to SetEdit app"""
-        self.run_threaded(lambda: self.run_adb_command(
+        self.run_threaded(lambda: self.client.run_adb_command(
             ["shell", "pm", "grant", "io.github.muntashirakon.setedit", "android.permission.WRITE_SECURE_SETTINGS"]
         ))
         self.log("Granted WRITE_SECURE_SETTINGS to SetEdit app")
 
+    # sysfs tuning transactions
+    def report_sysfs_results(self, action, results):
+        verified = sum(1 for _, ok in results if ok)
+        self.log(f"{action}: {verified}/{len(results)} nodes verified")
+        for label, ok in results:
+            if not ok:
+                self.log(f"  not applied: {label}")
+
+    def run_sysfs_transaction(self, action, writes, requires=None):
+        """Run a tuning transaction in the background and log the verified result"""
+        def worker():
+            try:
+                caps = self.client.get_capabilities()
+                if not caps.get("root", True):
+                    self.log(f"{action} skipped: root is not available on this device")
+                    return
+                if requires and not caps["nodes"].get(requires, True):
+                    self.log(f"{action} skipped: {requires} does not exist on this device")
+                    return
+                self.report_sysfs_results(action, self.client.apply_sysfs_transaction(writes))
+            except Exception as e:
+                self.log(f"{action} failed: {str(e)}")
+        self.run_threaded(worker)
+
+    def restore_sysfs_defaults(self):
+        """Roll every tuned node back to the value it had before the first tweak"""
+        def worker():
+            try:
+                restored, failed = self.client.rollback_sysfs()
+                if not restored and not failed:
+                    self.log("No tuned nodes to restore")
+                    return
+                self.log(f"Restored {len(restored)} tuned nodes to their original values")
+                for path in failed:
+                    self.log(f"  could not restore: {path}")
+            except Exception as e:
+                self.log(f"Restore failed: {str(e)}")
+        self.run_threaded(worker)
+
     def set_zram_size(self):
         """Set zRAM size for virtual memory expansion"""
         size = self.zram_size.get()
-        self.run_threaded(lambda: self.run_adb_command(
-            ["shell", "su", "-c", f"echo {size}M > /sys/block/zram0/disksize && mkswap /dev/block/zram0 && swapon /dev/block/zram0"],
-            root=True
-        ))
-        self.log(f"Set zRAM size to {size}MB")
+        self.run_sysfs_transaction(f"Set zRAM size to {size}MB", [["/sys/block/zram0/disksize", f"{size}M"]],
+                                   requires="/sys/block/zram0")
 
     def set_swappiness(self):
         """Set swappiness value for virtual memory"""
         value = self.swappiness.get()
-        self.run_threaded(lambda: self.run_adb_command(
-            ["shell", "su", "-c", f"echo {value} > /proc/sys/vm/swappiness"],
-            root=True
-        ))
-        self.log(f"Set swappiness to {value}")
+        self.run_sysfs_transaction(f"Set swappiness to {value}", [["/proc/sys/vm/swappiness", str(value)]])
 
     def toggle_kernel_tweaks(self):
         """Toggle kernel performance tweaks"""
         if self.kernel_tweaks.get():
-            tweaks = [
-                "echo 1 > /proc/sys/vm/oom_kill_allocating_task",
-                "echo 0 > /proc/sys/vm/page-cluster",
-                "echo 10 > /proc/sys/vm/dirty_ratio",
-                "echo 5 > /proc/sys/vm/dirty_background_ratio",
-                "echo 500 > /proc/sys/vm/dirty_expire_centisecs",
-                "echo 100 > /proc/sys/vm/dirty_writeback_centisecs"
-            ]
-            for tweak in tweaks:
-                self.run_adb_command(["shell", "su", "-c", tweak], root=True)
-            self.log("Applied kernel tweaks for performance")
+            self.run_sysfs_transaction("Applied kernel tweaks for performance", KERNEL_TWEAKS)
         else:
-            self.log("Kernel tweaks disabled")
+            def worker():
+                try:
+                    restored, failed = self.client.rollback_sysfs([path for path, _ in KERNEL_TWEAKS])
+                    self.log(f"Kernel tweaks disabled: restored {len(restored)} nodes"
+                             + (f", {len(failed)} failed" if failed else ""))
+                except Exception as e:
+                    self.log(f"Error disabling kernel tweaks: {str(e)}")
+            self.run_threaded(worker)
 
     def set_cpu_governor(self):
-        """Set CPU governor for performance"""
+        """Set CPU governor for performance on every core"""
         governor = self.cpu_governor.get()
-        self.run_threaded(lambda: self.run_adb_command(
-            ["shell", "su", "-c", f"echo {governor} > /sys/devices/system/cpu/cpu0/cpufreq/scaling_governor"],
-            root=True
-        ))
-        self.log(f"Set CPU governor to {governor}")
+        self.run_sysfs_transaction(f"Set CPU governor to {governor}",
+                                   [["/sys/devices/system/cpu/cpu*/cpufreq/scaling_governor", governor]])
+
+    # Per-cluster CPU policies
+    def probe_cpu_clusters(self):
+        """Discover cpufreq policies with their governors and frequencies in one call"""
+        def worker():
+            try:
+                policies = self.client.get_cpu_policies()
+            except Exception as e:
+                self.log(f"Error probing CPU clusters: {str(e)}")
+                return
+            if not policies:
+                self.log("No cpufreq policies found on device")
+                return
+            self.log(f"Found {len(policies)} CPU clusters: "
+                     + ", ".join(f"{p['name']} (CPUs {p.get('related_cpus', '?')})" for p in policies))
+            self.root.after(0, lambda: self.populate_cpu_clusters(policies))
+        self.run_threaded(worker)
+
+    def populate_cpu_clusters(self, policies):
+        """Build one row of governor/min/max controls per cluster"""
+        for child in self.cluster_rows_frame.winfo_children():
+            child.destroy()
+        self.cpu_policies = policies
+        self.cluster_rows = {}
+        
+        for col, title in enumerate(("Cluster", "CPUs", "Governor", "Min", "Max", "Current")):
+            ttk.Label(self.cluster_rows_frame, text=title, font=("Segoe UI", 9, "bold")).grid(
+                row=0, column=col, padx=5, sticky=tk.W)
+        
+        for row, policy in enumerate(policies, start=1):
+            labels = [format_khz(f) for f in policy["frequencies"]]
+            row_vars = {
+                "governor": tk.StringVar(value=policy.get("scaling_governor", "")),
+                "min": tk.StringVar(value=format_khz(policy.get("scaling_min_freq", ""))),
+                "max": tk.StringVar(value=format_khz(policy.get("scaling_max_freq", ""))),
+                "current": tk.StringVar(value=format_khz(policy.get("scaling_cur_freq", ""))),
+                "khz": dict(zip(labels, policy["frequencies"]))
+            }
+            self.cluster_rows[policy["name"]] = row_vars
+            
+            ttk.Label(self.cluster_rows_frame, text=policy["name"]).grid(row=row, column=0, padx=5, sticky=tk.W)
+            ttk.Label(self.cluster_rows_frame, text=policy.get("related_cpus", "")).grid(row=row, column=1, padx=5, sticky=tk.W)
+            ttk.Combobox(self.cluster_rows_frame, textvariable=row_vars["governor"], values=policy["governors"],
+                         width=14, state="readonly").grid(row=row, column=2, padx=5, pady=2)
+            ttk.Combobox(self.cluster_rows_frame, textvariable=row_vars["min"], values=labels,
+                         width=10, state="readonly").grid(row=row, column=3, padx=5, pady=2)
+            ttk.Combobox(self.cluster_rows_frame, textvariable=row_vars["max"], values=labels,
+                         width=10, state="readonly").grid(row=row, column=4, padx=5, pady=2)
+            ttk.Label(self.cluster_rows_frame, textvariable=row_vars["current"], width=10).grid(
+                row=row, column=5, padx=5, sticky=tk.W)
+
+    def apply_cpu_clusters(self):
+        """Write governor and min/max for every cluster as one tuning transaction"""
+        if not self.cpu_policies:
+            messagebox.showerror("Error", "Probe the CPU clusters first")
+            return
+        
+        writes = []
+        for policy in self.cpu_policies:
+            row = self.cluster_rows[policy["name"]]
+            path = policy["path"]
+            governor = row["governor"].get()
+            new_min = row["khz"].get(row["min"].get())
+            new_max = row["khz"].get(row["max"].get())
+            if new_min and new_max and new_min > new_max:
+                messagebox.showerror("Error", f"{policy['name']}: minimum frequency is above the maximum")
+                return
+            
+            if governor:
+                writes.append([f"{path}/scaling_governor", governor])
+            # The kernel rejects a min above the current max (and vice versa), so order the writes
+            limits = [[f"{path}/scaling_min_freq", new_min], [f"{path}/scaling_max_freq", new_max]]
+            current_max = int(policy.get("scaling_max_freq", "0") or 0)
+            if new_min and new_min > current_max:
+                limits.reverse()
+            writes.extend([node, str(value)] for node, value in limits if value)
+        
+        def worker():
+            try:
+                self.report_sysfs_results(f"Applied settings to {len(self.cpu_policies)} CPU clusters",
+                                          self.client.apply_sysfs_transaction(writes))
+            except Exception as e:
+                self.log(f"Error applying CPU cluster settings: {str(e)}")
+            # Refresh the rows (and the limits the write order depends on)
+            self.probe_cpu_clusters()
+        self.run_threaded(worker)
+
+    def toggle_cluster_telemetry(self):
+        """Start or stop polling per-cluster current frequency"""
+        if self.cluster_live.get():
+            if not self.cpu_policies:
+                self.probe_cpu_clusters()
+            if self.cluster_telemetry_running:
+                return
+            self.cluster_telemetry_running = True
+            self.run_threaded(self._cluster_telemetry_loop)
+        else:
+            self.cluster_telemetry_running = False
+
+    def _cluster_telemetry_loop(self):
+        """Read scaling_cur_freq of every cluster once a second in a single shell call"""
+        while self.cluster_telemetry_running:
+            try:
+                freqs = self.client.read_cpu_frequencies()
+                self.root.after(0, lambda f=freqs: self.update_cluster_freqs(f))
+            except Exception as e:
+                self.log(f"CPU telemetry error: {str(e)}")
+                self.cluster_telemetry_running = False
+                break
+            time.sleep(1)
+
+    def update_cluster_freqs(self, freqs):
+        for name, khz in freqs.items():
+            row = self.cluster_rows.get(name)
+            if row:
+                row["current"].set(format_khz(khz))
 
     def set_thermal_profile(self):
         """Apply thermal throttling profile"""
         profile = self.thermal_profile.get().lower()
-        self.run_threaded(lambda: self.run_adb_command(
-            ["shell", "su", "-c", f"echo {profile} > /sys/class/thermal/thermal_message/sconfig"],
-            root=True
-        ))
-        self.log(f"Applied thermal profile: {profile}")
+        self.run_sysfs_transaction(f"Applied thermal profile: {profile}",
+                                   [["/sys/class/thermal/thermal_message/sconfig", profile]],
+                                   requires="/sys/class/thermal/thermal_message/sconfig")
             
     def show_about(self):
         """Show about dialog"""
@@ -0,0 +1,44 @@
+"""Headless ADB engine behind ADB Manager Pro; no GUI imports.
+
+Importing the package is cheap: submodules load on first attribute access.
+
+    from adbcore import AdbClient
+    client = AdbClient("adb")
+    for serial in client.get_connected_devices():
+        client.apply_tweaks(client.load_tweak_profiles()["Gaming"], serial)
+"""
+import importlib
+
+_SUBMODULES = ("aio", "apk", "cli", "client", "files", "installer", "logcat", "probe", "screen", "shell", "shortcuts",
+               "telemetry", "tuning")
+_EXPORTS = {
+    "AdbClient": "client",
+    "AsyncAdbClient": "aio",
+    "CommandCache": "shell",
+    "RootShell": "shell",
+    "ShortcutStore": "shortcuts",
+    "InstallQueue": "installer",
+    "read_apk_metadata": "apk",
+    "LogRingBuffer": "logcat",
+    "LogcatCapture": "logcat",
+    "parse_logcat_entries": "logcat",
+    "search_logcat_captures": "logcat",
+    "decode_screencap": "screen",
+    "encode_png": "screen",
+    "parse_getprop": "probe",
+    "TWEAK_PROFILES": "tuning",
+    "KERNEL_TWEAKS": "tuning"
+}
+__all__ = list(_EXPORTS) + list(_SUBMODULES)
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,225 @@
+"""asyncio ADB client: one thread drives any number of devices.
+
+Shell commands talk to the adb server's socket directly (no process per call);
+install, push and pull run adb through asyncio subprocesses. Concurrency is
+bounded per device and per host (the machine a network device lives on, or
+"usb" for everything attached to this one).
+
+    async def main():
+        client = AsyncAdbClient()
+        serials = await client.devices()
+        samples = await client.gather(client.sample_telemetry, serials)
+"""
+import asyncio
+import os
+import struct
+
+from .telemetry import build_telemetry_script, parse_telemetry
+
+ADB_SERVER = ("127.0.0.1", 5037)
+
+# In-flight operations allowed per device and per host
+DEVICE_CONCURRENCY = 4
+HOST_CONCURRENCY = 64
+
+# shell v2 packet ids (stdin, stdout, stderr, exit, close stdin)
+SHELL_STDIN, SHELL_STDOUT, SHELL_STDERR, SHELL_EXIT, SHELL_CLOSE_STDIN = range(5)
+SHELL_PACKET_HEADER = struct.Struct("<BI")
+
+class AdbProtocolError(RuntimeError):
+    """The adb server answered FAIL (or hung up) instead of OKAY"""
+
+def host_of(serial):
+    """Concurrency group of a device: the IP of a network device, "usb" otherwise"""
+    host, sep, port = serial.rpartition(":")
+    return host if sep and port.isdigit() else "usb"
+
+class AsyncAdbClient:
+    """Async counterpart of AdbClient for shell, install, push/pull and telemetry"""
+    def __init__(self, adb_path=None, server=ADB_SERVER, device_limit=DEVICE_CONCURRENCY,
+                 host_limit=HOST_CONCURRENCY, log=None):
+        self.adb_path = adb_path or os.environ.get("ADB_PATH") or "adb"
+        self.server = server
+        self.device_limit = device_limit
+        self.host_limit = host_limit
+        self.log_callback = log
+        self.device_semaphores = {}
+        self.host_semaphores = {}
+        # Transport features per serial ("shell_v2", "cmd", ...)
+        self.features = {}
+        self.server_started = False
+
+    def log(self, message):
+        if self.log_callback:
+            self.log_callback(message)
+
+    def limit(self, serial):
+        """Semaphores (device, host) an operation on serial has to hold.
+        
+        Take them in that order: a task waiting for its own busy device must not sit on
+        a host slot that another device could use.
+        """
+        if serial not in self.device_semaphores:
+            self.device_semaphores[serial] = asyncio.Semaphore(self.device_limit)
+        host = host_of(serial)
+        if host not in self.host_semaphores:
+            self.host_semaphores[host] = asyncio.Semaphore(self.host_limit)
+        return self.device_semaphores[serial], self.host_semaphores[host]
+
+    # adb server protocol
+    async def connect(self):
+        """Open a socket to the adb server, starting it once if nothing is listening"""
+        try:
+            return await asyncio.open_connection(*self.server)
+        except ConnectionRefusedError:
+            if self.server_started:
+                raise
+            self.server_started = True
+            await self.run_adb(["start-server"])
+            return await asyncio.open_connection(*self.server)
+
+    async def request(self, reader, writer, service):
+        data = service.encode()
+        writer.write(b"%04x" % len(data) + data)
+        await writer.drain()
+        try:
+            status = await reader.readexactly(4)
+        except asyncio.IncompleteReadError:
+            raise AdbProtocolError(f"adb server closed the connection on {service!r}")
+        if status != b"OKAY":
+            raise AdbProtocolError((await self.read_block(reader)).decode("utf-8", "replace"))
+
+    async def read_block(self, reader):
+        """Length-prefixed reply (4 hex digits)"""
+        length = int(await reader.readexactly(4), 16)
+        return await reader.readexactly(length)
+
+    async def query(self, service):
+        """One host request with a length-prefixed answer"""
+        reader, writer = await self.connect()
+        try:
+            await self.request(reader, writer, service)
+            return (await self.read_block(reader)).decode("utf-8", "replace")
+        finally:
+            writer.close()
+
+    async def devices(self):
+        """Serials of all devices in the 'device' state"""
+        output = await self.query("host:devices")
+        return [parts[0] for parts in (line.split() for line in output.splitlines())
+                if len(parts) >= 2 and parts[1] == "device"]
+
+    async def resolve(self, serial):
+        """A concrete serial, so limits and features are tracked per device"""
+        if serial:
+            return serial
+        serials = await self.devices()
+        if len(serials) != 1:
+            raise AdbProtocolError("no device connected" if not serials else "more than one device; pass a serial")
+        return serials[0]
+
+    async def get_features(self, serial):
+        if serial not in self.features:
+            self.features[serial] = set((await self.query(f"host-serial:{serial}:features")).split(","))
+        return self.features[serial]
+
+    # Shell
+    async def run_shell(self, command, serial=None, input=None, timeout=30):
+        """Run a shell command; returns (stdout bytes, stderr bytes, exit status or None)"""
+        serial = await self.resolve(serial)
+        device_limit, host_limit = self.limit(serial)
+        async with device_limit, host_limit:
+            if "shell_v2" not in await self.get_features(serial):
+                # Pre-Nougat devices: plain adb shell, which merges stderr and drops the status
+                if input is None:
+                    return await asyncio.wait_for(self.run_legacy_shell(command, serial), timeout), b"", None
+                stdout, stderr, _ = await self.run_adb(["-s", serial, "shell", command], input=input, timeout=timeout)
+                return stdout, stderr, None
+            return await asyncio.wait_for(self.run_shell_v2(command, serial, input), timeout)
+
+    async def run_shell_v2(self, command, serial, input):
+        reader, writer = await self.connect()
+        try:
+            await self.request(reader, writer, f"host:transport:{serial}")
+            await self.request(reader, writer, f"shell,v2,raw:{command}")
+            if input is not None:
+                writer.write(SHELL_PACKET_HEADER.pack(SHELL_STDIN, len(input)) + input)
+            writer.write(SHELL_PACKET_HEADER.pack(SHELL_CLOSE_STDIN, 0))
+            await writer.drain()
+            
+            stdout, stderr = bytearray(), bytearray()
+            while True:
+                try:
+                    packet_id, length = SHELL_PACKET_HEADER.unpack(await reader.readexactly(SHELL_PACKET_HEADER.size))
+                    data = await reader.readexactly(length)
+                except asyncio.IncompleteReadError:
+                    return bytes(stdout), bytes(stderr), None
+                if packet_id == SHELL_STDOUT:
+                    stdout += data
+                elif packet_id == SHELL_STDERR:
+                    stderr += data
+                elif packet_id == SHELL_EXIT:
+                    return bytes(stdout), bytes(stderr), data[0] if data else None
+        finally:
+            writer.close()
+
+    async def run_legacy_shell(self, command, serial):
+        reader, writer = await self.connect()
+        try:
+            await self.request(reader, writer, f"host:transport:{serial}")
+            await self.request(reader, writer, f"shell:{command}")
+            return await reader.read()
+        finally:
+            writer.close()
+
+    async def shell(self, command, serial=None, timeout=30):
+        """Shell output as text (stdout, or stderr if there was none)"""
+        stdout, stderr, _ = await self.run_shell(command, serial, timeout=timeout)
+        return (stdout or stderr).decode("utf-8", "replace")
+
+    # adb subprocesses
+    async def run_adb(self, argv, input=None, timeout=300):
+        """Run adb with argv; returns (stdout, stderr, returncode) without blocking the loop"""
+        process = await asyncio.create_subprocess_exec(
+            self.adb_path, *argv, stdin=asyncio.subprocess.PIPE if input is not None else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(input), timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise
+        return stdout, stderr, process.returncode
+
+    async def run_device_adb(self, argv, serial=None, timeout=300):
+        """adb -s serial argv under the device and host limits; returns the combined output"""
+        serial = await self.resolve(serial)
+        device_limit, host_limit = self.limit(serial)
+        async with device_limit, host_limit:
+            self.log(f"Executing: adb -s {serial} {' '.join(argv)}")
+            stdout, stderr, _ = await self.run_adb(["-s", serial] + argv, timeout=timeout)
+        output = (stdout + stderr).decode("utf-8", "replace")
+        self.log(f"Result:\n{output}")
+        return output
+
+    async def install(self, apk_path, serial=None):
+        """Install an APK; returns True when the package manager reports Success"""
+        return "Success" in await self.run_device_adb(["install", apk_path], serial)
+
+    async def push(self, src, dest, serial=None):
+        return "error" not in (await self.run_device_adb(["push", src, dest], serial)).lower()
+
+    async def pull(self, src, dest, serial=None):
+        return "error" not in (await self.run_device_adb(["pull", src, dest], serial)).lower()
+
+    # Telemetry
+    async def sample_telemetry(self, serial=None, interval=1.0):
+        """CPU/RAM load and network throughput measured over interval seconds"""
+        stdout, _, _ = await self.run_shell(build_telemetry_script(interval), serial, timeout=interval + 30)
+        return parse_telemetry(stdout.decode("utf-8", "replace"), interval)
+
+    async def gather(self, operation, serials, *args, **kwargs):
+        """Run operation(*args, serial=s, **kwargs) on every serial; returns {serial: result or exception}"""
+        results = await asyncio.gather(*(operation(*args, serial=serial, **kwargs) for serial in serials),
+                                       return_exceptions=True)
+        return dict(zip(serials, results))
@@ -0,0 +1,129 @@
+"""Host-side APK and XAPK metadata: package, version, label and launcher icon, without aapt"""
+import json
+import os
+import re
+import struct
+import zipfile
+
+# Binary XML chunk types
+AXML_STRING_POOL = 0x0001
+AXML_RESOURCE_MAP = 0x0180
+AXML_START_ELEMENT = 0x0102
+
+# android: attribute resource ids, used when a shrunk manifest drops the attribute names
+ANDROID_ATTRIBUTE_IDS = {
+    0x01010001: "label",
+    0x01010002: "icon",
+    0x0101021B: "versionCode",
+    0x0101021C: "versionName"
+}
+
+# Res_value data types
+TYPE_STRING = 0x03
+TYPE_INT_DEC = 0x10
+TYPE_INT_HEX = 0x11
+
+# Launcher icon candidates, best density first
+ICON_PATTERN = re.compile(r"res/(mipmap|drawable)-(xxxhdpi|xxhdpi|xhdpi|hdpi|mdpi)(-v\d+)?/(ic_launcher|icon)\.png$")
+ICON_DENSITIES = ("xxxhdpi", "xxhdpi", "xhdpi", "hdpi", "mdpi")
+
+def package_type(path):
+    return "XAPK" if path.lower().endswith(".xapk") else "APK"
+
+def read_string_pool(data, offset):
+    """Strings of a binary XML string pool chunk starting at offset"""
+    header_size, = struct.unpack_from("<H", data, offset + 2)
+    count, _, flags, strings_start = struct.unpack_from("<IIII", data, offset + 8)
+    utf8 = flags & (1 << 8)
+    strings = []
+    for index in range(count):
+        pos = offset + strings_start + struct.unpack_from("<I", data, offset + header_size + 4 * index)[0]
+        if utf8:
+            # UTF-16 length then UTF-8 length, each one or two bytes
+            pos += 2 if data[pos] & 0x80 else 1
+            length = data[pos]
+            if length & 0x80:
+                length = ((length & 0x7F) << 8) | data[pos + 1]
+                pos += 1
+            pos += 1
+            strings.append(data[pos:pos + length].decode("utf-8", "replace"))
+        else:
+            length, = struct.unpack_from("<H", data, pos)
+            if length & 0x8000:
+                length = ((length & 0x7FFF) << 16) | struct.unpack_from("<H", data, pos + 2)[0]
+                pos += 2
+            pos += 2
+            strings.append(data[pos:pos + 2 * length].decode("utf-16-le", "replace"))
+    return strings
+
+def parse_binary_manifest(data):
+    """Attributes of the <manifest> and <application> elements: {element: {name: value}}"""
+    strings, resource_ids, elements = [], [], {}
+    offset = struct.unpack_from("<H", data, 2)[0]
+    while offset + 8 <= len(data) and len(elements) < 2:
+        chunk_type, header_size, size = struct.unpack_from("<HHI", data, offset)
+        if size < 8:
+            break
+        if chunk_type == AXML_STRING_POOL:
+            strings = read_string_pool(data, offset)
+        elif chunk_type == AXML_RESOURCE_MAP:
+            resource_ids = list(struct.unpack_from(f"<{(size - header_size) // 4}I", data, offset + header_size))
+        elif chunk_type == AXML_START_ELEMENT:
+            ext = offset + header_size
+            name_index, = struct.unpack_from("<I", data, ext + 4)
+            element = strings[name_index] if name_index < len(strings) else ""
+            if element in ("manifest", "application"):
+                attr_start, attr_size, attr_count = struct.unpack_from("<HHH", data, ext + 8)
+                attributes = elements.setdefault(element, {})
+                for index in range(attr_count):
+                    pos = ext + attr_start + index * attr_size
+                    _, name, raw, _, _, data_type, value = struct.unpack_from("<IIIHBBI", data, pos)
+                    key = strings[name] if name < len(strings) else ""
+                    if not key and name < len(resource_ids):
+                        key = ANDROID_ATTRIBUTE_IDS.get(resource_ids[name], "")
+                    if data_type == TYPE_STRING:
+                        attributes[key] = strings[value]
+                    elif data_type in (TYPE_INT_DEC, TYPE_INT_HEX):
+                        attributes[key] = value
+                    elif raw != 0xFFFFFFFF and raw < len(strings):
+                        attributes[key] = strings[raw]
+                    else:
+                        # Resource reference; resolving it needs resources.arsc
+                        attributes.setdefault(key, None)
+        offset += size
+    return elements
+
+def find_launcher_icon(names):
+    """Zip entry of the highest density launcher icon, or None"""
+    best = None
+    for name in names:
+        match = ICON_PATTERN.match(name)
+        if match and (best is None or ICON_DENSITIES.index(match.group(2)) < best[0]):
+            best = (ICON_DENSITIES.index(match.group(2)), name)
+    return best[1] if best else None
+
+def read_apk_metadata(path):
+    """Package, version, label and icon PNG of an APK or XAPK; fields that cannot be read are None"""
+    metadata = {"type": package_type(path), "package": None, "version_code": None,
+                "version_name": None, "label": None, "icon": None}
+    with zipfile.ZipFile(path, "r") as z:
+        names = z.namelist()
+        if metadata["type"] == "XAPK":
+            manifest = json.loads(z.read("manifest.json"))
+            metadata.update(package=manifest.get("package_name"), version_name=manifest.get("version_name"),
+                            label=manifest.get("name"))
+            if str(manifest.get("version_code", "")).isdigit():
+                metadata["version_code"] = int(manifest["version_code"])
+            icon = manifest.get("icon") if manifest.get("icon") in names else find_launcher_icon(names)
+        else:
+            elements = parse_binary_manifest(z.read("AndroidManifest.xml"))
+            manifest = elements.get("manifest", {})
+            metadata.update(package=manifest.get("package"), version_code=manifest.get("versionCode"),
+                            version_name=manifest.get("versionName"),
+                            label=elements.get("application", {}).get("label"))
+            icon = find_launcher_icon(names)
+        if icon:
+            metadata["icon"] = z.read(icon)
+    if not metadata["label"]:
+        metadata["label"] = os.path.splitext(os.path.basename(path))[0]
+    return metadata
@@ -0,0 +1,196 @@
+"""Command-line batch mode: core operations with newline-delimited JSON results on stdout.
+
+    python -m adbcore devices
+    python -m adbcore install app.apk --all
+    python -m adbcore telemetry -s emulator-5554 --samples 10
+    python -m adbcore batch ops.txt --all
+
+A batch file holds one operation per line in the same syntax (blank lines and
+# comments are skipped). Every line runs in the same process against the same
+AdbClient, so command cache, device properties and capability probes are reused.
+Lines without their own -s/--all use the targets given to the batch command.
+"""
+import argparse
+import concurrent.futures
+import json
+import shlex
+import sys
+import threading
+import time
+from datetime import datetime
+
+from .client import AdbClient, DEFAULT_DATA_DIR
+
+# Devices driven at once when an operation fans out
+DEFAULT_JOBS = 8
+
+def build_parser():
+    targets = argparse.ArgumentParser(add_help=False)
+    targets.add_argument("-s", "--serial", action="append", default=[], help="target device (repeatable)")
+    targets.add_argument("--all", action="store_true", help="fan out to every connected device")
+    targets.add_argument("-j", "--jobs", type=int, default=DEFAULT_JOBS, help="devices driven in parallel")
+    
+    parser = argparse.ArgumentParser(prog="adbcore", description="ADB Manager Pro batch mode (NDJSON output)")
+    parser.add_argument("--adb", help="adb binary (default: $ADB_PATH or adb on PATH)")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR, help="cache and profile directory")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log adb commands to stderr")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    commands.add_parser("devices", help="list connected devices")
+    commands.add_parser("apps", parents=[targets], help="list third-party apps")
+    sub = commands.add_parser("install", parents=[targets], help="install an APK")
+    sub.add_argument("apk")
+    sub = commands.add_parser("install-xapk", parents=[targets], help="install an XAPK bundle")
+    sub.add_argument("xapk")
+    sub = commands.add_parser("push", parents=[targets], help="push a file or folder")
+    sub.add_argument("src")
+    sub.add_argument("dest")
+    sub.add_argument("--sync", action="store_true", help="only push new or changed files")
+    sub.add_argument("--checksum", action="store_true", help="compare MD5 instead of mtime (with --sync)")
+    sub.add_argument("--delete", action="store_true", help="delete remote files missing locally (with --sync)")
+    sub = commands.add_parser("pull", parents=[targets], help="pull a file or folder")
+    sub.add_argument("src")
+    sub.add_argument("dest")
+    sub = commands.add_parser("profile", parents=[targets], help="apply a tweak profile")
+    sub.add_argument("name")
+    sub = commands.add_parser("telemetry", parents=[targets], help="sample CPU, RAM and network load")
+    sub.add_argument("--samples", type=int, default=1)
+    sub.add_argument("--interval", type=float, default=1.0, help="seconds per sample")
+    sub = commands.add_parser("batch", parents=[targets], help="run operations from a file (- for stdin)")
+    sub.add_argument("file")
+    return parser
+
+class BatchRunner:
+    """Runs parsed operations against one AdbClient and writes one JSON object per result"""
+    def __init__(self, client, out=sys.stdout):
+        self.client = client
+        self.out = out
+        self.out_lock = threading.Lock()
+        self.failures = 0
+
+    def emit(self, record):
+        if record.get("ok") is False:
+            self.failures += 1
+        with self.out_lock:
+            self.out.write(json.dumps(record, default=str) + "\n")
+            self.out.flush()
+
+    def resolve_targets(self, args):
+        if args.serial:
+            return args.serial
+        if args.all:
+            return self.client.get_connected_devices()
+        # Let adb pick the only connected device
+        return [None]
+
+    def run(self, args, extra=None):
+        """Run one operation, fanning out over its target devices"""
+        extra = extra or {}
+        if args.command == "devices":
+            return self.run_step(args, None, extra)
+        
+        serials = self.resolve_targets(args)
+        if not serials:
+            self.emit(dict(extra, op=args.command, serial=None, ok=False, error="no devices connected"))
+            return
+        if len(serials) == 1:
+            return self.run_step(args, serials[0], extra)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(args.jobs, len(serials)))) as pool:
+            for future in [pool.submit(self.run_step, args, serial, extra) for serial in serials]:
+                future.result()
+
+    def run_step(self, args, serial, extra):
+        started = time.monotonic()
+        try:
+            for result in getattr(self, "op_" + args.command.replace("-", "_"))(args, serial):
+                ok = result.pop("ok", True)
+                record = dict(extra, op=args.command, serial=result.pop("serial", serial), ok=ok)
+                record.update(result)
+                record["elapsed"] = round(time.monotonic() - started, 3)
+                self.emit(record)
+        except Exception as e:
+            self.emit(dict(extra, op=args.command, serial=serial, ok=False, error=str(e),
+                           elapsed=round(time.monotonic() - started, 3)))
+
+    # Operations: each yields result dicts ("ok" defaults to True)
+    def op_devices(self, args, serial):
+        for device in self.client.get_connected_devices():
+            props = self.client.get_device_properties(device)
+            yield {"serial": device, "model": props.get("ro.product.model", ""),
+                   "android": props.get("ro.build.version.release", ""), "sdk": props.get("ro.build.version.sdk", "")}
+
+    def op_apps(self, args, serial):
+        disabled = self.client.get_disabled_packages(serial)
+        yield {"apps": [{"package": package, "enabled": package not in disabled}
+                        for package in self.client.list_packages(serial)]}
+
+    def op_install(self, args, serial):
+        output, mode = self.client.install_files([args.apk], serial)
+        yield {"ok": "Success" in output, "mode": mode, "output": output.strip()}
+
+    def op_install_xapk(self, args, serial):
+        output = self.client.install_xapk(args.xapk, serial)
+        yield {"ok": "Success" in output, "output": output.strip()}
+
+    def op_push(self, args, serial):
+        if args.sync:
+            summary = self.client.sync_push(args.src, args.dest, checksum=args.checksum,
+                                            delete_extra=args.delete, serial=serial)
+            yield {"ok": bool(summary) and not summary.get("failed"), "summary": summary}
+        else:
+            yield {"ok": self.client.push(args.src, args.dest, serial)}
+
+    def op_pull(self, args, serial):
+        yield {"ok": self.client.pull(args.src, args.dest, serial)}
+
+    def op_profile(self, args, serial):
+        profile = self.client.load_tweak_profiles().get(args.name)
+        if not profile:
+            raise ValueError(f"unknown tweak profile: {args.name}")
+        steps = [{"step": label, "ok": ok} for label, ok in self.client.apply_tweaks(profile, serial)]
+        yield {"ok": all(step["ok"] for step in steps), "steps": steps}
+
+    def op_telemetry(self, args, serial):
+        for index in range(max(1, args.samples)):
+            sample = self.client.sample_telemetry(serial, args.interval)
+            yield dict(sample, sample=index, time=datetime.now().isoformat(timespec="seconds"))
+
+def read_batch(path):
+    """(line number, argv) for every operation in a batch file"""
+    with (sys.stdin if path == "-" else open(path, "r")) as f:
+        for number, line in enumerate(f, start=1):
+            argv = shlex.split(line, comments=True)
+            if argv:
+                yield number, argv
+
+def run_batch(runner, parser, args):
+    for number, argv in read_batch(args.file):
+        try:
+            op = parser.parse_args(argv)
+        except SystemExit:
+            runner.emit({"line": number, "op": argv[0], "ok": False, "error": "invalid operation: " + shlex.join(argv)})
+            continue
+        if op.command == "batch":
+            runner.emit({"line": number, "op": "batch", "ok": False, "error": "batch files cannot be nested"})
+            continue
+        # Inherit the batch targets unless the line names its own
+        if op.command != "devices" and not op.serial and not op.all:
+            op.serial, op.all, op.jobs = args.serial, args.all, args.jobs
+        runner.run(op, {"line": number})
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    log = None
+    if args.verbose:
+        log = lambda message: print(f"[{datetime.now().strftime('%H:%M:%S')}] {message}", file=sys.stderr, flush=True)
+    client = AdbClient(args.adb, args.data_dir, log=log)
+    runner = BatchRunner(client)
+    try:
+        if args.command == "batch":
+            run_batch(runner, parser, args)
+        else:
+            runner.run(args)
+    finally:
+        client.close()
+    return 1 if runner.failures else 0
@@ -0,0 +1,1065 @@
+"""Headless ADB client: everything the GUIs do to a device, without any GUI imports"""
+import fnmatch
+import hashlib
+import json
+import mmap
+import os
+import posixpath
+import re
+import shlex
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import zipfile
+
+from .files import (LARGE_FILE_THRESHOLD, TRANSFER_CHUNK_SIZE, INSTALL_CHUNK_SIZE, REMOTE_LISTING_TTL, INSTALL_MIN_RATE,
+                    HASH_MIN_RATE, scaled_timeout, hash_local_file)
+from .installer import (INCREMENTAL_MIN_SDK, INCREMENTAL_MIN_ADB, parse_adb_version, is_package_failure,
+                        is_transient_failure, is_mode_unsupported, choose_install_modes)
+from .probe import parse_getprop, build_capability_probe_script, parse_capability_probe
+from .shell import CommandCache, RootShell, read_only_ttl, is_mutating_command
+from .telemetry import build_telemetry_script, parse_telemetry
+from .tuning import (TWEAK_PROFILES, SETTINGS_SNAPSHOT_TTL, CPUFREQ_DIR, CPUFREQ_NODES, compile_tweak_script,
+                     parse_tweak_results, parse_settings_lists, diff_settings, build_sysfs_read_script,
+                     build_sysfs_write_script, parse_sysfs_values, sysfs_value_matches, parse_cpu_policies)
+
+DEFAULT_DATA_DIR = os.path.join(os.path.expanduser("~"), ".adb_manager_pro")
+
+class AdbClient:
+    """Drives one adb binary and any number of devices; every device method takes an optional serial.
+    
+    Messages go to the log callback (the GUIs pass their log pane), so the client
+    can run headless on CI runners.
+    """
+    def __init__(self, adb_path=None, data_dir=DEFAULT_DATA_DIR, log=None):
+        self.adb_path = adb_path or os.environ.get("ADB_PATH") or "adb"
+        self.data_dir = data_dir
+        self.log_callback = log
+        
+        # Read-only command output, persistent su sessions and per-device caches
+        self.command_cache = CommandCache()
+        self.root_shells = {}
+        self.root_shells_lock = threading.Lock()
+        self.device_properties = {}
+        self.device_properties_lock = threading.Lock()
+        self.capabilities = {}
+        self.capabilities_lock = threading.Lock()
+        self.settings_snapshots = {}
+        self.sysfs_snapshots = {}
+        
+        # Install modes: host adb version, measured speed per device and mode, and modes a device
+        # rejected: device -> {"connection": (transport id, boot id), "modes": set}
+        self.host_adb_version = None
+        self.install_timings = None
+        self.install_timings_lock = threading.Lock()
+        self.unsupported_install_modes = {}
+        
+        # Remote directory listings for the file browser: path -> (timestamp, entries)
+        self.remote_dir_cache = {}
+        self.remote_cache_lock = threading.Lock()
+    
+    def log(self, message):
+        if self.log_callback:
+            self.log_callback(message)
+    
+    def close(self):
+        """Close the persistent root sessions"""
+        for shell in self.root_shells.values():
+            shell.close()
+
+    # Commands
+    def get_app_data_path(self, *parts):
+        """Return a path inside the app data directory, creating parent folders"""
+        path = os.path.join(self.data_dir, *parts)
+        os.makedirs(os.path.dirname(path) if parts else path, exist_ok=True)
+        return path
+
+    def run_adb_command(self, command, wait=True, root=False, serial=None):
+        """Execute ADB command and return output"""
+        try:
+            argv = list(command) if isinstance(command, list) else command.split()
+            
+            # Idempotent reads are served from the cache; anything mutating drops the device's entries
+            device = serial or "default"
+            ttl = read_only_ttl(argv)
+            cache_key = (device, tuple(argv), root)
+            if ttl:
+                cached = self.command_cache.get(cache_key)
+                if cached is not None:
+                    return cached
+            elif is_mutating_command(argv):
+                self.command_cache.invalidate(device)
+            
+            self.log(f"Executing: adb {command} {'(as root)' if root else ''}")
+            
+            # Handle paths without extra quotes
+            cmd_list = [self.adb_path] + argv
+                
+            # Root commands go through the device's persistent su session
+            if root:
+                args = cmd_list[1:]
+                if args[:1] == ["shell"]:
+                    args = args[1:]
+                if args[:2] == ["su", "-c"]:
+                    args = args[2:]
+                output, status = self.get_root_shell(serial).run(" ".join(args))
+                self.log(f"Result:\n{output}")
+                if ttl and status == 0:
+                    self.command_cache.put(cache_key, output, ttl)
+                return output
+            
+            # Target a specific device when a serial is given
+            if serial:
+                cmd_list = [self.adb_path, "-s", serial] + cmd_list[1:]
+                
+            result = subprocess.run(cmd_list, 
+                                   capture_output=True, 
+                                   text=True,
+                                   timeout=30)
+            output = result.stdout or result.stderr
+            self.log(f"Result:\n{output}")
+            if ttl and result.returncode == 0:
+                self.command_cache.put(cache_key, output, ttl)
+            return output
+        except FileNotFoundError:
+            error = f"ADB not found at {self.adb_path}. Please check the path."
+            self.log(error)
+            return error
+        except Exception as e:
+            error = f"Error: {str(e)}"
+            self.log(error)
+            return error
+
+    def run_adb_raw(self, command, serial=None, input=None, timeout=300):
+        """Execute ADB command with binary stdin/stdout (used by exec-out/exec-in)"""
+        cmd_list = [self.adb_path] + (["-s", serial] if serial else []) + command
+        return subprocess.run(cmd_list, input=input, capture_output=True, timeout=timeout)
+
+    def open_adb_stream(self, command, serial=None):
+        """Start a long-running ADB process whose stdout is an unbuffered binary pipe"""
+        cmd_list = [self.adb_path] + (["-s", serial] if serial else []) + command
+        return subprocess.Popen(cmd_list, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, bufsize=0)
+
+    def open_adb_input(self, command, serial=None):
+        """Start an ADB process fed through a binary stdin pipe (exec-in); stderr is merged into stdout"""
+        cmd_list = [self.adb_path] + (["-s", serial] if serial else []) + command
+        return subprocess.Popen(cmd_list, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+
+    def get_connected_devices(self):
+        """Serials of all devices in the 'device' state"""
+        output = self.run_adb_command("devices")
+        serials = []
+        for line in output.splitlines()[1:]:
+            parts = line.split()
+            if len(parts) >= 2 and parts[1] == "device":
+                serials.append(parts[0])
+        return serials
+
+    def get_device_serial(self):
+        """Get serial of the connected device (used to key per-device caches)"""
+        output = self.run_adb_command(["get-serialno"]).strip()
+        if not output or "error" in output.lower() or "unknown" in output.lower():
+            return "default"
+        return output.splitlines()[0].strip()
+
+    def get_root_shell(self, serial=None):
+        """Persistent su session for a device, opened on first use"""
+        key = serial or "default"
+        with self.root_shells_lock:
+            if key not in self.root_shells:
+                self.root_shells[key] = RootShell(serial, self.adb_path)
+            return self.root_shells[key]
+
+    def run_root_script(self, script, serial=None):
+        """Run a shell script as root through the device's persistent su session"""
+        output, _ = self.get_root_shell(serial).run(script)
+        return output
+
+    # Device properties and capabilities
+    def get_device_properties(self, serial=None, refresh=False):
+        """All system properties of a device from one `getprop` call, cached until the device reboots"""
+        device = serial or self.get_device_serial()
+        with self.device_properties_lock:
+            entry = self.device_properties.get(device)
+            if entry and not refresh:
+                return entry["props"]
+            
+            # Raw call: the dump is parsed, not logged
+            result = self.run_adb_raw(["shell", "cat /proc/sys/kernel/random/boot_id; getprop"], serial=serial, timeout=30)
+            output = result.stdout.decode("utf-8", "replace").replace("\r\n", "\n")
+            boot_id, _, dump = output.partition("\n")
+            props = parse_getprop(dump)
+            # Mid-boot dumps are incomplete, so only a fully booted device is cached
+            if props.get("sys.boot_completed") == "1":
+                self.device_properties[device] = {"boot_id": boot_id.strip(), "props": props}
+            return props
+
+    def get_device_property(self, name, default="", serial=None):
+        return self.get_device_properties(serial).get(name, default)
+
+    def check_device_boot(self, serial=None):
+        """Drop cached properties if the device rebooted since they were read"""
+        device = serial or self.get_device_serial()
+        entry = self.device_properties.get(device)
+        if not entry:
+            return
+        boot_id = self.run_adb_command(["shell", "cat /proc/sys/kernel/random/boot_id"], serial=serial).strip()
+        if boot_id != entry["boot_id"]:
+            with self.device_properties_lock:
+                self.device_properties.pop(device, None)
+            self.log("Device rebooted; cached properties cleared")
+
+    def get_capabilities(self, serial=None, refresh=False):
+        """What the device supports, probed once per device and build in a single shell call.
+        
+        Results are persisted per serial and reused until the build fingerprint changes,
+        so later operations can skip features the device lacks instead of failing.
+        """
+        device = serial or self.get_device_serial()
+        with self.capabilities_lock:
+            if not refresh and device in self.capabilities:
+                return self.capabilities[device]
+            
+            path = self.get_app_data_path("capabilities", re.sub(r"[^A-Za-z0-9._-]", "_", device) + ".json")
+            if not refresh and os.path.exists(path):
+                try:
+                    with open(path, "r") as f:
+                        cached = json.load(f)
+                    fingerprint = self.get_device_property("ro.build.fingerprint", serial=serial)
+                    if cached.get("fingerprint") and cached["fingerprint"] == fingerprint:
+                        self.capabilities[device] = cached
+                        return cached
+                except (OSError, ValueError):
+                    pass
+            
+            caps = parse_capability_probe(self.run_adb_command(["shell", build_capability_probe_script()], serial=serial))
+            if not caps.get("fingerprint"):
+                # Probe failed (device gone?); don't cache an empty result
+                return caps
+            caps["probed"] = time.time()
+            self.capabilities[device] = caps
+            with open(path, "w") as f:
+                json.dump(caps, f, indent=2)
+            self.log(f"Device capabilities: SDK {caps.get('sdk')}, {caps.get('abi')}, "
+                     f"root {'yes' if caps.get('root') else 'no'}")
+            return caps
+
+    # Apps
+    def list_packages(self, serial=None):
+        """Third-party packages; older package managers reject -u -i, which the capability probe records"""
+        if self.get_capabilities(serial).get("pm_list_ui", True):
+            output = self.run_adb_command("shell pm list packages -s -3 -u -i", serial=serial)
+        else:
+            output = self.run_adb_command("shell pm list packages -3", serial=serial)
+        if not output or "Error" in output:
+            raise RuntimeError(output.strip() or "no output from pm")
+        return [line.split(':')[1].strip() for line in output.splitlines() if line.startswith('package:')]
+
+    def get_disabled_packages(self, serial=None):
+        output = self.run_adb_command("shell pm list packages -d", serial=serial)
+        return {line.split(':')[1].strip() for line in output.splitlines() if line.startswith('package:')}
+
+    def get_app_label(self, package, serial=None):
+        """Application label from dumpsys, or the package name if none is found"""
+        output = self.run_adb_command(f"shell dumpsys package {package}", serial=serial)
+        patterns = [
+            r'application: label=([\'"])(.*?)\1',
+            r'package:.*?labelRes=.*?label=([\'"])(.*?)\1',
+            r'Package \[.*?\] \(.*?\):.*?name=.*? label=([\'"])(.*?)\1'
+        ]
+        for pattern in patterns:
+            match = re.search(pattern, output or "")
+            if match:
+                return match.group(2)
+        return package
+
+    def install_apk(self, apk_path, serial=None):
+        """Install an APK with the fastest supported mode; returns the package manager's output"""
+        return self.install_files([apk_path], serial)[0]
+
+    def extract_xapk(self, xapk_path, temp_dir):
+        """Extract an XAPK into temp_dir; returns its APK splits, largest (the base APK) first"""
+        self.log(f"Processing XAPK: {xapk_path}")
+        with zipfile.ZipFile(xapk_path, 'r') as zip_ref:
+            zip_ref.extractall(temp_dir)
+            self.log(f"Extracted XAPK to: {temp_dir}")
+        
+        apk_files = []
+        for root, dirs, files in os.walk(temp_dir):
+            for file in files:
+                if file.lower().endswith(".apk"):
+                    apk_files.append(os.path.join(root, file))
+        if not apk_files:
+            raise RuntimeError("No APK files found in XAPK package")
+        
+        # Sort by size to install main APK first
+        apk_files.sort(key=lambda x: os.path.getsize(x), reverse=True)
+        self.log(f"Found APK files: {', '.join(apk_files)}")
+        return apk_files
+
+    def install_xapk(self, xapk_path, serial=None):
+        """Extract an XAPK and install its splits with install-multiple; returns adb's output"""
+        temp_dir = tempfile.mkdtemp(prefix="xapk_")
+        try:
+            apk_files = self.extract_xapk(xapk_path, temp_dir)
+            return self.install_files(apk_files, serial)[0]
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            self.log("Cleaned up temporary files")
+
+    def get_host_adb_version(self):
+        if self.host_adb_version is None:
+            self.host_adb_version = parse_adb_version(self.run_adb_raw(["version"]).stdout.decode("utf-8", "replace"))
+        return self.host_adb_version
+
+    def get_connection_id(self, serial=None):
+        """(transport id, boot id) of a device; the first changes on reconnect, the second on reboot"""
+        transport = ""
+        for line in self.run_adb_raw(["devices", "-l"]).stdout.decode("utf-8", "replace").splitlines()[1:]:
+            parts = line.split()
+            if len(parts) >= 2 and parts[1] == "device" and serial in (None, parts[0]):
+                transport = next((part for part in parts if part.startswith("transport_id:")), "")
+                break
+        boot_id = self.run_adb_raw(["shell", "cat /proc/sys/kernel/random/boot_id"], serial=serial, timeout=30)
+        return transport, boot_id.stdout.decode("utf-8", "replace").strip()
+
+    def get_install_modes(self, apk_files, serial=None):
+        """Modes this host, device and set of files support, in the order to try them"""
+        device = serial or self.get_device_serial()
+        caps = self.get_capabilities(serial)
+        sdk = caps.get("sdk", 0)
+        supported = []
+        # Incremental needs incfs on the device and a v4 signature (.idsig) beside every APK
+        if (sdk >= INCREMENTAL_MIN_SDK and self.get_host_adb_version() >= INCREMENTAL_MIN_ADB
+                and self.get_device_property("ro.incremental.enable", serial=serial) not in ("", "false", "0")
+                and all(os.path.exists(path + ".idsig") for path in apk_files)):
+            supported.append("incremental")
+        if sdk >= 24 and caps.get("commands", {}).get("cmd", False):
+            supported.append("streamed")
+        supported.append("adb")
+        
+        # Modes a device rejected are skipped until it reconnects or reboots
+        rejected = self.unsupported_install_modes.get(device)
+        if rejected and self.get_connection_id(serial) != rejected["connection"]:
+            self.unsupported_install_modes.pop(device, None)
+            self.log(f"{device} reconnected; retrying {', '.join(sorted(rejected['modes']))} installs")
+        elif rejected:
+            supported = [mode for mode in supported if mode not in rejected["modes"]]
+        return choose_install_modes(supported, self.load_install_timings().get(device, {}))
+
+    def install_files(self, apk_files, serial=None, progress=None, cancelled=None):
+        """Install one app's APK files, trying modes until one works; returns (output, mode).
+        
+        A mode the device or host adb rejects is skipped on that device until it reconnects
+        or reboots; other mode failures fall back to the next mode for this install only,
+        and a lost device ends the install. Plain adb install is always available.
+        progress(bytes_sent, mode) is called when a mode starts and, for streamed installs,
+        after every chunk.
+        """
+        device = serial or self.get_device_serial()
+        size = sum(os.path.getsize(path) for path in apk_files)
+        output, mode = "", None
+        for mode in self.get_install_modes(apk_files, serial):
+            if progress:
+                progress(0, mode)
+            started = time.monotonic()
+            try:
+                if mode == "streamed":
+                    output = self.stream_install(apk_files, serial,
+                                                 progress and (lambda sent: progress(sent, "streamed")), cancelled)
+                else:
+                    command = ["install-multiple"] if len(apk_files) > 1 else ["install"]
+                    if mode == "incremental":
+                        command.append("--incremental")
+                    # Raw call: run_adb_command's 30 second limit would cut off any large package
+                    self.log(f"Executing: adb {' '.join(command + apk_files)}")
+                    result = self.run_adb_raw(command + apk_files, serial=serial,
+                                              timeout=scaled_timeout(size, INSTALL_MIN_RATE))
+                    output = (result.stdout + result.stderr).decode("utf-8", "replace")
+                    self.log(f"Result:\n{output}")
+            except subprocess.TimeoutExpired as e:
+                # Our own limit, not a lost device, so the next mode still gets its turn
+                output = f"Error: {mode} install did not finish within {e.timeout:.0f}s"
+            finally:
+                # Whatever happened, cached package lists and dumpsys output may be stale now
+                self.command_cache.invalidate(serial or "default")
+            
+            output = output or ""
+            if "Success" in output:
+                self.record_install_timing(device, mode, size, time.monotonic() - started)
+                return output, mode
+            if (output == "Cancelled" or (cancelled and cancelled()) or is_package_failure(output)
+                    or is_transient_failure(output)):
+                return output, mode
+            if mode != "adb" and is_mode_unsupported(mode, output):
+                rejected = self.unsupported_install_modes.setdefault(
+                    device, {"connection": self.get_connection_id(serial), "modes": set()})
+                rejected["modes"].add(mode)
+                self.log(f"{mode} install not supported on {device}, falling back: {output.strip()}")
+            else:
+                self.log(f"{mode} install failed on {device}, trying the next mode: {output.strip()}")
+        return output or f"Error: no install mode succeeded on {device}", mode
+
+    def load_install_timings(self):
+        """Measured install speed: {device: {mode: {"runs", "bytes", "seconds"}}}"""
+        with self.install_timings_lock:
+            if self.install_timings is None:
+                try:
+                    with open(self.get_app_data_path("install_timings.json"), "r") as f:
+                        self.install_timings = json.load(f)
+                except (OSError, ValueError):
+                    self.install_timings = {}
+            return self.install_timings
+
+    def record_install_timing(self, device, mode, size, seconds):
+        timings = self.load_install_timings()
+        with self.install_timings_lock:
+            entry = timings.setdefault(device, {}).setdefault(mode, {"runs": 0, "bytes": 0, "seconds": 0.0})
+            entry["runs"] += 1
+            entry["bytes"] += size
+            entry["seconds"] = round(entry["seconds"] + seconds, 3)
+            path = self.get_app_data_path("install_timings.json")
+            with open(path + ".tmp", "w") as f:
+                json.dump(timings, f, indent=2)
+            os.replace(path + ".tmp", path)
+        self.log(f"Installed {size / 1048576:.1f} MB on {device} via {mode} in {seconds:.1f}s")
+
+    def stream_install(self, apk_files, serial=None, progress=None, cancelled=None):
+        """Install one app's APK files through a package session, streaming each file over exec-in.
+        
+        progress(bytes_sent) is called after every chunk; when cancelled() turns true the
+        session is abandoned and "Cancelled" returned. Returns the package manager's output.
+        """
+        total = sum(os.path.getsize(path) for path in apk_files)
+        output = self.run_adb_raw(["shell", "cmd", "package", "install-create", "-S", str(total)],
+                                  serial).stdout.decode("utf-8", "replace")
+        match = re.search(r"\[(\d+)\]", output)
+        if not match:
+            return output
+        session = match.group(1)
+        
+        sent = 0
+        committed = False
+        try:
+            for index, path in enumerate(apk_files):
+                size = os.path.getsize(path)
+                process = self.open_adb_input(["exec-in", "cmd", "package", "install-write", "-S", str(size),
+                                               session, f"{index}_{os.path.basename(path)}", "-"], serial)
+                try:
+                    with open(path, "rb") as f:
+                        while True:
+                            chunk = f.read(INSTALL_CHUNK_SIZE)
+                            if not chunk:
+                                break
+                            if cancelled and cancelled():
+                                return "Cancelled"
+                            process.stdin.write(chunk)
+                            sent += len(chunk)
+                            if progress:
+                                progress(sent)
+                    process.stdin.close()
+                except OSError:
+                    # adb exited early; its output says why
+                    pass
+                finally:
+                    if cancelled and cancelled():
+                        process.kill()
+                    output = process.stdout.read().decode("utf-8", "replace")
+                    process.wait()
+                if "Success" not in output:
+                    return output or f"install-write of {os.path.basename(path)} failed"
+            
+            output = self.run_adb_raw(["shell", "cmd", "package", "install-commit", session], serial,
+                                      timeout=scaled_timeout(total, INSTALL_MIN_RATE)).stdout.decode("utf-8", "replace")
+            committed = "Success" in output
+            return output
+        finally:
+            if not committed:
+                self.run_adb_raw(["shell", "cmd", "package", "install-abandon", session], serial)
+
+    def uninstall_package(self, package, serial=None):
+        return self.run_adb_command(["uninstall", "--user", "0", package], serial=serial)
+
+    def disable_package(self, package, serial=None):
+        return self.run_adb_command(["shell", "pm", "disable-user", "--user", "0", package], serial=serial)
+
+    def enable_package(self, package, serial=None):
+        return self.run_adb_command(["shell", "pm", "enable", package], serial=serial)
+
+    def clear_package_data(self, package, serial=None):
+        return self.run_adb_command(["shell", "pm", "clear", package], serial=serial)
+
+    # Files
+    def build_local_manifest(self, src, remote_name=None):
+        """Stat local files; returns {relative posix path: {path, size, mtime}}"""
+        manifest = {}
+        if os.path.isdir(src):
+            for root, dirs, files in os.walk(src):
+                for file in files:
+                    path = os.path.join(root, file)
+                    rel = os.path.relpath(path, src).replace(os.sep, "/")
+                    st = os.stat(path)
+                    manifest[rel] = {"path": path, "size": st.st_size, "mtime": int(st.st_mtime)}
+        else:
+            st = os.stat(src)
+            rel = remote_name or os.path.basename(src)
+            manifest[rel] = {"path": src, "size": st.st_size, "mtime": int(st.st_mtime)}
+        return manifest
+
+    def fetch_remote_manifest(self, remote_root, names=None, checksum=False, serial=None):
+        """Fetch size, mtime and optional MD5 of remote files in one shell call"""
+        if names is None:
+            files = "find . -type f -exec {tool} {{}} +"
+        else:
+            files = "{tool} " + " ".join(shlex.quote("./" + n) for n in names) + " 2>/dev/null"
+        script = f"cd {shlex.quote(remote_root)} 2>/dev/null || exit 0; " + files.format(tool="stat -c '%s %Y %n'")
+        if checksum:
+            script += "; echo __MD5__; " + files.format(tool="md5sum")
+        output = self.run_adb_command(["shell", script], serial=serial)
+        
+        manifest = {}
+        in_md5 = False
+        for line in output.splitlines():
+            line = line.rstrip("\r")
+            if line == "__MD5__":
+                in_md5 = True
+                continue
+            if in_md5:
+                parts = line.split(None, 1)
+                if len(parts) == 2 and parts[1].startswith("./") and parts[1][2:] in manifest:
+                    manifest[parts[1][2:]]["md5"] = parts[0]
+                continue
+            parts = line.split(" ", 2)
+            if len(parts) == 3 and parts[0].isdigit() and parts[2].startswith("./"):
+                manifest[parts[2][2:]] = {"size": int(parts[0]), "mtime": int(parts[1])}
+        return manifest
+
+    def sync_push(self, src, dest, checksum=False, delete_extra=False, serial=None):
+        """Push only new or changed files to the device (rsync-style)"""
+        try:
+            if not os.path.exists(src):
+                self.log(f"Error: Source does not exist: {src}")
+                return None
+            
+            # Resolve the remote root the same way 'adb push' would: into dest when it is an existing directory
+            info = self.get_remote_file_info(dest, serial=serial)
+            into_dir = dest.endswith("/") or (info is not None and info["type"] == "directory")
+            names = None
+            if os.path.isdir(src):
+                remote_root = posixpath.join(dest, os.path.basename(os.path.normpath(src))) if info else dest.rstrip("/") or "/"
+                local = self.build_local_manifest(src)
+            else:
+                if into_dir:
+                    remote_root, remote_name = dest.rstrip("/") or "/", os.path.basename(src)
+                else:
+                    remote_root, remote_name = posixpath.split(dest)
+                local = self.build_local_manifest(src, remote_name)
+                names = [remote_name]
+                delete_extra = False
+            
+            remote = self.fetch_remote_manifest(remote_root, names, checksum, serial=serial)
+            
+            # Reuse cached local hashes for files whose size and mtime did not change
+            device = serial or self.get_device_serial()
+            cache_key = hashlib.sha1(f"{device}|{os.path.abspath(src)}|{remote_root}".encode()).hexdigest()
+            cache_path = self.get_app_data_path("sync_manifests", cache_key + ".json")
+            cached = {}
+            if os.path.exists(cache_path):
+                try:
+                    with open(cache_path, "r") as f:
+                        cached = json.load(f)
+                except Exception:
+                    cached = {}
+            
+            changed = []
+            for rel, info in local.items():
+                old = cached.get(rel)
+                if old and old.get("size") == info["size"] and old.get("mtime") == info["mtime"] and old.get("md5"):
+                    info["md5"] = old["md5"]
+                
+                other = remote.get(rel)
+                if other is None or other["size"] != info["size"]:
+                    changed.append(rel)
+                elif checksum:
+                    if "md5" not in info:
+                        info["md5"] = hash_local_file(info["path"])
+                    if other.get("md5") != info["md5"]:
+                        changed.append(rel)
+                elif other["mtime"] != info["mtime"]:
+                    # adb push preserves mtime, so a mismatch means the file changed
+                    changed.append(rel)
+            
+            # Group changed files by remote directory so each directory is a single push
+            groups = {}
+            for rel in sorted(changed):
+                remote_dir = posixpath.dirname(posixpath.join(remote_root, rel))
+                groups.setdefault(remote_dir, []).append(rel)
+            
+            if groups:
+                self.run_adb_command(["shell", "mkdir -p " + " ".join(shlex.quote(d) for d in groups)], serial=serial)
+            
+            pushed_bytes = 0
+            failed = []
+            for remote_dir, rels in groups.items():
+                if names is not None:
+                    target = posixpath.join(remote_root, names[0])
+                else:
+                    target = remote_dir + "/"
+                output = self.run_adb_command(["push"] + [local[rel]["path"] for rel in rels] + [target], serial=serial)
+                if "pushed" not in output:
+                    failed.extend(rels)
+                else:
+                    pushed_bytes += sum(local[rel]["size"] for rel in rels)
+            
+            deleted = []
+            if delete_extra:
+                deleted = sorted(set(remote) - set(local))
+                for i in range(0, len(deleted), 100):
+                    batch = " ".join(shlex.quote("./" + rel) for rel in deleted[i:i + 100])
+                    self.run_adb_command(["shell", f"cd {shlex.quote(remote_root)} && rm -f -- {batch}"], serial=serial)
+            if changed or deleted:
+                self.invalidate_remote_dir()
+            
+            # Remember local state for the next sync
+            with open(cache_path, "w") as f:
+                json.dump({rel: {k: v for k, v in info.items() if k != "path"}
+                           for rel, info in local.items() if rel not in failed}, f)
+            
+            summary = {
+                "pushed": len(changed) - len(failed),
+                "bytes": pushed_bytes,
+                "unchanged": len(local) - len(changed),
+                "deleted": len(deleted),
+                "failed": len(failed)
+            }
+            self.log(f"Sync complete: {summary['pushed']} pushed ({pushed_bytes} bytes), "
+                     f"{summary['unchanged']} unchanged, {summary['deleted']} deleted, {summary['failed']} failed")
+            return summary
+        except Exception as e:
+            self.log(f"Error syncing files: {str(e)}")
+            return None
+
+    def get_remote_file_info(self, path, serial=None):
+        """Get size, mtime and type of a remote path, or None if it does not exist"""
+        output = self.run_adb_command(["shell", f"stat -c '%s %Y %F' {shlex.quote(path)} 2>/dev/null"], serial=serial)
+        parts = output.strip().split(" ", 2)
+        if len(parts) == 3 and parts[0].isdigit() and parts[1].isdigit():
+            return {"size": int(parts[0]), "mtime": int(parts[1]), "type": parts[2]}
+        return None
+
+    def get_remote_hash(self, path, algorithm="sha256", serial=None, size=0):
+        """Hash a remote file with toybox <algorithm>sum, allowing time for size bytes; None if it fails"""
+        try:
+            # Raw call: run_adb_command's 30 second limit is far too short for a multi-GB file
+            result = self.run_adb_raw(["shell", f"{algorithm}sum {shlex.quote(path)}"], serial=serial,
+                                      timeout=scaled_timeout(size, HASH_MIN_RATE))
+        except subprocess.TimeoutExpired:
+            self.log(f"{algorithm}sum of {path} did not finish in time")
+            return None
+        parts = result.stdout.decode("utf-8", "replace").split()
+        if parts and re.fullmatch(r"[0-9a-fA-F]{32,128}", parts[0]):
+            return parts[0].lower()
+        return None
+
+    def verify_transfer(self, local_path, remote_path, serial=None):
+        """Compare SHA-256 of host and device copies; returns True/False, or None if unverifiable.
+        
+        Callers treat None as a failure: the transfer stays unfinished and is verified again on retry.
+        """
+        local_hash = hash_local_file(local_path, "sha256")
+        remote_hash = self.get_remote_hash(remote_path, "sha256", serial=serial, size=os.path.getsize(local_path))
+        if remote_hash is None:
+            self.log(f"Error: could not compute sha256 of {remote_path} on device, transfer not verified")
+            return None
+        if local_hash != remote_hash:
+            self.log(f"Integrity check failed: host {local_hash} != device {remote_hash}")
+            return False
+        self.log(f"Integrity verified (sha256 {local_hash})")
+        return True
+
+    def load_transfer_state(self, state_path):
+        """Load a transfer checkpoint, or None if missing/corrupt"""
+        try:
+            with open(state_path, "r") as f:
+                return json.load(f)
+        except Exception:
+            return None
+
+    def save_transfer_state(self, state_path, state):
+        """Atomically write a transfer checkpoint"""
+        tmp_path = state_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, state_path)
+
+    def pull_file_resumable(self, src, dest, serial=None):
+        """Pull a large file in dd-sized chunks, checkpointing progress so it can resume"""
+        try:
+            info = self.get_remote_file_info(src, serial=serial)
+            if not info:
+                self.log(f"Error: Remote file does not exist: {src}")
+                return False
+            
+            dest_path = os.path.join(dest, posixpath.basename(src)) if os.path.isdir(dest) else dest
+            part_path = dest_path + ".part"
+            state_path = part_path + ".json"
+            size = info["size"]
+            
+            # Resume only if the remote file is unchanged since the checkpoint
+            offset = 0
+            state = self.load_transfer_state(state_path)
+            if (state and os.path.exists(part_path) and state.get("src") == src
+                    and state.get("size") == size and state.get("mtime") == info["mtime"]):
+                offset = min(state.get("offset", 0), os.path.getsize(part_path))
+                offset -= offset % TRANSFER_CHUNK_SIZE
+                self.log(f"Resuming pull of {src} at {offset * 100 // max(size, 1)}%")
+            state = {"src": src, "size": size, "mtime": info["mtime"], "offset": offset}
+            
+            last_reported = -1
+            with open(part_path, "r+b" if offset else "wb") as f:
+                f.truncate(offset)
+                f.seek(offset)
+                while offset < size:
+                    expected = min(TRANSFER_CHUNK_SIZE, size - offset)
+                    block = offset // TRANSFER_CHUNK_SIZE
+                    for attempt in range(3):
+                        result = self.run_adb_raw(
+                            ["exec-out", f"dd if={shlex.quote(src)} bs={TRANSFER_CHUNK_SIZE} skip={block} count=1 2>/dev/null"],
+                            serial=serial
+                        )
+                        if len(result.stdout) == expected:
+                            break
+                        self.log(f"Short read at offset {offset} ({len(result.stdout)}/{expected} bytes), retrying...")
+                    else:
+                        self.save_transfer_state(state_path, state)
+                        self.log(f"Pull interrupted at {offset * 100 // size}%. Pull again to resume.")
+                        return False
+                    
+                    f.write(result.stdout)
+                    f.flush()
+                    os.fsync(f.fileno())
+                    offset += expected
+                    state["offset"] = offset
+                    self.save_transfer_state(state_path, state)
+                    
+                    percent = offset * 100 // size
+                    if percent // 10 != last_reported:
+                        last_reported = percent // 10
+                        self.log(f"Pulled {percent}% of {src}")
+            
+            verified = self.verify_transfer(part_path, src, serial=serial)
+            if verified is False:
+                os.remove(part_path)
+                os.remove(state_path)
+                return False
+            if verified is None:
+                # Complete but unverified: keep the .part and checkpoint so a retry only hashes it again
+                self.log(f"Kept unverified {part_path}. Pull again to verify it.")
+                return False
+            
+            os.replace(part_path, dest_path)
+            os.remove(state_path)
+            self.log(f"Pulled {src} to {dest_path}")
+            return True
+        except Exception as e:
+            self.log(f"Error pulling file: {str(e)}")
+            return False
+
+    def push_file_resumable(self, src, dest, serial=None):
+        """Push a large file in chunks via exec-in, resuming from the partial file on the device"""
+        try:
+            size = os.path.getsize(src)
+            mtime = int(os.path.getmtime(src))
+            
+            remote_path = dest
+            info = self.get_remote_file_info(dest, serial=serial)
+            if dest.endswith("/") or (info and info["type"] == "directory"):
+                remote_path = posixpath.join(dest, os.path.basename(src))
+            part_path = remote_path + ".part"
+            
+            device = serial or self.get_device_serial()
+            state_key = hashlib.sha1(f"{device}|{os.path.abspath(src)}|{remote_path}".encode()).hexdigest()
+            state_path = self.get_app_data_path("transfers", state_key + ".json")
+            
+            # The partial file on the device is the source of truth for how much arrived
+            offset = 0
+            state = self.load_transfer_state(state_path)
+            if state and state.get("size") == size and state.get("mtime") == mtime:
+                part_info = self.get_remote_file_info(part_path, serial=serial)
+                if part_info:
+                    offset = min(state.get("offset", 0), part_info["size"])
+                    offset -= offset % TRANSFER_CHUNK_SIZE
+                    self.log(f"Resuming push of {src} at {offset * 100 // max(size, 1)}%")
+            state = {"size": size, "mtime": mtime, "offset": offset}
+            
+            last_reported = -1
+            with open(src, "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    while offset < size:
+                        block = offset // TRANSFER_CHUNK_SIZE
+                        data = mapped[offset:offset + TRANSFER_CHUNK_SIZE]
+                        for attempt in range(3):
+                            result = self.run_adb_raw(
+                                ["exec-in", f"dd of={shlex.quote(part_path)} bs={TRANSFER_CHUNK_SIZE} seek={block} conv=notrunc 2>/dev/null"],
+                                serial=serial, input=data
+                            )
+                            if result.returncode == 0:
+                                break
+                            self.log(f"Chunk at offset {offset} failed, retrying...")
+                        else:
+                            self.save_transfer_state(state_path, state)
+                            self.log(f"Push interrupted at {offset * 100 // size}%. Push again to resume.")
+                            return False
+                        
+                        offset += len(data)
+                        state["offset"] = offset
+                        self.save_transfer_state(state_path, state)
+                        
+                        percent = offset * 100 // size
+                        if percent // 10 != last_reported:
+                            last_reported = percent // 10
+                            self.log(f"Pushed {percent}% of {src}")
+            
+            verified = self.verify_transfer(src, part_path, serial=serial)
+            if verified is False:
+                self.run_adb_command(["shell", f"rm -f {shlex.quote(part_path)}"], serial=serial)
+                os.remove(state_path)
+                return False
+            if verified is None:
+                # Complete but unverified: keep the .part and checkpoint so a retry only hashes it again
+                self.log(f"Kept unverified {part_path} on the device. Push again to verify it.")
+                return False
+            
+            # Keep the host mtime like 'adb push' does, then move into place
+            self.run_adb_command(["shell", f"touch -d @{mtime} {shlex.quote(part_path)} 2>/dev/null; "
+                                           f"mv -f {shlex.quote(part_path)} {shlex.quote(remote_path)}"], serial=serial)
+            os.remove(state_path)
+            self.log(f"Pushed {src} to {remote_path}")
+            return True
+        except Exception as e:
+            self.log(f"Error pushing file: {str(e)}")
+            return False
+
+    def pull(self, src, dest, serial=None):
+        """Pull a file or folder; large single files use the resumable path. Returns True on success"""
+        info = self.get_remote_file_info(src, serial=serial)
+        if info and info["type"] == "regular file" and info["size"] >= LARGE_FILE_THRESHOLD:
+            return self.pull_file_resumable(src, dest, serial=serial)
+        return "error" not in self.run_adb_command(["pull", src, dest], serial=serial).lower()
+
+    def push(self, src, dest, serial=None):
+        """Push a file or folder; large single files use the resumable path. Returns True on success"""
+        if os.path.isfile(src) and os.path.getsize(src) >= LARGE_FILE_THRESHOLD:
+            ok = self.push_file_resumable(src, dest, serial=serial)
+        else:
+            ok = "error" not in self.run_adb_command(["push", src, dest], serial=serial).lower()
+        self.invalidate_remote_dir()
+        return ok
+
+    def list_remote_dir(self, path, max_age=REMOTE_LISTING_TTL):
+        """List a remote directory with a single stat call, served from cache while fresh"""
+        with self.remote_cache_lock:
+            cached = self.remote_dir_cache.get(path)
+        if cached and time.time() - cached[0] < max_age:
+            return cached[1]
+        
+        output = self.run_adb_command(
+            ["shell", f"cd {shlex.quote(path)} && stat -L -c '%F|%s|%Y|%n' * .* 2>/dev/null"]
+        )
+        entries = []
+        for line in output.splitlines():
+            parts = line.rstrip("\r").split("|", 3)
+            if len(parts) != 4 or not parts[1].isdigit() or parts[3] in (".", ".."):
+                continue
+            entries.append({
+                "name": parts[3],
+                "is_dir": parts[0] == "directory",
+                "size": int(parts[1]),
+                "mtime": int(parts[2]) if parts[2].isdigit() else 0
+            })
+        entries.sort(key=lambda e: (not e["is_dir"], e["name"].lower()))
+        
+        with self.remote_cache_lock:
+            self.remote_dir_cache[path] = (time.time(), entries)
+        return entries
+
+    def get_cached_remote_dir(self, path):
+        """Return a fresh cached listing, or None"""
+        with self.remote_cache_lock:
+            cached = self.remote_dir_cache.get(path)
+        if cached and time.time() - cached[0] < REMOTE_LISTING_TTL:
+            return cached[1]
+        return None
+
+    def invalidate_remote_dir(self, path=None):
+        """Drop one cached listing, or all of them"""
+        with self.remote_cache_lock:
+            if path is None:
+                self.remote_dir_cache.clear()
+            else:
+                self.remote_dir_cache.pop(path, None)
+
+    # Screen and logcat
+    def capture_screen_raw(self, serial=None):
+        """Stream a raw framebuffer dump straight into host memory via exec-out"""
+        result = self.run_adb_raw(["exec-out", "screencap"], serial=serial, timeout=30)
+        if len(result.stdout) < 16:
+            raise RuntimeError(result.stderr.decode(errors="ignore").strip() or "empty screencap output")
+        return result.stdout
+
+    def get_capture_dir(self):
+        return self.get_app_data_path("logcat_captures", "")
+
+    # Tuning
+    def load_tweak_profiles(self):
+        """Load tweak profiles from disk, seeding the file with the built-in ones"""
+        path = self.get_app_data_path("tweak_profiles.json")
+        try:
+            if not os.path.exists(path):
+                with open(path, "w") as f:
+                    json.dump(TWEAK_PROFILES, f, indent=2)
+            with open(path, "r") as f:
+                return json.load(f)
+        except Exception as e:
+            self.log(f"Error loading tweak profiles: {str(e)}")
+            return dict(TWEAK_PROFILES)
+
+    def get_settings_snapshot(self, namespaces, serial=None, max_age=SETTINGS_SNAPSHOT_TTL):
+        """Current values of whole settings namespaces, read in bulk with one shell call"""
+        key = serial or "default"
+        now = time.time()
+        cached = self.settings_snapshots.get(key, {})
+        missing = [ns for ns in namespaces if ns not in cached or now - cached[ns][0] > max_age]
+        if missing:
+            script = "; ".join(f"echo @@{ns}; settings list {ns}" for ns in missing)
+            output = self.run_adb_command(["shell", script], serial=serial)
+            for ns, values in parse_settings_lists(output).items():
+                cached[ns] = (now, values)
+            self.settings_snapshots[key] = cached
+        return {ns: cached[ns][1] for ns in namespaces if ns in cached}
+
+    def apply_tweaks(self, profile, serial=None):
+        """Apply a profile; returns [(step label, ok)]
+        
+        Settings already at the requested value are skipped, so re-applying a profile
+        costs one bulk read and no writes. sysfs writes run as a tuning transaction.
+        """
+        settings = profile.get("settings", [])
+        unchanged = []
+        if settings:
+            snapshot = self.get_settings_snapshot(sorted({ns for ns, _, _ in settings}), serial)
+            settings, unchanged = diff_settings(snapshot, settings)
+        skipped = [(label + " (unchanged)", True) for label in compile_tweak_script({"settings": unchanged})[1]]
+        
+        sysfs_results = self.apply_sysfs_transaction(profile["sysfs"], serial) if profile.get("sysfs") else []
+        
+        script, labels = compile_tweak_script({"settings": settings})
+        if not labels:
+            return skipped + sysfs_results
+        result = self.run_adb_raw(["shell", "sh"], serial=serial, input=script.encode(), timeout=60)
+        results = parse_tweak_results(result.stdout.decode("utf-8", "replace"), labels)
+        self.command_cache.invalidate(serial or "default")
+        
+        # Keep the cached snapshot in step with what was just written
+        cached = self.settings_snapshots.get(serial or "default", {})
+        for (namespace, key, value), (_, ok) in zip(settings, results):
+            if namespace in cached:
+                if ok and value is not None:
+                    cached[namespace][1][key] = str(value)
+                elif ok:
+                    cached[namespace][1].pop(key, None)
+                else:
+                    del cached[namespace]
+        return skipped + results + sysfs_results
+
+    def get_sysfs_snapshot_path(self, device):
+        return self.get_app_data_path("sysfs_snapshots", re.sub(r"[^A-Za-z0-9._-]", "_", device) + ".json")
+
+    def load_sysfs_snapshot(self, device):
+        """Original node values saved before the first tweak on a device"""
+        if device not in self.sysfs_snapshots:
+            try:
+                with open(self.get_sysfs_snapshot_path(device), "r") as f:
+                    self.sysfs_snapshots[device] = json.load(f)
+            except (OSError, ValueError):
+                self.sysfs_snapshots[device] = {}
+        return self.sysfs_snapshots[device]
+
+    def save_sysfs_snapshot(self, device, snapshot):
+        path = self.get_sysfs_snapshot_path(device)
+        if not snapshot:
+            if os.path.exists(path):
+                os.remove(path)
+            return
+        with open(path + ".tmp", "w") as f:
+            json.dump(snapshot, f, indent=2)
+        os.replace(path + ".tmp", path)
+
+    def apply_sysfs_transaction(self, writes, serial=None):
+        """Write [path, value] pairs with snapshot and read-back verification; returns [(label, verified)]
+        
+        All target nodes are read in one root call and their prior values saved before
+        anything is written; the writes and their read-back then happen in a second call.
+        """
+        device = serial or self.get_device_serial()
+        current = parse_sysfs_values(self.run_root_script(build_sysfs_read_script([p for p, _ in writes]), serial))
+        
+        results = []
+        targets = {}
+        for pattern, value in writes:
+            matched = [path for path in current if fnmatch.fnmatchcase(path, pattern)]
+            if not matched:
+                results.append((f"{pattern} = {value} (not found)", False))
+            for path in matched:
+                targets[path] = str(value)
+        
+        # Only the value from before the first tweak is kept, so rollback restores the stock state
+        snapshot = self.load_sysfs_snapshot(device)
+        for path in targets:
+            snapshot.setdefault(path, current[path])
+        self.save_sysfs_snapshot(device, snapshot)
+        
+        pending = {path: value for path, value in targets.items() if not sysfs_value_matches(current[path], value)}
+        readback = parse_sysfs_values(self.run_root_script(build_sysfs_write_script(pending), serial)) if pending else {}
+        for path, value in targets.items():
+            if path in pending:
+                results.append((f"{path} = {value}", sysfs_value_matches(readback.get(path), value)))
+            else:
+                results.append((f"{path} = {value} (unchanged)", True))
+        return results
+
+    def rollback_sysfs(self, paths=None, serial=None):
+        """Restore snapshotted nodes (all, or those matching paths) in one call; returns (restored, failed)"""
+        device = serial or self.get_device_serial()
+        snapshot = self.load_sysfs_snapshot(device)
+        chosen = {path: value for path, value in snapshot.items()
+                  if paths is None or any(fnmatch.fnmatchcase(path, pattern) for pattern in paths)}
+        if not chosen:
+            return [], []
+        readback = parse_sysfs_values(self.run_root_script(build_sysfs_write_script(chosen), serial))
+        restored = [path for path, value in chosen.items() if sysfs_value_matches(readback.get(path), value)]
+        failed = [path for path in chosen if path not in restored]
+        for path in restored:
+            del snapshot[path]
+        self.save_sysfs_snapshot(device, snapshot)
+        return restored, failed
+
+    def get_cpu_policies(self, serial=None):
+        """cpufreq policies (one per cluster) with their governors and frequencies, in one call"""
+        nodes = " ".join(CPUFREQ_NODES)
+        script = (f'for p in {CPUFREQ_DIR}/policy*; do [ -d "$p" ] || continue; echo "@@$p"; '
+                  f'for n in {nodes}; do [ -e "$p/$n" ] && printf \'%s=%s\\n\' "$n" "$(cat "$p/$n" 2>/dev/null)"; done; done')
+        return parse_cpu_policies(self.run_adb_command(["shell", script], serial=serial))
+
+    def read_cpu_frequencies(self, serial=None):
+        """Current frequency (kHz) of every cluster, {policy name: value}; unlogged for polling"""
+        script = f'for p in {CPUFREQ_DIR}/policy*; do printf \'%s %s\\n\' "${{p##*/}}" "$(cat "$p/scaling_cur_freq" 2>/dev/null)"; done'
+        output = self.run_adb_raw(["shell", script], serial=serial, timeout=10).stdout.decode("utf-8", "replace")
+        return dict(line.split(None, 1) for line in output.splitlines() if len(line.split()) == 2)
+
+    def sample_telemetry(self, serial=None, interval=1.0):
+        """CPU/RAM load and network throughput measured over interval seconds; unlogged for polling"""
+        result = self.run_adb_raw(["shell", build_telemetry_script(interval)], serial=serial, timeout=interval + 30)
+        return parse_telemetry(result.stdout.decode("utf-8", "replace"), interval)
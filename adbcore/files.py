@@ -0,0 +1,41 @@
+"""File transfer settings and host-side helpers"""
+import hashlib
+import mmap
+import os
+
+# Files at least this large are transferred in resumable chunks
+LARGE_FILE_THRESHOLD = 64 * 1024 * 1024
+TRANSFER_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Bytes written to a streamed install between progress reports and cancel checks
+INSTALL_CHUNK_SIZE = 1024 * 1024
+
+# Seconds a cached remote directory listing stays valid
+REMOTE_LISTING_TTL = 30
+
+# Slowest rates expected of a device, in bytes per second: installing (copy plus
+# dexopt) and hashing with sha256sum. Work on large files gets a timeout scaled
+# from these instead of the fixed 30 seconds of run_adb_command.
+INSTALL_MIN_RATE = 1024 * 1024
+HASH_MIN_RATE = 8 * 1024 * 1024
+
+def format_size(size):
+    """Human readable byte count"""
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+def scaled_timeout(size, rate):
+    """Seconds to allow for work on size bytes done at no less than rate bytes per second"""
+    return 60 + size / rate
+
+def hash_local_file(path, algorithm="md5"):
+    """Hash a local file through mmap (matches toybox md5sum/sha256sum on the device)"""
+    digest = hashlib.new(algorithm)
+    if os.path.getsize(path) == 0:
+        return digest.hexdigest()
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            digest.update(mapped)
+    return digest.hexdigest()
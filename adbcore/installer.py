@@ -0,0 +1,236 @@
+"""Install queue and install mode selection: many packages onto many devices.
+
+Each device drains its own FIFO on a worker thread, so installs on one device
+run one at a time while every device is busy at once. Jobs report bytes sent
+as they stream, and can be cancelled while queued or running and retried
+once they have failed or been cancelled.
+
+Every install goes through the fastest mode the device and host adb support
+(see AdbClient.install_files); the queue shows which one each job used.
+"""
+import collections
+import itertools
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+
+from .apk import package_type
+
+# Job states
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+
+# Seconds between progress notifications of a running job
+PROGRESS_INTERVAL = 0.25
+
+# Install modes, preferred first (AdbClient.get_install_modes):
+#   incremental  adb install --incremental; returns once the app is launchable and
+#                streams the rest on demand (Android 11+, host adb 30+, APK Signature v4)
+#   streamed     package session fed over exec-in with byte progress (Android 7.0+)
+#   adb          plain adb install / install-multiple, whatever the host adb does
+INCREMENTAL_MIN_SDK = 30
+INCREMENTAL_MIN_ADB = 30
+
+def parse_adb_version(output):
+    """Major platform-tools version from `adb version` ("Version 34.0.5-..."), 0 if unknown"""
+    match = re.search(r"^Version (\d+)\.", output, re.MULTILINE)
+    return int(match.group(1)) if match else 0
+
+def is_package_failure(output):
+    """True when the package manager rejected the app itself, which no other mode would change"""
+    return bool(re.search(r"INSTALL_(PARSE_)?FAILED_", output)) and "INSTALL_FAILED_ABORTED" not in output
+
+def is_transient_failure(output):
+    """True when the device or connection failed (unplugged, offline, timed out), not the install mode"""
+    return bool(re.search(r"device .*not found|no devices|device offline|unauthorized|timed out|"
+                          r"connection reset|protocol fault|broken pipe", output, re.IGNORECASE))
+
+def is_mode_unsupported(mode, output):
+    """True when the output says this device or host adb cannot do the mode at all"""
+    if mode == "incremental":
+        return bool(re.search(r"incremental|incfs|idsig|signature file|unknown option", output, re.IGNORECASE))
+    if mode == "streamed":
+        # No cmd binary or package service for install-create, or a host adb / pm without the command;
+        # a bare "not found" would also match a missing device or file
+        return bool(re.search(r"cmd: (inaccessible or )?not found|can't find service|"
+                              r"unknown command:? *(exec-in|install-create|install-write|install-commit)",
+                              output, re.IGNORECASE))
+    return False
+
+def choose_install_modes(supported, timings):
+    """Order supported modes for the next install: untried ones first (preferred order), then by measured speed.
+    
+    timings is {mode: {"bytes": ..., "seconds": ...}} for one device.
+    """
+    untried = [mode for mode in supported if mode not in timings]
+    measured = sorted((mode for mode in supported if mode in timings),
+                      key=lambda mode: timings[mode]["bytes"] / max(timings[mode]["seconds"], 0.001), reverse=True)
+    return untried + measured
+
+class InstallJob:
+    """One APK or XAPK onto one device (serial None: the only connected device)"""
+    ids = itertools.count(1)
+
+    def __init__(self, path, serial=None, name=None):
+        self.id = next(InstallJob.ids)
+        self.path = path
+        self.serial = serial
+        self.name = name or os.path.basename(path)
+        self.type = package_type(path)
+        self.reset()
+
+    def reset(self):
+        self.state = QUEUED
+        self.size = 0
+        self.sent = 0
+        self.started = None
+        self.finished = None
+        self.message = ""
+        self.mode = ""
+        self.cancel_event = threading.Event()
+
+    @property
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.monotonic()) - self.started
+
+    @property
+    def progress(self):
+        """Fraction of the package sent (1.0 once installed)"""
+        if self.state == DONE:
+            return 1.0
+        return self.sent / self.size if self.size else 0.0
+
+    @property
+    def throughput(self):
+        """Bytes per second sent so far"""
+        return self.sent / self.elapsed if self.elapsed > 0 else 0.0
+
+class InstallQueue:
+    """Per-device FIFOs of install jobs; on_update(job) is called from worker threads on every change"""
+    def __init__(self, client, on_update=None):
+        self.client = client
+        self.on_update = on_update
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.active_devices = set()
+        self.jobs = []
+
+    def notify(self, job):
+        if self.on_update:
+            self.on_update(job)
+
+    def submit(self, packages, serials):
+        """Queue every (path, name) package on every serial; returns the new jobs"""
+        jobs = [InstallJob(path, serial, name) for serial in serials for path, name in packages]
+        for job in jobs:
+            self.enqueue(job)
+        return jobs
+
+    def enqueue(self, job):
+        with self.lock:
+            if job not in self.jobs:
+                self.jobs.append(job)
+            self.pending.setdefault(job.serial, collections.deque()).append(job)
+            start = job.serial not in self.active_devices
+            self.active_devices.add(job.serial)
+        self.notify(job)
+        if start:
+            threading.Thread(target=self.drain, args=(job.serial,), daemon=True).start()
+
+    def cancel(self, job):
+        """Drop a queued job, or stop a running streamed one at its next chunk"""
+        job.cancel_event.set()
+        with self.lock:
+            queue = self.pending.get(job.serial)
+            if job.state != QUEUED or not queue or job not in queue:
+                return
+            queue.remove(job)
+            job.state = CANCELLED
+        self.notify(job)
+
+    def retry(self, job):
+        if job.state in (FAILED, CANCELLED):
+            job.reset()
+            self.enqueue(job)
+
+    def clear_finished(self):
+        """Forget jobs that are done, failed or cancelled; returns them"""
+        with self.lock:
+            finished = [job for job in self.jobs if job.state in (DONE, FAILED, CANCELLED)]
+            self.jobs = [job for job in self.jobs if job not in finished]
+        return finished
+
+    def cancel_all(self):
+        for job in list(self.jobs):
+            if job.state in (QUEUED, RUNNING):
+                self.cancel(job)
+
+    def throughput(self):
+        """Combined bytes per second of the running jobs"""
+        return sum(job.throughput for job in self.jobs if job.state == RUNNING)
+
+    def drain(self, serial):
+        """Worker for one device: run its jobs in order until its FIFO is empty"""
+        while True:
+            with self.lock:
+                queue = self.pending.get(serial)
+                if not queue:
+                    self.pending.pop(serial, None)
+                    self.active_devices.discard(serial)
+                    return
+                job = queue.popleft()
+                job.state = RUNNING
+                job.started = time.monotonic()
+            self.notify(job)
+            self.run_job(job)
+
+    def run_job(self, job):
+        try:
+            output = self.install(job)
+            # A cancel that came too late to interrupt (plain and incremental installs, the
+            # final commit) leaves the app installed, so the outcome decides the state
+            if "Success" in output:
+                job.state = DONE
+            elif output == "Cancelled":
+                job.state = CANCELLED
+            else:
+                job.state = FAILED
+            job.message = output.strip().splitlines()[-1] if output.strip() else ""
+        except Exception as e:
+            job.state = FAILED
+            job.message = str(e)
+        job.finished = time.monotonic()
+        self.client.log(f"Install {job.name} on {job.serial or 'device'}: {job.state} "
+                        f"({job.mode or 'no mode'}, {job.elapsed:.1f}s) {job.message}")
+        self.notify(job)
+
+    def install(self, job):
+        temp_dir = None
+        try:
+            if job.type == "XAPK":
+                temp_dir = tempfile.mkdtemp(prefix="xapk_")
+                apk_files = self.client.extract_xapk(job.path, temp_dir)
+            else:
+                apk_files = [job.path]
+            job.size = sum(os.path.getsize(path) for path in apk_files)
+            
+            last = [0.0]
+            def progress(sent, mode):
+                job.sent = sent
+                job.mode = mode
+                now = time.monotonic()
+                if now - last[0] >= PROGRESS_INTERVAL:
+                    last[0] = now
+                    self.notify(job)
+            output, job.mode = self.client.install_files(apk_files, job.serial, progress, job.cancel_event.is_set)
+            # Only streamed installs report bytes as they go
+            if "Success" in output:
+                job.sent = job.size
+            return output
+        finally:
+            if temp_dir:
+                shutil.rmtree(temp_dir, ignore_errors=True)
@@ -0,0 +1,333 @@
+"""Binary logcat parsing, the viewer ring buffer and rotating compressed capture"""
+import functools
+import gzip
+import json
+import os
+import re
+import struct
+import threading
+import time
+from datetime import datetime
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Logcat viewer settings
+LOGCAT_BUFFER_LINES = 100000
+LOGCAT_PRIORITIES = {"V": 2, "D": 3, "I": 4, "W": 5, "E": 6, "F": 7}
+LOGCAT_PRIORITY_LETTERS = {v: k for k, v in LOGCAT_PRIORITIES.items()}
+LOGCAT_ENTRY_HEADER = struct.Struct("<HHiIII")
+
+# Background logcat capture: segments rotate by uncompressed size, and each
+# block inside a segment is compressed independently so the index can seek to it
+LOGCAT_CAPTURE_SEGMENT_BYTES = 64 * 1024 * 1024
+LOGCAT_CAPTURE_BLOCK_BYTES = 256 * 1024
+LOGCAT_CAPTURE_BLOCK_SECONDS = 5
+LOGCAT_CAPTURE_MAX_SEGMENTS = 100
+
+def parse_logcat_entries(buf):
+    """Parse binary `logcat -B` entries; returns (entries, bytes consumed)"""
+    entries = []
+    pos = 0
+    end = len(buf)
+    while end - pos >= LOGCAT_ENTRY_HEADER.size:
+        payload_len, header_size, pid, tid, sec, nsec = LOGCAT_ENTRY_HEADER.unpack_from(buf, pos)
+        # v1 entries have padding instead of a header size; later versions append lid/uid
+        header_size = header_size or LOGCAT_ENTRY_HEADER.size
+        if end - pos < header_size + payload_len:
+            break
+        payload = bytes(buf[pos + header_size:pos + header_size + payload_len])
+        pos += header_size + payload_len
+        if not payload:
+            continue
+        
+        # Text log payload: priority byte, NUL-terminated tag, NUL-terminated message
+        tag_end = payload.find(b"\0", 1)
+        if tag_end < 0:
+            tag_end = len(payload)
+        tag = payload[1:tag_end].decode("utf-8", "replace")
+        message = payload[tag_end + 1:].rstrip(b"\0\n").decode("utf-8", "replace")
+        entries.append((sec, nsec, pid, tid, payload[0], tag, message))
+    return entries, pos
+
+def make_logcat_filter(tag="", min_priority="V", pid="", pattern=""):
+    """Build a predicate over parsed entries, or None if nothing is filtered"""
+    tags = {t.strip() for t in tag.split(",") if t.strip()}
+    level = LOGCAT_PRIORITIES.get(min_priority, 2)
+    pid = int(pid) if str(pid).strip().isdigit() else None
+    regex = re.compile(pattern) if pattern else None
+    if not tags and level <= 2 and pid is None and regex is None:
+        return None
+    
+    def keep(entry):
+        sec, nsec, entry_pid, tid, priority, entry_tag, message = entry
+        return (priority >= level
+                and (pid is None or entry_pid == pid)
+                and (not tags or entry_tag in tags)
+                and (regex is None or regex.search(message) is not None))
+    return keep
+
+@functools.lru_cache(maxsize=64)
+def format_stamp(sec):
+    """Date and time of a log second; consecutive entries mostly share one, hence the cache"""
+    return time.strftime("%m-%d %H:%M:%S", time.localtime(sec))
+
+def format_logcat_entry(entry):
+    """Format an entry like `logcat -v threadtime`; returns a list of (priority letter, line)"""
+    sec, nsec, pid, tid, priority, tag, message = entry
+    stamp = format_stamp(sec)
+    letter = LOGCAT_PRIORITY_LETTERS.get(priority, "?")
+    prefix = f"{stamp}.{nsec // 1000000:03d} {pid:5d} {tid:5d} {letter} {tag}: "
+    return [(letter, prefix + line) for line in message.split("\n")]
+
+class LogRingBuffer:
+    """Fixed-capacity line store addressed by absolute line number; the oldest lines are overwritten"""
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.lines = [None] * capacity
+        self.total = 0
+    
+    def __len__(self):
+        return min(self.total, self.capacity)
+    
+    @property
+    def first(self):
+        """Absolute number of the oldest line still stored"""
+        return self.total - len(self)
+    
+    def extend(self, lines):
+        for line in lines:
+            self.lines[self.total % self.capacity] = line
+            self.total += 1
+    
+    def slice(self, start, count):
+        start = max(start, self.first)
+        return [self.lines[i % self.capacity] for i in range(start, min(start + count, self.total))]
+    
+    def clear(self):
+        self.lines = [None] * self.capacity
+        self.total = 0
+
+def compress_block(data, codec):
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+def decompress_block(data, codec):
+    if codec == "zstd":
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+def capture_file_prefix(serial):
+    """File name prefix for a device's capture segments (wireless serials contain ':')"""
+    return re.sub(r"[^A-Za-z0-9._-]", "_", serial) + "_"
+
+def search_logcat_captures(capture_dir, start=None, end=None, tags=None, pattern=None, serial=None, limit=10000):
+    """Find captured entries by time window, tag and regex.
+    
+    Only blocks whose index record overlaps the window and lists a wanted tag are read and
+    decompressed; everything else is skipped without touching the segment data.
+    Returns a list of (segment file name, entry).
+    """
+    tags = set(tags or [])
+    regex = re.compile(pattern) if pattern else None
+    results = []
+    for index_name in sorted(os.listdir(capture_dir)):
+        if not index_name.endswith(".idx"):
+            continue
+        if serial and not index_name.startswith(capture_file_prefix(serial)):
+            continue
+        segment_name = index_name[:-len(".idx")]
+        codec = "zstd" if segment_name.endswith(".zst") else "gzip"
+        
+        with open(os.path.join(capture_dir, index_name), "r") as index_file:
+            records = []
+            for line in index_file:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+        
+        with open(os.path.join(capture_dir, segment_name), "rb") as segment:
+            for record in records:
+                if start is not None and record["last"] < start:
+                    continue
+                if end is not None and record["first"] > end:
+                    continue
+                if tags and not tags.intersection(record["tags"]):
+                    continue
+                segment.seek(record["offset"])
+                entries, _ = parse_logcat_entries(decompress_block(segment.read(record["length"]), codec))
+                for entry in entries:
+                    timestamp = entry[0] + entry[1] / 1e9
+                    if start is not None and timestamp < start:
+                        continue
+                    if end is not None and timestamp > end:
+                        continue
+                    if tags and entry[5] not in tags:
+                        continue
+                    if regex and not regex.search(entry[6]):
+                        continue
+                    results.append((segment_name, entry))
+                    if len(results) >= limit:
+                        return results
+    return results
+
+class LogcatCapture:
+    """Writes one device's binary logcat stream to rotating compressed segments with a sparse index"""
+    def __init__(self, client, serial, out_dir, codec="gzip"):
+        self.client = client
+        self.serial = serial
+        self.out_dir = out_dir
+        self.codec = "zstd" if codec == "zstd" and zstandard else "gzip"
+        self.extension = ".logcat.zst" if self.codec == "zstd" else ".logcat.gz"
+        self.running = False
+        self.process = None
+        self.thread = None
+        # Newest stored entry as exact (sec, nsec), and the stamp replayed entries are skipped up to
+        self.last_stamp = None
+        self.resume_after = None
+        
+        self.segment = None
+        self.index = None
+        self.segment_size = 0
+        self.reset_block()
+    
+    def reset_block(self):
+        self.block = bytearray()
+        self.block_first = None
+        self.block_last = None
+        self.block_tags = set()
+        self.block_entries = 0
+        self.block_started = time.monotonic()
+    
+    def start(self):
+        os.makedirs(self.out_dir, exist_ok=True)
+        self.running = True
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+    
+    def stop(self):
+        self.running = False
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+        if self.thread:
+            self.thread.join(timeout=5)
+    
+    def run(self):
+        """Capture thread; reconnects (without duplicating entries) if the device drops"""
+        while self.running:
+            command = ["exec-out", "logcat", "-B"]
+            if self.last_stamp:
+                # -T is inclusive and takes milliseconds: start at the last stored entry's
+                # millisecond (truncated) and let consume() skip what was already stored
+                sec, nsec = self.last_stamp
+                command += ["-T", f"{sec}.{nsec // 1000000:03d}"]
+                self.resume_after = self.last_stamp
+            try:
+                self.process = self.client.open_adb_stream(command, serial=self.serial)
+                pending = bytearray()
+                while self.running:
+                    data = self.process.stdout.read(65536)
+                    if not data:
+                        break
+                    pending += data
+                    self.consume(pending)
+            except Exception as e:
+                self.client.log(f"Logcat capture error on {self.serial}: {str(e)}")
+            finally:
+                if self.process and self.process.poll() is None:
+                    self.process.terminate()
+            if self.running:
+                time.sleep(2)
+        
+        try:
+            self.flush_block()
+        finally:
+            self.close_segment()
+    
+    def skip_replayed(self, pending):
+        """Drop the leading entries a reconnect replayed (at or before the last stored one)"""
+        while len(pending) >= LOGCAT_ENTRY_HEADER.size:
+            payload_len, header_size, pid, tid, sec, nsec = LOGCAT_ENTRY_HEADER.unpack_from(pending, 0)
+            size = (header_size or LOGCAT_ENTRY_HEADER.size) + payload_len
+            if len(pending) < size:
+                return
+            if (sec, nsec) > self.resume_after:
+                self.resume_after = None
+                return
+            del pending[:size]
+    
+    def consume(self, pending):
+        """Move complete entries from pending into the current block"""
+        if self.resume_after:
+            self.skip_replayed(pending)
+            if self.resume_after:
+                return
+        entries, consumed = parse_logcat_entries(pending)
+        if not consumed:
+            return
+        for sec, nsec, pid, tid, priority, tag, message in entries:
+            timestamp = sec + nsec / 1e9
+            if self.block_first is None or timestamp < self.block_first:
+                self.block_first = timestamp
+            if self.block_last is None or timestamp > self.block_last:
+                self.block_last = timestamp
+            self.block_tags.add(tag)
+            if self.last_stamp is None or (sec, nsec) > self.last_stamp:
+                self.last_stamp = (sec, nsec)
+        self.block_entries += len(entries)
+        self.block += pending[:consumed]
+        del pending[:consumed]
+        
+        if (len(self.block) >= LOGCAT_CAPTURE_BLOCK_BYTES
+                or time.monotonic() - self.block_started >= LOGCAT_CAPTURE_BLOCK_SECONDS):
+            self.flush_block()
+    
+    def flush_block(self):
+        """Compress the current block into the segment and record it in the index"""
+        if not self.block_entries:
+            return
+        if self.segment is None or self.segment_size >= LOGCAT_CAPTURE_SEGMENT_BYTES:
+            self.rotate()
+        data = compress_block(bytes(self.block), self.codec)
+        offset = self.segment.tell()
+        self.segment.write(data)
+        self.segment.flush()
+        self.index.write(json.dumps({
+            "offset": offset,
+            "length": len(data),
+            "first": self.block_first,
+            "last": self.block_last,
+            "entries": self.block_entries,
+            "tags": sorted(self.block_tags)
+        }) + "\n")
+        self.index.flush()
+        self.segment_size += len(self.block)
+        self.reset_block()
+    
+    def rotate(self):
+        """Start a new segment and drop the oldest ones beyond the retention limit"""
+        self.close_segment()
+        prefix = capture_file_prefix(self.serial)
+        name = prefix + datetime.now().strftime("%Y%m%d_%H%M%S_%f") + self.extension
+        self.segment = open(os.path.join(self.out_dir, name), "wb")
+        self.index = open(os.path.join(self.out_dir, name + ".idx"), "w")
+        self.segment_size = 0
+        
+        segments = sorted(f for f in os.listdir(self.out_dir) if f.startswith(prefix) and f.endswith(self.extension))
+        for old in segments[:-LOGCAT_CAPTURE_MAX_SEGMENTS]:
+            for path in (old, old + ".idx"):
+                try:
+                    os.remove(os.path.join(self.out_dir, path))
+                except OSError:
+                    pass
+    
+    def close_segment(self):
+        for f in (self.segment, self.index):
+            if f:
+                f.close()
+        self.segment = None
+        self.index = None
@@ -0,0 +1,47 @@
+"""Device property parsing and the one-shot capability probe"""
+import re
+
+# What the capability probe checks, once per device and build
+PROBED_COMMANDS = ("su", "cmd", "toybox", "md5sum", "sha256sum", "stat", "dd", "screencap", "screenrecord", "logcat")
+PROBED_NODES = ("/sys/block/zram0", "/sys/class/thermal/thermal_message/sconfig",
+                "/sys/devices/system/cpu/cpufreq", "/proc/sys/vm/swappiness")
+
+def parse_getprop(output):
+    """Parse `getprop` output ("[name]: [value]" lines; values may span lines) into a dict"""
+    return {m.group(1): m.group(2) for m in re.finditer(r"^\[([^\]]+)\]: \[(.*?)\]$", output, re.MULTILINE | re.DOTALL)}
+
+def build_capability_probe_script():
+    """One shell script that reports everything the capability cache records as key=value lines"""
+    lines = [
+        'echo "fingerprint=$(getprop ro.build.fingerprint)"',
+        'echo "sdk=$(getprop ro.build.version.sdk)"',
+        'echo "abi=$(getprop ro.product.cpu.abi)"',
+        'echo "abilist=$(getprop ro.product.cpu.abilist)"',
+        f'for c in {" ".join(PROBED_COMMANDS)}; do command -v "$c" >/dev/null 2>&1 && echo "cmd.$c=1" || echo "cmd.$c=0"; done',
+        f'for n in {" ".join(PROBED_NODES)}; do [ -e "$n" ] && echo "node.$n=1" || echo "node.$n=0"; done',
+        "pm list packages -u -i android 2>&1 | grep -q '^package:' && echo pm_list_ui=1 || echo pm_list_ui=0",
+        "echo \"refresh_rates=$(dumpsys display 2>/dev/null | grep -oE 'fps=[0-9.]+' | sort -u | tr '\\n' ' ')\"",
+        "command -v su >/dev/null 2>&1 && [ \"$(su -c 'id -u' </dev/null 2>/dev/null)\" = 0 ] && echo root=1 || echo root=0"
+    ]
+    return "\n".join(lines) + "\n"
+
+def parse_capability_probe(output):
+    caps = {"commands": {}, "nodes": {}, "refresh_rates": []}
+    for line in output.splitlines():
+        if "=" not in line:
+            continue
+        key, value = line.split("=", 1)
+        value = value.strip()
+        if key.startswith("cmd."):
+            caps["commands"][key[4:]] = value == "1"
+        elif key.startswith("node."):
+            caps["nodes"][key[5:]] = value == "1"
+        elif key == "refresh_rates":
+            caps["refresh_rates"] = sorted({round(float(v[4:])) for v in value.split() if v[4:].replace(".", "", 1).isdigit()})
+        elif key in ("root", "pm_list_ui"):
+            caps[key] = value == "1"
+        elif key == "sdk":
+            caps[key] = int(value) if value.isdigit() else 0
+        elif key in ("fingerprint", "abi", "abilist"):
+            caps[key] = value
+    return caps
@@ -0,0 +1,69 @@
+"""Raw `screencap` decoding and PNG/PPM encoding"""
+import struct
+import zlib
+
+def parse_screencap_header(raw):
+    """Return (width, height, pixel format, bytes per pixel, header size) of a raw `screencap` dump"""
+    width, height, pixel_format = struct.unpack_from("<III", raw, 0)
+    # RGBA_8888 / RGBX_8888 / RGB_888 are the formats screencap produces in practice
+    bytes_per_pixel = {1: 4, 2: 4, 3: 3}.get(pixel_format)
+    if bytes_per_pixel is None:
+        raise ValueError(f"Unsupported screencap pixel format {pixel_format}")
+    
+    # Header is 12 bytes, or 16 on Android 9+ (extra color space field)
+    header_size = len(raw) - width * height * bytes_per_pixel
+    if header_size not in (12, 16):
+        raise ValueError(f"Unexpected screencap size {len(raw)} for {width}x{height}")
+    return width, height, pixel_format, bytes_per_pixel, header_size
+
+def decode_screencap(raw):
+    """Split a raw `screencap` dump into (width, height, color channels, pixel bytes)"""
+    width, height, pixel_format, bytes_per_pixel, header_size = parse_screencap_header(raw)
+    pixels = memoryview(raw)[header_size:]
+    
+    if pixel_format == 2:
+        # Drop the undefined X channel
+        rgb = bytearray(width * height * 3)
+        rgb[0::3] = pixels[0::4]
+        rgb[1::3] = pixels[1::4]
+        rgb[2::3] = pixels[2::4]
+        return width, height, 3, bytes(rgb)
+    return width, height, bytes_per_pixel, bytes(pixels)
+
+def encode_png(raw, output_path=None, level=1):
+    """Encode a raw `screencap` dump as PNG (runs in a worker process)"""
+    width, height, channels, pixels = decode_screencap(raw)
+    stride = width * channels
+    scanlines = b"".join(b"\x00" + pixels[y * stride:(y + 1) * stride] for y in range(height))
+    
+    def chunk(tag, data):
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xffffffff)
+    
+    color_type = 6 if channels == 4 else 2
+    png = (b"\x89PNG\r\n\x1a\n"
+           + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0))
+           + chunk(b"IDAT", zlib.compress(scanlines, level))
+           + chunk(b"IEND", b""))
+    
+    if output_path is None:
+        return png
+    with open(output_path, "wb") as f:
+        f.write(png)
+    return output_path
+
+def screencap_to_ppm(raw, factor=1):
+    """Downscale a raw `screencap` dump by an integer factor into binary PPM data for Tk"""
+    width, height, pixel_format, bytes_per_pixel, header_size = parse_screencap_header(raw)
+    pixels = memoryview(raw)[header_size:]
+    stride = width * bytes_per_pixel
+    out_width, out_height = width // factor, height // factor
+    row_bytes = out_width * factor * bytes_per_pixel
+    
+    # Keep every factor-th row, then every factor-th pixel of those rows
+    rows = b"".join(pixels[y * factor * stride:y * factor * stride + row_bytes] for y in range(out_height))
+    step = bytes_per_pixel * factor
+    rgb = bytearray(out_width * out_height * 3)
+    rgb[0::3] = rows[0::step]
+    rgb[1::3] = rows[1::step]
+    rgb[2::3] = rows[2::step]
+    return b"P6 %d %d 255\n" % (out_width, out_height) + bytes(rgb)
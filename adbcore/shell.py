@@ -0,0 +1,172 @@
+"""Command classification, the read-only result cache and persistent root shells"""
+import os
+import queue
+import re
+import shlex
+import subprocess
+import threading
+import time
+from collections import OrderedDict
+
+# Idempotent reads that run_adb_command memoizes: (words after "shell", seconds to keep)
+READ_ONLY_COMMANDS = (
+    (("dumpsys", "package"), 300),
+    (("pm", "list", "packages"), 60),
+    (("pm", "path"), 300),
+    (("getprop",), 300),
+    (("settings", "get"), 30),
+    (("su", "-c", "id"), 30)
+)
+COMMAND_CACHE_SIZE = 512
+
+# Commands that change device state and so drop that device's cached reads
+MUTATING_ADB_COMMANDS = ("install", "install-multiple", "uninstall", "reboot", "root", "unroot")
+MUTATING_SHELL_PATTERN = re.compile(
+    r"\b(pm (install|uninstall|disable|disable-user|enable|clear|grant|revoke|hide|unhide|suspend|unsuspend)"
+    r"|cmd package (install|uninstall)|settings (put|delete|reset)|setprop|reboot)\b")
+
+def read_only_ttl(argv):
+    """Seconds a command's output may be reused, or None if it is not a known idempotent read"""
+    if argv[:1] != ["shell"] or len(argv) < 2:
+        return None
+    # Pipelines, redirections and compound scripts are never cached
+    if re.search(r"[;&|<>`$]", " ".join(argv[1:])):
+        return None
+    words = argv[1:]
+    if len(words) == 1:
+        try:
+            words = shlex.split(words[0])
+        except ValueError:
+            return None
+    for prefix, ttl in READ_ONLY_COMMANDS:
+        if tuple(words[:len(prefix)]) == prefix:
+            return ttl
+    return None
+
+def is_mutating_command(argv):
+    if argv[:1] and argv[0] in MUTATING_ADB_COMMANDS:
+        return True
+    return bool(MUTATING_SHELL_PATTERN.search(" ".join(argv)))
+
+class CommandCache:
+    """LRU cache of read-only command output keyed by (device, argv), with per-entry expiry"""
+    def __init__(self, max_entries=COMMAND_CACHE_SIZE):
+        self.entries = OrderedDict()
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+    
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return entry[1]
+    
+    def put(self, key, output, ttl):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + ttl, output)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+    
+    def invalidate(self, device=None):
+        """Drop everything cached for a device (and for the unnamed default device), or everything"""
+        with self.lock:
+            if device is None:
+                self.entries.clear()
+                return
+            for key in [k for k in self.entries if k[0] in (device, "default")]:
+                del self.entries[key]
+
+class RootShell:
+    """Long-lived `adb shell su` session for one device; commands are delimited by a sentinel line.
+    
+    su is authorized once when the session opens, and the session is reopened on the
+    next command if it drops (device reconnect, su revoked and granted again, ...).
+    """
+    def __init__(self, serial=None, adb_path="adb"):
+        self.serial = serial
+        self.adb_path = adb_path
+        self.process = None
+        self.output = None
+        self.lock = threading.Lock()
+    
+    def alive(self):
+        return self.process is not None and self.process.poll() is None
+    
+    def start(self):
+        cmd_list = [self.adb_path] + (["-s", self.serial] if self.serial else []) + ["shell", "su"]
+        self.process = subprocess.Popen(cmd_list, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                        stderr=subprocess.DEVNULL, bufsize=0)
+        self.output = queue.Queue()
+        threading.Thread(target=self.read_output, args=(self.process, self.output), daemon=True).start()
+        
+        output, _ = self.execute("id -u", 15)
+        if output.strip().splitlines()[-1:] != ["0"]:
+            self.close()
+            raise PermissionError("su did not grant root on the device")
+    
+    def read_output(self, process, output):
+        """Reader thread: forwards stdout chunks; None marks the end of the session"""
+        try:
+            while True:
+                data = process.stdout.read(65536)
+                if not data:
+                    break
+                output.put(data)
+        except (OSError, ValueError):
+            pass
+        output.put(None)
+    
+    def close(self):
+        if self.alive():
+            try:
+                self.process.stdin.close()
+            except OSError:
+                pass
+            self.process.terminate()
+        self.process = None
+    
+    def run(self, script, timeout=60):
+        """Run a script as root; returns (output, exit status)"""
+        with self.lock:
+            if not self.alive():
+                self.start()
+            try:
+                return self.execute(script, timeout)
+            except BrokenPipeError:
+                # The session died since the last command; re-elevate once and retry
+                self.close()
+                self.start()
+                return self.execute(script, timeout)
+    
+    def execute(self, script, timeout):
+        sentinel = "__ADBM_DONE_" + os.urandom(8).hex()
+        # The subshell keeps `exit` in scripts from ending the session
+        self.process.stdin.write(f"(\n{script}\n)\nprintf '\\n%s %d\\n' {sentinel} $?\n".encode())
+        self.process.stdin.flush()
+        
+        marker = b"\n" + sentinel.encode() + b" "
+        buffer = bytearray()
+        deadline = time.monotonic() + timeout
+        while True:
+            index = buffer.find(marker)
+            if index >= 0:
+                end = buffer.find(b"\n", index + len(marker))
+                if end >= 0:
+                    status = int(buffer[index + len(marker):end] or 0)
+                    return buffer[:index].decode("utf-8", "replace"), status
+            try:
+                data = self.output.get(timeout=max(0, deadline - time.monotonic()))
+            except queue.Empty:
+                # The shell is in an unknown state; the next command starts a fresh one
+                self.close()
+                raise TimeoutError(f"Root command timed out after {timeout}s")
+            if data is None:
+                self.close()
+                raise RuntimeError("Root shell closed (is su available and granted?)")
+            buffer += data
@@ -0,0 +1,257 @@
+"""Quick Install shortcuts, watched APK folders and cached APK metadata in one SQLite database.
+
+Every change is its own transaction, so a crash mid-write loses at most that
+change and never the rest of the library. Metadata rows are keyed by path and
+reused while the file's size and mtime are unchanged, which is what lets a
+rescan of a watched folder stat every file but parse only new or changed ones.
+"""
+import concurrent.futures
+import json
+import os
+import sqlite3
+import threading
+
+from .apk import package_type, read_apk_metadata
+from .files import hash_local_file
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS shortcuts (
+    path TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    type TEXT NOT NULL,
+    position REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS apk_metadata (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT,
+    type TEXT,
+    package TEXT,
+    version_code INTEGER,
+    version_name TEXT,
+    label TEXT,
+    icon BLOB
+);
+CREATE INDEX IF NOT EXISTS apk_metadata_package ON apk_metadata (package);
+CREATE TABLE IF NOT EXISTS watched_folders (
+    path TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS watched_files (
+    path TEXT PRIMARY KEY,
+    folder TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS watched_files_folder ON watched_files (folder);
+"""
+
+METADATA_FIELDS = ("size", "mtime_ns", "sha256", "type", "package", "version_code", "version_name", "label", "icon")
+
+# Files parsed at once when a watched folder has new or changed builds
+INDEX_WORKERS = 4
+
+# Seconds between stat passes over the watched folders
+WATCH_RESCAN_INTERVAL = 30
+
+def is_package_file(name):
+    return name.lower().endswith((".apk", ".xapk"))
+
+class ShortcutStore:
+    """Shortcut library (ordered, keyed by path) and APK metadata cache; safe to share between threads"""
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(db_path, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        # WAL keeps readers off the writer's lock and survives a crash mid-commit
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        with self.lock, self.db:
+            self.db.executescript(SCHEMA)
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+    # Shortcuts
+    def list_shortcuts(self):
+        """Shortcuts in display order, each with the cached version and package when known"""
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT s.path, s.name, s.type, m.package, m.version_name FROM shortcuts s "
+                "LEFT JOIN apk_metadata m ON m.path = s.path ORDER BY s.position").fetchall()
+        return [dict(row) for row in rows]
+
+    def add_shortcut(self, shortcut):
+        """Append a shortcut; returns False when its path is already in the library"""
+        with self.lock, self.db:
+            cursor = self.db.execute(
+                "INSERT OR IGNORE INTO shortcuts (path, name, type, position) "
+                "SELECT ?, ?, ?, COALESCE(MAX(position), 0) + 1 FROM shortcuts",
+                (shortcut["path"], shortcut["name"], shortcut["type"]))
+        return cursor.rowcount == 1
+
+    def remove_shortcut(self, path):
+        with self.lock, self.db:
+            self.db.execute("DELETE FROM shortcuts WHERE path = ?", (path,))
+
+    def import_json(self, json_path):
+        """One-time import of the old shortcuts.json; the file is kept as shortcuts.json.bak"""
+        with open(json_path, "r") as f:
+            shortcuts = json.load(f)
+        for shortcut in shortcuts:
+            self.add_shortcut(shortcut)
+        os.replace(json_path, json_path + ".bak")
+        return len(shortcuts)
+
+    # APK metadata
+    def get_cached_metadata(self, path, stat=None):
+        """Cached metadata if the file is unchanged since it was read, else None"""
+        stat = stat or os.stat(path)
+        with self.lock:
+            row = self.db.execute("SELECT * FROM apk_metadata WHERE path = ?", (path,)).fetchone()
+        if row and row["size"] == stat.st_size and row["mtime_ns"] == stat.st_mtime_ns:
+            return dict(row)
+        return None
+
+    def get_metadata(self, path):
+        """Metadata of an APK/XAPK, parsed and hashed only when the file is new or changed"""
+        stat = os.stat(path)
+        metadata = self.get_cached_metadata(path, stat)
+        if metadata:
+            return metadata
+        metadata = read_apk_metadata(path)
+        metadata.update(path=path, size=stat.st_size, mtime_ns=stat.st_mtime_ns,
+                        sha256=hash_local_file(path, "sha256"))
+        self.put_metadata(metadata)
+        return metadata
+
+    def put_metadata(self, metadata):
+        with self.lock, self.db:
+            self.db.execute(
+                f"INSERT OR REPLACE INTO apk_metadata (path, {', '.join(METADATA_FIELDS)}) "
+                f"VALUES (?{', ?' * len(METADATA_FIELDS)})",
+                [metadata["path"]] + [metadata.get(field) for field in METADATA_FIELDS])
+
+    def forget_metadata(self, path):
+        with self.lock, self.db:
+            self.db.execute("DELETE FROM apk_metadata WHERE path = ?", (path,))
+
+    def get_icon(self, path):
+        with self.lock:
+            row = self.db.execute("SELECT icon FROM apk_metadata WHERE path = ?", (path,)).fetchone()
+        return row["icon"] if row else None
+
+    # Watched folders
+    def list_watched_folders(self):
+        with self.lock:
+            return [row["path"] for row in self.db.execute("SELECT path FROM watched_folders ORDER BY path")]
+
+    def add_watched_folder(self, folder):
+        with self.lock, self.db:
+            self.db.execute("INSERT OR IGNORE INTO watched_folders (path) VALUES (?)", (folder,))
+
+    def remove_watched_folder(self, folder):
+        with self.lock, self.db:
+            self.db.execute("DELETE FROM watched_folders WHERE path = ?", (folder,))
+            self.db.execute("DELETE FROM watched_files WHERE folder = ?", (folder,))
+
+    def list_watched_files(self, folder):
+        """Indexed files of a folder: path -> (size, mtime_ns) they had when parsed"""
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT w.path, m.size, m.mtime_ns FROM watched_files w "
+                "LEFT JOIN apk_metadata m ON m.path = w.path WHERE w.folder = ?", (folder,)).fetchall()
+        return {row["path"]: (row["size"], row["mtime_ns"]) for row in rows}
+
+    def set_watched_file(self, path, folder):
+        with self.lock, self.db:
+            self.db.execute("INSERT OR REPLACE INTO watched_files (path, folder) VALUES (?, ?)", (path, folder))
+
+    def forget_watched_file(self, path):
+        with self.lock, self.db:
+            self.db.execute("DELETE FROM watched_files WHERE path = ?", (path,))
+            self.db.execute("DELETE FROM apk_metadata WHERE path = ? AND path NOT IN (SELECT path FROM shortcuts)",
+                            (path,))
+
+    def latest_builds(self):
+        """Newest indexed build of every package in the watched folders (highest version code, then mtime)"""
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT m.path, m.label AS name, m.type, m.package, m.version_code, m.version_name, m.mtime_ns, "
+                "w.folder FROM watched_files w JOIN apk_metadata m ON m.path = w.path "
+                "WHERE m.package IS NOT NULL").fetchall()
+        latest = {}
+        for row in rows:
+            best = latest.get(row["package"])
+            if best is None or (row["version_code"] or -1, row["mtime_ns"]) > (best["version_code"] or -1, best["mtime_ns"]):
+                latest[row["package"]] = row
+        return sorted((dict(row) for row in latest.values()), key=lambda build: build["name"].lower())
+
+class ApkFolderIndex:
+    """Keeps the store's index of the watched folders current.
+    
+    Each scan stats every APK/XAPK under the folders and hands only new or
+    changed files to a thread pool for parsing and hashing.
+    """
+    def __init__(self, store, workers=INDEX_WORKERS):
+        self.store = store
+        self.pool = concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="apk-index")
+
+    def close(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def stat_folder(self, folder):
+        """path -> stat of every package file under folder"""
+        found = {}
+        pending = [folder]
+        while pending:
+            try:
+                entries = list(os.scandir(pending.pop()))
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.is_dir():
+                        pending.append(entry.path)
+                    elif is_package_file(entry.name):
+                        found[entry.path] = entry.stat()
+                except OSError:
+                    continue
+        return found
+
+    def scan(self):
+        """One incremental pass; returns the paths parsed, removed and failed"""
+        summary = {"files": 0, "parsed": [], "removed": [], "failed": []}
+        for folder in self.store.list_watched_folders():
+            # An unreachable share keeps its index until it comes back
+            if not os.path.isdir(folder):
+                continue
+            found = self.stat_folder(folder)
+            known = self.store.list_watched_files(folder)
+            summary["files"] += len(found)
+            
+            for path in set(known) - set(found):
+                self.store.forget_watched_file(path)
+                summary["removed"].append(path)
+            
+            changed = [path for path, stat in found.items() if known.get(path) != (stat.st_size, stat.st_mtime_ns)]
+            for path, error in zip(changed, self.pool.map(self.index_file, changed, [folder] * len(changed))):
+                summary["failed" if error else "parsed"].append(path)
+        return summary
+
+    def index_file(self, path, folder):
+        """Parse one file into the store; returns an error message or None"""
+        error = None
+        try:
+            self.store.get_metadata(path)
+        except Exception as e:
+            # Remember the failure for this size/mtime so the file is not reparsed every pass
+            error = str(e)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return error
+            self.store.put_metadata({"path": path, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+                                     "type": package_type(path), "label": os.path.basename(path)})
+        self.store.set_watched_file(path, folder)
+        return error
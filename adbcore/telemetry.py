@@ -0,0 +1,43 @@
+"""Device load sampling from /proc counters, two snapshots in one shell call"""
+
+def build_telemetry_script(interval=1.0):
+    """Counters before and after sleeping interval seconds; rates come from the difference"""
+    snapshot = "head -n 1 /proc/stat; cat /proc/net/dev"
+    return (f"{snapshot}; grep -E '^(MemTotal|MemAvailable):' /proc/meminfo; "
+            f"sleep {interval:g}; echo @@; {snapshot}")
+
+def parse_proc_counters(text):
+    """Aggregate CPU jiffies (busy, total) and rx/tx bytes of every interface but loopback"""
+    cpu = None
+    rx = tx = 0
+    memory = {}
+    for line in text.splitlines():
+        if line.startswith("cpu "):
+            fields = [int(v) for v in line.split()[1:8]]
+            # idle + iowait
+            cpu = (sum(fields) - fields[3] - fields[4], sum(fields))
+        elif line.startswith(("MemTotal:", "MemAvailable:")):
+            name, value = line.split()[:2]
+            memory[name.rstrip(":")] = int(value)
+        elif ":" in line:
+            iface, _, counters = line.partition(":")
+            counters = counters.split()
+            if iface.strip() != "lo" and len(counters) >= 9 and counters[0].isdigit():
+                rx += int(counters[0])
+                tx += int(counters[8])
+    return cpu, (rx, tx), memory
+
+def parse_telemetry(output, interval=1.0):
+    """CPU and RAM in percent, network in KB/s; None where the device did not report a counter"""
+    before, _, after = output.partition("@@")
+    cpu0, net0, memory = parse_proc_counters(before)
+    cpu1, net1, _ = parse_proc_counters(after)
+    sample = {"cpu": None, "ram": None, "net_rx": None, "net_tx": None}
+    if cpu0 and cpu1 and cpu1[1] > cpu0[1]:
+        sample["cpu"] = round(100.0 * (cpu1[0] - cpu0[0]) / (cpu1[1] - cpu0[1]), 1)
+    if memory.get("MemTotal") and "MemAvailable" in memory:
+        sample["ram"] = round(100.0 * (1 - memory["MemAvailable"] / memory["MemTotal"]), 1)
+    if after.strip():
+        sample["net_rx"] = round(max(net1[0] - net0[0], 0) / 1024 / interval, 1)
+        sample["net_tx"] = round(max(net1[1] - net0[1], 0) / 1024 / interval, 1)
+    return sample
@@ -0,0 +1,202 @@
+"""Tweak profiles, settings diffs, sysfs tuning scripts and cpufreq policies"""
+import posixpath
+import re
+import shlex
+
+# Seconds a bulk `settings list` snapshot is reused before re-reading the device
+SETTINGS_SNAPSHOT_TTL = 10
+
+# sysfs/procfs nodes: paths may glob (unquoted on the device), so only plain path characters are allowed
+SYSFS_PATH_PATTERN = re.compile(r"/[\w./*-]+")
+
+# Nodes that need more than a plain echo; {path} and {value} are shell-quoted
+SYSFS_WRITE_TEMPLATES = {
+    # disksize only changes on a reset device, and swap has to be re-armed afterwards
+    "/sys/block/zram0/disksize": ("swapoff /dev/block/zram0 2>/dev/null; echo 1 > /sys/block/zram0/reset; "
+                                  "echo {value} > {path} && [ {value} != 0 ] && "
+                                  "mkswap /dev/block/zram0 >/dev/null && swapon /dev/block/zram0")
+}
+
+# cpufreq policies: one per cluster, shared by every core listed in related_cpus
+CPUFREQ_DIR = "/sys/devices/system/cpu/cpufreq"
+CPUFREQ_NODES = ("related_cpus", "scaling_available_governors", "scaling_available_frequencies",
+                 "cpuinfo_min_freq", "cpuinfo_max_freq", "scaling_governor",
+                 "scaling_min_freq", "scaling_max_freq", "scaling_cur_freq")
+KERNEL_TWEAKS = [
+    ["/proc/sys/vm/oom_kill_allocating_task", "1"],
+    ["/proc/sys/vm/page-cluster", "0"],
+    ["/proc/sys/vm/dirty_ratio", "10"],
+    ["/proc/sys/vm/dirty_background_ratio", "5"],
+    ["/proc/sys/vm/dirty_expire_centisecs", "500"],
+    ["/proc/sys/vm/dirty_writeback_centisecs", "100"]
+]
+
+# Built-in tweak profiles, seeded into tweak_profiles.json on first use.
+# "settings" entries are [namespace, key, value] (None deletes the key);
+# "sysfs" entries are [path, value] and may glob, e.g. every CPU's governor.
+ANIMATION_SCALE_KEYS = ("window_animation_scale", "transition_animation_scale", "animator_duration_scale")
+TWEAK_PROFILES = {
+    "Gaming": {
+        "settings": [["global", key, "0.5"] for key in ANIMATION_SCALE_KEYS] + [
+            ["system", "min_refresh_rate", "120"],
+            ["system", "peak_refresh_rate", "120"],
+            ["global", "debug.hwui.renderer", "skiagl"]
+        ],
+        "sysfs": [
+            ["/sys/devices/system/cpu/cpu*/cpufreq/scaling_governor", "performance"],
+            ["/proc/sys/vm/swappiness", "20"]
+        ]
+    },
+    "Smooth UI": {
+        "settings": [["global", key, "0.5"] for key in ANIMATION_SCALE_KEYS] + [
+            ["system", "peak_refresh_rate", "120"]
+        ],
+        "sysfs": []
+    },
+    "Battery Saver": {
+        "settings": [["global", key, "1.0"] for key in ANIMATION_SCALE_KEYS] + [
+            ["system", "min_refresh_rate", None],
+            ["system", "peak_refresh_rate", "60"]
+        ],
+        "sysfs": [
+            ["/sys/devices/system/cpu/cpu*/cpufreq/scaling_governor", "powersave"],
+            ["/proc/sys/vm/swappiness", "100"]
+        ]
+    },
+    "Stock": {
+        "settings": [["global", key, "1.0"] for key in ANIMATION_SCALE_KEYS] + [
+            ["system", "min_refresh_rate", None],
+            ["system", "peak_refresh_rate", None],
+            ["global", "debug.hwui.renderer", None]
+        ],
+        "sysfs": []
+    }
+}
+
+def compile_tweak_script(profile):
+    """Compile the settings of a tweak profile into one shell script; returns (script, step labels).
+    
+    Every step echoes "@@<index> ok" or "@@<index> fail" so a single round trip
+    reports per-step status. sysfs writes go through the tuning transaction instead.
+    """
+    commands = []
+    labels = []
+    for namespace, key, value in profile.get("settings", []):
+        if namespace not in ("system", "secure", "global"):
+            raise ValueError(f"Invalid settings namespace: {namespace}")
+        if value is None:
+            commands.append(f"settings delete {namespace} {shlex.quote(key)}")
+            labels.append(f"{namespace}/{key} (reset)")
+        else:
+            commands.append(f"settings put {namespace} {shlex.quote(key)} {shlex.quote(str(value))}")
+            labels.append(f"{namespace}/{key} = {value}")
+    
+    lines = [f"({command}) >/dev/null 2>&1 && echo '@@{i} ok' || echo '@@{i} fail'"
+             for i, command in enumerate(commands)]
+    return "\n".join(lines + ["exit 0"]) + "\n", labels
+
+def parse_tweak_results(output, labels):
+    """Map the status markers of a compiled tweak script back to (label, ok); ok is None if the step never reported"""
+    status = {}
+    for match in re.finditer(r"^@@(\d+) (ok|fail)\s*$", output, re.MULTILINE):
+        status[int(match.group(1))] = match.group(2) == "ok"
+    return [(label, status.get(i)) for i, label in enumerate(labels)]
+
+def build_sysfs_read_script(paths):
+    """Script that prints "@@<node>\\t<first line>" for every node matching the (globbing) paths"""
+    lines = []
+    for path in paths:
+        if not SYSFS_PATH_PATTERN.fullmatch(path):
+            raise ValueError(f"Invalid sysfs path: {path}")
+        lines.append(f'for f in {path}; do [ -e "$f" ] && printf \'@@%s\\t%s\\n\' "$f" "$(head -n 1 "$f" 2>/dev/null)"; done')
+    return "\n".join(lines + ["exit 0"]) + "\n"
+
+def build_sysfs_write_script(values):
+    """Script that writes concrete nodes and reads each one back in the same pass"""
+    lines = []
+    for path, value in values.items():
+        if not SYSFS_PATH_PATTERN.fullmatch(path) or "*" in path:
+            raise ValueError(f"Invalid sysfs path: {path}")
+        template = SYSFS_WRITE_TEMPLATES.get(path, "echo {value} > {path}")
+        lines.append(f"({template.format(path=shlex.quote(path), value=shlex.quote(str(value)))}) >/dev/null 2>&1")
+        lines.append(f"printf '@@%s\\t%s\\n' {shlex.quote(path)} \"$(head -n 1 {shlex.quote(path)} 2>/dev/null)\"")
+    return "\n".join(lines + ["exit 0"]) + "\n"
+
+def parse_sysfs_values(output):
+    values = {}
+    for line in output.splitlines():
+        if line.startswith("@@") and "\t" in line:
+            path, value = line[2:].split("\t", 1)
+            values[path] = value.strip()
+    return values
+
+def sysfs_value_matches(current, wanted):
+    """Whether a node's read-back value is what was written ("1024M" reads back as bytes)"""
+    if current is None:
+        return False
+    wanted = str(wanted).strip()
+    if current == wanted:
+        return True
+    size = re.fullmatch(r"(\d+)([KMG])", wanted)
+    if size and current.isdigit():
+        return int(current) == int(size.group(1)) * 1024 ** " KMG".index(size.group(2))
+    return False
+
+def parse_cpu_policies(output):
+    """Parse the cpufreq probe into a list of per-cluster policy dicts"""
+    policies = []
+    for line in output.splitlines():
+        if line.startswith("@@"):
+            path = line[2:].strip()
+            policies.append({"path": path, "name": posixpath.basename(path)})
+        elif policies and "=" in line:
+            key, value = line.split("=", 1)
+            policies[-1][key] = value.strip()
+    
+    for policy in policies:
+        policy["governors"] = policy.get("scaling_available_governors", "").split()
+        frequencies = [int(f) for f in policy.get("scaling_available_frequencies", "").split() if f.isdigit()]
+        # Some kernels only expose the hardware limits
+        if not frequencies:
+            frequencies = [int(policy[key]) for key in ("cpuinfo_min_freq", "cpuinfo_max_freq")
+                           if policy.get(key, "").isdigit()]
+        policy["frequencies"] = sorted(set(frequencies))
+    policies.sort(key=lambda p: int(re.sub(r"\D", "", p["name"]) or 0))
+    return policies
+
+def format_khz(khz):
+    return f"{int(khz) // 1000} MHz" if str(khz).isdigit() else "N/A"
+
+def parse_settings_lists(output):
+    """Parse the output of batched `settings list` calls separated by "@@<namespace>" markers"""
+    snapshot = {}
+    current = None
+    for line in output.splitlines():
+        if line.startswith("@@"):
+            current = snapshot.setdefault(line[2:].strip(), {})
+        elif current is not None and "=" in line:
+            key, value = line.split("=", 1)
+            current[key] = value
+    return snapshot
+
+def settings_value_equal(current, wanted):
+    if current == wanted:
+        return True
+    # "1" and "1.0" are the same scale to the framework
+    try:
+        return float(current) == float(wanted)
+    except (TypeError, ValueError):
+        return False
+
+def diff_settings(snapshot, settings):
+    """Split settings steps into (steps that change something, steps already in place)"""
+    changed = []
+    unchanged = []
+    for namespace, key, value in settings:
+        values = snapshot.get(namespace, {})
+        if value is None:
+            in_place = key not in values
+        else:
+            in_place = key in values and settings_value_equal(values[key], str(value))
+        (unchanged if in_place else changed).append([namespace, key, value])
+    return changed, unchanged